@@ -0,0 +1,12 @@
+"""
+Benchmarks for PyEpiDoc. Run from the repository root with:
+
+    python -m benchmarks --output results.json
+
+to time each stage of `EpiDoc.tokenize` across `example_corpus` 
+and synthetic documents with longer <ab> elements, and:
+
+    python -m benchmarks --baseline baseline.json
+
+to compare the timings with a stored set of results.
+"""
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from pathlib import Path
+import argparse
+import json
+import sys
+
+from .baseline import compare, format_comparisons
+from .tokenize_stages import STAGES, run
+
+
+def format_results(results: dict) -> str:
+    lines = [f'{"dataset":<20} {"stage":<24} {"seconds":>10} {"net KiB":>14} {"peak KiB":>10}']
+
+    for dataset, result in results['results'].items():
+        for stage, _ in STAGES:
+            timings = result['stages'][stage]
+
+            if timings['seconds'] is None:
+                lines.append(f'{dataset:<20} {stage:<24} {timings["error"]}')
+                continue
+
+            lines.append(
+                f'{dataset:<20} {stage:<24} {timings["seconds"]:>10.4f} '
+                f'{timings["net_bytes"] / 1024:>14.1f} '
+                f'{timings["peak_bytes"] / 1024:>10.1f}'
+            )
+        lines.append(
+            f'{dataset:<20} {result["documents"]} documents, '
+            f'{result["tokens"]} tokens, '
+            f'process peak RSS so far {result["process_peak_rss_kb"]} KiB'
+        )
+
+    return '\n'.join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Time each stage of EpiDoc.tokenize'
+    )
+    parser.add_argument(
+        '--factors', 
+        default='10,100,1000',
+        help='comma-separated multiples of the <ab> length of the synthetic documents'
+    )
+    parser.add_argument(
+        '--engine', 
+        choices=['recursive', 'linear'], 
+        default='linear',
+        help='tokenizer engine'
+    )
+    parser.add_argument(
+        '--repeat', 
+        type=int, 
+        default=3,
+        help='number of timed runs, of which the fastest is reported'
+    )
+    parser.add_argument(
+        '--output', 
+        type=Path, 
+        help='file to write the results to as JSON'
+    )
+    parser.add_argument(
+        '--baseline', 
+        type=Path, 
+        help='JSON results to compare the timings with'
+    )
+    parser.add_argument(
+        '--threshold', 
+        type=float, 
+        default=1.2,
+        help='ratio to the baseline time above which a stage counts as slower'
+    )
+    args = parser.parse_args()
+
+    factors = [int(factor) for factor in args.factors.split(',') if factor]
+    results = run(factors, args.engine, args.repeat)
+
+    print(format_results(results))
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        comparisons = compare(results, baseline)
+
+        print()
+        print(format_comparisons(comparisons, args.threshold))
+
+        if any(comparison.ratio > args.threshold for comparison in comparisons):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Comparison of benchmark results with a stored baseline
+"""
+
+from __future__ import annotations
+from typing import NamedTuple
+
+
+class StageComparison(NamedTuple):
+    dataset: str
+    stage: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline_seconds == 0:
+            return 1.0
+        return self.seconds / self.baseline_seconds
+
+
+def compare(results: dict, baseline: dict) -> list[StageComparison]:
+    """
+    Return a comparison of each stage timed in both `results` 
+    and `baseline`. Stages that raised an error in either
+    are left out.
+    """
+
+    comparisons = []
+
+    for dataset, result in results['results'].items():
+        baseline_result = baseline['results'].get(dataset)
+
+        if baseline_result is None:
+            continue
+
+        for stage, timings in result['stages'].items():
+            baseline_timings = baseline_result['stages'].get(stage)
+
+            if baseline_timings is None \
+                or baseline_timings['seconds'] is None \
+                or timings['seconds'] is None:
+                continue
+
+            comparisons.append(StageComparison(
+                dataset=dataset,
+                stage=stage,
+                baseline_seconds=baseline_timings['seconds'],
+                seconds=timings['seconds']
+            ))
+
+    return comparisons
+
+
+def format_comparisons(
+        comparisons: list[StageComparison], 
+        threshold: float) -> str:
+    
+    """
+    Return a table of the comparisons, marking stages whose
+    time has increased by more than the `threshold` ratio
+    """
+
+    lines = [f'{"dataset":<20} {"stage":<24} {"baseline":>10} {"current":>10} {"ratio":>7}']
+
+    for comparison in comparisons:
+        flag = '  SLOWER' if comparison.ratio > threshold else ''
+        lines.append(
+            f'{comparison.dataset:<20} {comparison.stage:<24} '
+            f'{comparison.baseline_seconds:>10.4f} {comparison.seconds:>10.4f} '
+            f'{comparison.ratio:>7.2f}{flag}'
+        )
+
+    return '\n'.join(lines)
@@ -0,0 +1,81 @@
+"""
+Microbenchmark for resolving element tags to (namespace, localname)
+and for testing enum membership, compared with the previous
+regex- and list-based implementations, together with the
+time taken to tokenize the documents in `example_corpus`.
+
+Run from the repository root with:
+
+    python -m benchmarks.tag_lookup
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from timeit import timeit
+import re
+import time
+
+from pyepidoc import EpiDoc
+from pyepidoc.epidoc.enums import AtomicTokenType
+from pyepidoc.shared.classes import Tag
+from pyepidoc.xml.namespace import split_clark
+
+
+CORPUS_FOLDER = Path(__file__).parent.parent / 'example_corpus'
+
+
+def regex_tag(etag: str) -> Tag:
+    """
+    Previous implementation of `XmlElement.tag`
+    """
+    match = re.search(r'(\{(.+)\})?(.+)', etag)
+
+    if match is None:
+        return Tag(None, None)
+
+    if match.groups()[0] is None:
+        return Tag('', etag)
+
+    return Tag(match.groups()[1], match.groups()[2])
+
+
+def corpus_tags(docs: list[EpiDoc]) -> list[str]:
+    return [
+        e.tag for doc in docs for e in doc.e.iter()
+        if isinstance(e.tag, str)
+    ]
+
+
+def main() -> None:
+    paths = sorted(CORPUS_FOLDER.glob('*.xml'))
+    docs = [EpiDoc(path) for path in paths]
+    tags = corpus_tags(docs)
+    names = [split_clark(tag).name for tag in tags]
+
+    print(f'{len(docs)} documents, {len(tags)} element tags')
+
+    regex_s = timeit(lambda: [regex_tag(tag) for tag in tags], number=5)
+    clark_s = timeit(lambda: [split_clark(tag) for tag in tags], number=5)
+    print(f'Tag resolution:   regex {regex_s:.4f}s, '
+          f'cached {clark_s:.4f}s ({regex_s / clark_s:.1f}x)')
+
+    list_s = timeit(
+        lambda: [name in [item.value for item in AtomicTokenType]
+                 for name in names],
+        number=5
+    )
+    set_s = timeit(
+        lambda: [name in AtomicTokenType.value_set() for name in names],
+        number=5
+    )
+    print(f'Enum membership:  list {list_s:.4f}s, '
+          f'frozenset {set_s:.4f}s ({list_s / set_s:.1f}x)')
+
+    start = time.perf_counter()
+    for doc in docs:
+        doc.tokenize(verbose=False, throw_if_no_main_edition=False)
+    print(f'Tokenize corpus:  {time.perf_counter() - start:.4f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Per-stage timings and allocations for `EpiDoc.tokenize`,
+measured on `example_corpus` and on synthetic documents
+whose <ab> elements are repeated to make them longer.
+"""
+
+from __future__ import annotations
+from copy import deepcopy
+from pathlib import Path
+from typing import Callable, Optional
+import sys
+import time
+import tracemalloc
+
+from pyepidoc import EpiDoc
+from pyepidoc.epidoc.enums import SpaceUnit
+from pyepidoc.shared.constants import TEINS
+from pyepidoc.shared.types import TokenizerEngine
+
+
+ROOT = Path(__file__).parent.parent
+CORPUS_FOLDER = ROOT / 'example_corpus'
+TEMPLATE_PATH = ROOT / 'examples' / 'ISic000032_untokenized.xml'
+
+Stage = tuple[str, Callable[[EpiDoc, TokenizerEngine], object]]
+
+# The stages of EpiDoc.tokenize, with ids and prettifying switched on
+STAGES: list[Stage] = [
+    ('tokenize', lambda doc, engine: doc.main_edition.tokenize(engine=engine)),
+    ('space_tokens', lambda doc, _: doc.space_tokens()),
+    ('set_ids', lambda doc, _: doc.set_ids(base=100)),
+    ('set_local_ids', lambda doc, _: doc.set_local_ids()),
+    ('prettify_main_edition', lambda doc, _: doc.prettify_main_edition(
+        spaceunit=SpaceUnit.Space.value, 
+        number=4, 
+        verbose=False
+    ))
+]
+
+
+def corpus_docs() -> list[EpiDoc]:
+    """
+    Return the documents in `example_corpus` that have 
+    a main edition
+    """
+    docs = [EpiDoc(path) for path in sorted(CORPUS_FOLDER.glob('*.xml'))]
+    return [doc for doc in docs if doc.main_edition is not None]
+
+
+def synthetic_doc(factor: int) -> EpiDoc:
+    """
+    Return the template document with the content of each 
+    <ab> in the main edition repeated `factor` times
+    """
+    doc = EpiDoc(TEMPLATE_PATH)
+
+    if doc.main_edition is None:
+        raise ValueError(f'No main edition in {TEMPLATE_PATH}')
+
+    for ab in doc.main_edition.e.iter(f'{{{TEINS}}}ab'):
+        children = list(ab)
+
+        for _ in range(factor - 1):
+            for child in children:
+                ab.append(deepcopy(child))
+
+    return doc
+
+
+def peak_rss_kb() -> Optional[int]:
+    """
+    Return the peak resident set size of the process in kilobytes,
+    or None where the `resource` module is not available. This is
+    the peak since the process started, not since the last call,
+    so it includes the datasets run before.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_stages(
+        load: Callable[[], list[EpiDoc]], 
+        engine: TokenizerEngine,
+        repeat: int = 3) -> dict:
+    
+    """
+    Run each stage over the documents returned by `load`, and 
+    return the time, the net memory allocated and the peak memory
+    allocated in each stage. Timings are the fastest of `repeat`
+    runs, taken without tracemalloc running; the memory figures
+    come from a separate run.
+
+    :param load: function returning freshly loaded documents
+    :param engine: the tokenizer engine
+    :param repeat: number of timed runs
+    """
+
+    stages: dict[str, dict] = {name: {'seconds': float('inf')} for name, _ in STAGES}
+
+    def run_stage(name: str, stage: Callable, docs: list[EpiDoc]) -> bool:
+        # Some stages have limits, e.g. set_ids on very long 
+        # editions; record the error and carry on with the others
+        try:
+            for doc in docs:
+                stage(doc, engine)
+        except Exception as e:
+            stages[name]['error'] = f'{type(e).__name__}: {e}'
+            return False
+        
+        return True
+
+    for _ in range(repeat):
+        docs = load()
+
+        for name, stage in STAGES:
+            start = time.perf_counter()
+            if run_stage(name, stage, docs):
+                seconds = time.perf_counter() - start
+                stages[name]['seconds'] = min(stages[name]['seconds'], seconds)
+
+    token_count = sum(len(doc.tokens) for doc in docs)
+    docs = load()
+
+    tracemalloc.start()
+    try:
+        for name, stage in STAGES:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            run_stage(name, stage, docs)
+
+            after, peak = tracemalloc.get_traced_memory()
+            stages[name]['net_bytes'] = after - before
+            stages[name]['peak_bytes'] = peak - before
+    finally:
+        tracemalloc.stop()
+
+    for timings in stages.values():
+        if 'error' in timings:
+            timings['seconds'] = None
+
+    return {
+        'documents': len(docs),
+        'tokens': token_count,
+        'process_peak_rss_kb': peak_rss_kb(),
+        'stages': stages
+    }
+
+
+def run(
+        factors: list[int], 
+        engine: TokenizerEngine, 
+        repeat: int = 3) -> dict:
+    """
+    Run the stages on `example_corpus` and on a synthetic
+    document for each factor in `factors`
+    """
+
+    datasets: dict[str, Callable[[], list[EpiDoc]]] = {
+        'example_corpus': corpus_docs
+    }
+
+    for factor in factors:
+        datasets[f'synthetic_{factor}x'] = \
+            lambda factor=factor: [synthetic_doc(factor)]
+
+    results = {}
+    for name, load in datasets.items():
+        print(f'Running {name}...', file=sys.stderr)
+        results[name] = run_stages(load, engine, repeat)
+
+    return {
+        'engine': engine,
+        'repeat': repeat,
+        'python': sys.version.split()[0],
+        'results': results
+    }
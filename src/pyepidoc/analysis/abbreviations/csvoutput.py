@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Literal, Optional
 
 from .distribution import overall_distribution_via_expans 
-from .instances import raw_abbreviations, abbreviation_count
+from .table import AbbreviationTable
 
 from pyepidoc.epidoc.enums import AbbrType
 from pyepidoc import EpiDocCorpus
@@ -39,19 +39,24 @@ def abbr_count_to_csv(
         fp: str, 
         corpus: EpiDocCorpus, 
         language: Optional[Literal['la', 'grc']]=None, 
-        abbr_type: Optional[AbbrType]=None
+        abbr_type: Optional[AbbrType]=None,
+        table: Optional[AbbreviationTable]=None
     ) -> None:
     
     """
     Writes abbreviation frequencies to CSV file
+
+    :param table: the abbreviation table of the corpus, if 
+    already built
     """
     
-    raw = raw_abbreviations(
-        corpus, 
+    if table is None:
+        table = AbbreviationTable.from_corpus(corpus)
+
+    count = table.group_by_expansion(
         abbr_type=abbr_type, 
         language=language
     )
-    count = abbreviation_count(raw)
     count_dict = {k: {'frequency': v['frequency'], 'isic_ids': f'{", ".join(list(v["isic_ids"]))}'} 
                   for k, v in count.items()}
 
@@ -92,6 +97,7 @@ def abbr_count_all_to_csvs(
 
     Lang = Literal['la', 'grc']
     langs = list[Lang](['la', 'grc'])
+    table = AbbreviationTable.from_corpus(corpus)
 
     for lang in langs:
         for abbr_type in abbr_types:
@@ -99,4 +105,5 @@ def abbr_count_all_to_csvs(
                 f'{output_filename_prefix}{lang}_{abbr_type.value}.csv', 
                 corpus=corpus, 
                 language=lang, 
-                abbr_type=abbr_type)
+                abbr_type=abbr_type,
+                table=table)
@@ -2,12 +2,10 @@
 Functions for analysing abbreviation distributions in 
 an EpiDoc corpus
 """
-from typing import Iterable, Callable
+from typing import Iterable
 from pyepidoc import EpiDocCorpus
-from pyepidoc.epidoc.epidoc_element import EpiDocElement
 from pyepidoc.epidoc.edition_elements.expan import Expan
 from pyepidoc.shared.classes import SetRelation
-from pyepidoc.epidoc.dom import lang
 
 
 def distribution_from_corpus(corpus: EpiDocCorpus) -> dict[str, int]:
@@ -45,25 +43,24 @@ def overall_distribution_via_expans(corpus: EpiDocCorpus) -> dict[str, dict[str,
     """
     tokens = corpus.tokens.to_list()
     expans = corpus.expans
+    token_langs, expan_langs = corpus.token_languages()
 
-    latin_pred: Callable[[EpiDocElement], bool] = lambda token: lang(token) == 'la'
+    latin_tokens = [token for token, lang_ in zip(tokens, token_langs) if lang_ == 'la']
+    greek_tokens = [token for token, lang_ in zip(tokens, token_langs) if lang_ == 'grc']
+    other_tokens = [token for token, lang_ in zip(tokens, token_langs) if lang_ not in ['la', 'grc']]
 
-    latin_tokens = filter(latin_pred, tokens)
-    greek_tokens = filter(lambda token: lang(token) == 'grc', tokens)
-    other_tokens = filter(lambda token: lang(token) not in ['la', 'grc'], tokens)
+    latin_expans = [expan for expan, lang_ in zip(expans, expan_langs) if lang_ == 'la']
+    greek_expans = [expan for expan, lang_ in zip(expans, expan_langs) if lang_ == 'grc']
+    other_expans = [expan for expan, lang_ in zip(expans, expan_langs) if lang_ not in ['la', 'grc']]
 
-    latin_expans = filter(lambda expan: lang(expan) == 'la', expans)
-    greek_expans = filter(lambda expan: lang(expan) == 'grc', expans)
-    other_expans = filter(lambda expan: lang(expan) not in ['la', 'grc'], expans)
-
-    latin_stats = distribution_from_expans(list(latin_expans))
-    greek_stats = distribution_from_expans(list(greek_expans))
-    other_stats = distribution_from_expans(list(other_expans))
+    latin_stats = distribution_from_expans(latin_expans)
+    greek_stats = distribution_from_expans(greek_expans)
+    other_stats = distribution_from_expans(other_expans)
 
     return {
-        'Greek': {'tokens': len(list(greek_tokens)), **greek_stats},
-        'Latin': {'tokens': len(list(latin_tokens)), **latin_stats},
-        'Other': {'tokens': len(list(other_tokens)), **other_stats}
+        'Greek': {'tokens': len(greek_tokens), **greek_stats},
+        'Latin': {'tokens': len(latin_tokens), **latin_stats},
+        'Other': {'tokens': len(other_tokens), **other_stats}
     }
 
 
@@ -0,0 +1,225 @@
+"""
+Columnar table of the abbreviations in an EpiDoc corpus, built
+in one pass, so that counts and groupings by abbreviation type,
+language and ancestor element do not need to re-analyse
+each <expan>
+"""
+from __future__ import annotations
+from typing import Iterable, Optional
+
+from pyepidoc import EpiDocCorpus
+from pyepidoc.epidoc.dom import lang
+from pyepidoc.epidoc.enums import AbbrType
+from pyepidoc.xml.utils import localname
+
+from .instances import CountResult, RawResult
+
+
+_ABBR_TYPE_BITS = {abbr_type: 1 << i for i, abbr_type in enumerate(AbbrType)}
+
+
+class AbbreviationTable:
+
+    """
+    One row per <expan>, held as parallel columns: the expansion
+    string, a bitmask of its abbreviation types, its language, the
+    id of its document, and a bitmask of the local names of
+    its ancestors.
+    """
+
+    _expansions: list[str]
+    _abbr_types: list[int]
+    _langs: list[Optional[str]]
+    _doc_ids: list[str]
+    _ancestors: list[int]
+    _ancestor_bits: dict[str, int]
+
+    def __init__(
+            self,
+            expansions: list[str],
+            abbr_types: list[int],
+            langs: list[Optional[str]],
+            doc_ids: list[str],
+            ancestors: list[int],
+            ancestor_bits: dict[str, int]):
+
+        """
+        Use `AbbreviationTable.from_corpus` to build a table
+        from a corpus.
+        """
+
+        self._expansions = expansions
+        self._abbr_types = abbr_types
+        self._langs = langs
+        self._doc_ids = doc_ids
+        self._ancestors = ancestors
+        self._ancestor_bits = ancestor_bits
+
+    def __len__(self) -> int:
+        return len(self._expansions)
+
+    def __repr__(self) -> str:
+        return f'AbbreviationTable( rows = {len(self)} )'
+
+    @property
+    def abbr_types(self) -> list[int]:
+        """
+        Bitmask of the abbreviation types of each row;
+        see `abbr_type_bit`
+        """
+        return self._abbr_types
+
+    @staticmethod
+    def abbr_type_bit(abbr_type: AbbrType) -> int:
+        return _ABBR_TYPE_BITS[abbr_type]
+
+    def count(
+            self,
+            abbr_type: Optional[AbbrType] = None,
+            language: Optional[str] = None) -> int:
+
+        """
+        Return the number of rows of an abbreviation type
+        and/or language
+        """
+        return sum(self._mask(abbr_type, language))
+
+    def count_by_type(self, language: Optional[str] = None) -> dict[AbbrType, int]:
+        """
+        Return the number of rows of each abbreviation type,
+        optionally only for `language`
+        """
+
+        counts = {abbr_type: 0 for abbr_type in AbbrType}
+
+        for bits, lang in zip(self._abbr_types, self._langs):
+            if language is not None and lang != language:
+                continue
+
+            for abbr_type, bit in _ABBR_TYPE_BITS.items():
+                if bits & bit:
+                    counts[abbr_type] += 1
+
+        return counts
+
+    @property
+    def doc_ids(self) -> list[str]:
+        return self._doc_ids
+
+    @property
+    def expansions(self) -> list[str]:
+        return self._expansions
+
+    @classmethod
+    def from_corpus(cls, corpus: EpiDocCorpus) -> AbbreviationTable:
+        """
+        Build the table in a single pass over the documents
+        of the corpus
+        """
+
+        expansions: list[str] = []
+        abbr_types: list[int] = []
+        langs: list[Optional[str]] = []
+        doc_ids: list[str] = []
+        ancestors: list[int] = []
+        ancestor_bits: dict[str, int] = {}
+
+        for doc in corpus.docs:
+            doc_id = doc.id
+
+            for expan in doc.expans:
+                expansions.append(str(expan))
+                abbr_types.append(sum(
+                    _ABBR_TYPE_BITS[abbr_type] for abbr_type in set(expan.abbr_types)
+                ))
+                langs.append(lang(expan))
+                doc_ids.append(doc_id)
+
+                ancestor_mask = 0
+                for ancestor in expan.e.iterancestors():
+                    name = localname(ancestor)
+                    if name not in ancestor_bits:
+                        ancestor_bits[name] = 1 << len(ancestor_bits)
+                    ancestor_mask |= ancestor_bits[name]
+
+                ancestors.append(ancestor_mask)
+
+        return cls(expansions, abbr_types, langs, doc_ids, ancestors, ancestor_bits)
+
+    def group_by_expansion(
+            self,
+            abbr_type: Optional[AbbrType] = None,
+            language: Optional[str] = None) -> dict[str, CountResult]:
+
+        """
+        Return the frequency of each lower-cased expansion, and
+        the ids of the documents it occurs in, in the same form
+        as `abbreviation_count`
+        """
+
+        counts: dict[str, CountResult] = {}
+
+        for selected, expansion, doc_id in zip(
+                self._mask(abbr_type, language),
+                self._expansions,
+                self._doc_ids):
+
+            if not selected:
+                continue
+
+            key = expansion.lower()
+            record = counts.get(key)
+
+            if record is None:
+                counts[key] = {'frequency': 1, 'isic_ids': {doc_id}}
+            else:
+                record['frequency'] += 1
+                record['isic_ids'].add(doc_id)
+
+        return counts
+
+    def has_ancestor(self, name: str) -> list[bool]:
+        """
+        Return for each row whether the <expan> has an ancestor
+        with the local name `name`, e.g. 'name'
+        """
+
+        bit = self._ancestor_bits.get(name, 0)
+        return [bool(mask & bit) for mask in self._ancestors]
+
+    @property
+    def langs(self) -> list[Optional[str]]:
+        return self._langs
+
+    def _mask(
+            self,
+            abbr_type: Optional[AbbrType],
+            language: Optional[str]) -> Iterable[bool]:
+
+        bit = None if abbr_type is None else _ABBR_TYPE_BITS[abbr_type]
+
+        return (
+            (bit is None or bool(bits & bit))
+            and (language is None or lang == language)
+            for bits, lang in zip(self._abbr_types, self._langs)
+        )
+
+    def raw(
+            self,
+            abbr_type: Optional[AbbrType] = None,
+            language: Optional[str] = None) -> list[RawResult]:
+
+        """
+        Return the document id and expansion of each row of
+        an abbreviation type and/or language, in the same form
+        as `raw_abbreviations`
+        """
+
+        return [
+            {'isic_id': doc_id, 'expansion': expansion}
+            for selected, expansion, doc_id in zip(
+                self._mask(abbr_type, language),
+                self._expansions,
+                self._doc_ids)
+            if selected
+        ]
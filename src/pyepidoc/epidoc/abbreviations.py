@@ -5,11 +5,7 @@ convenience methods for operating on abbreviations
 
 from __future__ import annotations
 
-from typing import (
-    Callable,
-    SupportsIndex,
-    TypeVar
-)
+from typing import Callable
 from functools import cached_property
 
 from .edition_elements.expan import Expan
@@ -17,24 +13,17 @@ from pyepidoc.shared.iterables import contains
 from pyepidoc.epidoc.enums import AbbrType
 from pyepidoc.shared.generic_collection import GenericCollection
 
-T = TypeVar('T')
-
 class Abbreviations(GenericCollection[Expan]):
     """
     Collection class for abbreviations grouping and containing
     convenience methods for operating on abbreviations
     """
 
-    _values: list[Expan]
-
     def __init__(self, expans: list[Expan]):
-        self._expans = expans
-
-    def __getitem__(self, i: SupportsIndex) -> Expan:
-        return self._expans[i]
+        super().__init__(expans)
 
     def __repr__(self) -> str:
-        return f'Abbreviations({self._expans})'
+        return f'Abbreviations({self._values})'
     
     @cached_property
     def contractions(self) -> Abbreviations:
@@ -42,7 +31,7 @@ class Abbreviations(GenericCollection[Expan]):
         Return all the contractions
         """
 
-        return Abbreviations([abbr for abbr in self._expans 
+        return Abbreviations([abbr for abbr in self._values 
                if contains(abbr.abbr_types, AbbrType.contraction)])
 
     @cached_property
@@ -51,40 +40,18 @@ class Abbreviations(GenericCollection[Expan]):
         Return all the contractions with suspension
         """
 
-        return Abbreviations([abbr for abbr in self._expans 
+        return Abbreviations([abbr for abbr in self._values 
                if contains(
                    abbr.abbr_types, 
                    AbbrType.contraction_with_suspension)])
 
-    @property
-    def count(self) -> int:
-        """
-        Alias for length property
-        """
-        return self.length
-
-    @property
-    def length(self) -> int:
-        """
-        Return the number of items in the underlying
-        list of <expan> elements
-        """
-        return len(self._expans)
-    
-    def map(self, func: Callable[[Expan], T]) -> GenericCollection[T]:
-        """
-        Map a function to the abbreviations
-        """
-        mapped = list(map(func, self._expans))
-        return GenericCollection(mapped)
-    
     @cached_property
     def multiplications(self) -> Abbreviations:
         """
         Return all the contractions with suspension
         """
 
-        return Abbreviations([abbr for abbr in self._expans 
+        return Abbreviations([abbr for abbr in self._values 
                if contains(abbr.abbr_types, AbbrType.multiplication)])
 
     @cached_property
@@ -93,7 +60,7 @@ class Abbreviations(GenericCollection[Expan]):
         Return all the suspensions
         """
 
-        return Abbreviations([abbr for abbr in self._expans 
+        return Abbreviations([abbr for abbr in self._values 
                if contains(abbr.abbr_types, AbbrType.suspension)])
     
     
@@ -102,7 +69,7 @@ class Abbreviations(GenericCollection[Expan]):
         Filter abbreviations according to a predicate
         """
 
-        return Abbreviations(list(filter(predicate, self._expans)))
+        return Abbreviations(list(filter(predicate, self._values)))
     
     def where_ancestor_is(self, localname: str) -> Abbreviations:
         """
@@ -111,7 +78,7 @@ class Abbreviations(GenericCollection[Expan]):
         """
 
         return Abbreviations(
-            [expan for expan in self._expans
+            [expan for expan in self._values
              if expan.has_ancestor_by_name(localname)]
         )
     
@@ -122,6 +89,6 @@ class Abbreviations(GenericCollection[Expan]):
         """
 
         return Abbreviations(
-            [expan for expan in self._expans
+            [expan for expan in self._values
              if not expan.has_ancestor_by_name(localname)]
         )
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""
+Index of the dates of the documents in an EpiDoc corpus, so 
+that date filters, date ranges, histograms and summary 
+statistics are computed from one read of each document's 
+dates rather than by querying every document each time.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Literal, NamedTuple, Optional, Protocol
+from bisect import bisect_left, bisect_right
+from math import floor
+
+
+class Dated(Protocol):
+    """
+    The date properties shared by `EpiDoc` and `DocMetadata`
+    """
+
+    @property
+    def id(self) -> str: ...
+
+    @property
+    def not_before(self) -> Optional[int]: ...
+
+    @property
+    def not_after(self) -> Optional[int]: ...
+
+    @property
+    def date(self) -> Optional[int]: ...
+
+
+class DocDates(NamedTuple):
+    doc_id: str
+    not_before: Optional[int]
+    not_after: Optional[int]
+    date: Optional[int]
+
+    @property
+    def daterange(self) -> tuple[Optional[int], Optional[int]]:
+        """
+        As `EpiDoc.daterange`
+        """
+        if (self.not_before, self.not_after) == (None, None):
+            return (self.date, self.date)
+        
+        return (self.not_before, self.not_after)
+
+    @property
+    def date_mean(self) -> Optional[int]:
+        """
+        As `EpiDoc.date_mean`
+        """
+        if self.date is not None:
+            return self.date
+
+        not_before, not_after = self.daterange
+        if not_before is None or not_after is None:
+            return None
+    
+        return int((not_before + not_after) / 2)
+
+
+class HistogramBin(NamedTuple):
+    """
+    Number of documents from `start` up to, but not 
+    including, `end`
+    """
+    start: int
+    end: int
+    count: int
+
+
+def _max(*values: Optional[int]) -> Optional[int]:
+    values_ = [value for value in values if value is not None]
+    return max(values_) if values_ else None
+
+
+def _min(*values: Optional[int]) -> Optional[int]:
+    values_ = [value for value in values if value is not None]
+    return min(values_) if values_ else None
+
+
+def _sorted_keys(keys: list[Optional[int]]) -> tuple[list[int], list[int]]:
+    """
+    Return the non-missing keys in ascending order, 
+    with the row of each
+    """
+    pairs = sorted((key, row) for row, key in enumerate(keys) if key is not None)
+    return [key for key, _ in pairs], [row for _, row in pairs]
+
+
+class ChronologyIndex:
+
+    """
+    The @notBefore, @notAfter and @when-custom dates of a list 
+    of documents, held as columns in the order of the documents,
+    with sorted keys for range queries:
+
+    - a document is *after* a year if its @notBefore or its 
+      date is in or after that year (as `EpiDoc.is_after`), i.e.
+      if the later of the two is;
+    - a document is *before* a year if its @notAfter or its 
+      date is in or before that year (as `EpiDoc.is_before`); 
+    - a document's *interval* is its `daterange`, for the
+      overlap and containment queries, which leave out 
+      documents without both a start and an end date.
+
+    Queries return row numbers, i.e. positions in the list 
+    of documents the index was built from.
+    """
+
+    _dates: list[DocDates]
+    _after_keys: list[int]
+    _after_rows: list[int]
+    _before_keys: list[int]
+    _before_rows: list[int]
+    _start_keys: list[int]
+    _start_rows: list[int]
+
+    def __init__(self, dates: list[DocDates]):
+        self._dates = dates
+        self._after_keys, self._after_rows = _sorted_keys(
+            [_max(dates_.not_before, dates_.date) for dates_ in dates])
+        self._before_keys, self._before_rows = _sorted_keys(
+            [_min(dates_.not_after, dates_.date) for dates_ in dates])
+        self._start_keys, self._start_rows = _sorted_keys(
+            [dates_.daterange[0] if None not in dates_.daterange else None
+             for dates_ in dates])
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __repr__(self) -> str:
+        return f'ChronologyIndex( doc_count = {len(self)} )'
+
+    def contained(self, start: int, end: int) -> list[int]:
+        """
+        Return the rows whose interval lies within 
+        `start` and `end`, inclusive
+        """
+
+        i = bisect_left(self._start_keys, start)
+        j = bisect_right(self._start_keys, end)
+
+        return sorted(row for row in self._start_rows[i:j] 
+                      if self._interval_end(row) <= end)
+
+    @property
+    def datemax(self) -> int:
+        """
+        The latest @notAfter or date
+
+        :raises ValueError: if no document is dated
+        """
+        return max(value for dates in self._dates 
+                   for value in (dates.not_after, dates.date) 
+                   if value is not None)
+
+    @property
+    def datemean(self) -> Optional[int]:
+        datemeans = [datemean for datemean in self.datemeans 
+                     if datemean is not None]
+
+        if datemeans == []:
+            return None
+
+        return int(sum(datemeans) / len(datemeans))
+
+    @property
+    def datemeans(self) -> list[Optional[int]]:
+        return [dates.date_mean for dates in self._dates]
+
+    @property
+    def datemin(self) -> int:
+        """
+        The earliest @notBefore or date
+
+        :raises ValueError: if no document is dated
+        """
+        return min(value for dates in self._dates 
+                   for value in (dates.not_before, dates.date) 
+                   if value is not None)
+
+    @property
+    def dateranges(self) -> list[tuple[Optional[int], Optional[int]]]:
+        return [dates.daterange for dates in self._dates]
+
+    @property
+    def dates(self) -> list[DocDates]:
+        return self._dates
+
+    @classmethod
+    def from_docs(cls, docs: Iterable[Dated]) -> ChronologyIndex:
+        """
+        Read the dates of each document once
+        """
+        return cls([
+            DocDates(
+                doc_id=doc.id, 
+                not_before=doc.not_before, 
+                not_after=doc.not_after, 
+                date=doc.date
+            )
+            for doc in docs
+        ])
+
+    def histogram(
+            self, 
+            bin_size: int, 
+            start: Optional[int] = None, 
+            end: Optional[int] = None,
+            by: Literal['mean', 'interval'] = 'mean') -> list[HistogramBin]:
+
+        """
+        Count the documents in bins of `bin_size` years.
+
+        :param start: the start of the first bin; by default the
+        earliest date, rounded down to a multiple of `bin_size`
+        :param end: the year up to which bins are made; by default
+        the latest date
+        :param by: 'mean' counts each document once, in the bin 
+        containing its mean date; 'interval' counts a document 
+        in every bin its interval overlaps
+        """
+
+        if bin_size <= 0:
+            raise ValueError('The bin size must be positive.')
+
+        if len(self._after_keys) == 0 and len(self._before_keys) == 0:
+            return []
+
+        start_ = floor(self.datemin / bin_size) * bin_size \
+            if start is None else start
+        end_ = self.datemax if end is None else end
+
+        bin_count = max(0, (end_ - start_) // bin_size + 1)
+        counts = [0] * bin_count
+
+        for dates in self._dates:
+            if by == 'mean':
+                mean = dates.date_mean
+                if mean is None:
+                    continue
+                first = last = (mean - start_) // bin_size
+
+            elif by == 'interval':
+                interval_start, interval_end = dates.daterange
+                if interval_start is None or interval_end is None:
+                    continue
+                first = (interval_start - start_) // bin_size
+                last = (interval_end - start_) // bin_size
+
+            else:
+                raise ValueError(f'Invalid value for by: {by}')
+
+            for i in range(max(first, 0), min(last, bin_count - 1) + 1):
+                counts[i] += 1
+
+        return [
+            HistogramBin(
+                start_ + i * bin_size, 
+                start_ + (i + 1) * bin_size, 
+                count
+            )
+            for i, count in enumerate(counts)
+        ]
+
+    def _interval_end(self, row: int) -> int:
+        return self._dates[row].daterange[1]  # type: ignore
+
+    def overlapping(self, start: int, end: int) -> list[int]:
+        """
+        Return the rows whose interval overlaps the years 
+        `start` to `end`, inclusive
+        """
+
+        j = bisect_right(self._start_keys, end)
+
+        return sorted(row for row in self._start_rows[:j] 
+                      if self._interval_end(row) >= start)
+
+    def rows_after(self, start: int) -> list[int]:
+        """
+        Return the rows of the documents after `start`, 
+        as `EpiDoc.is_after`
+        """
+        i = bisect_left(self._after_keys, start)
+        return sorted(self._after_rows[i:])
+
+    def rows_before(self, end: int) -> list[int]:
+        """
+        Return the rows of the documents before `end`, 
+        as `EpiDoc.is_before`
+        """
+        j = bisect_right(self._before_keys, end)
+        return sorted(self._before_rows[:j])
+
+    def rows_in_range(self, start: int, end: int) -> list[int]:
+        """
+        Return the rows of the documents both after `start` 
+        and before `end`, as `EpiDocCorpus.filter_by_daterange`
+        """
+        before = set(self.rows_before(end))
+        return [row for row in self.rows_after(start) if row in before]
@@ -7,12 +7,17 @@ from typing import (
     cast, 
     Literal, 
     Generator,
+    NamedTuple,
     SupportsIndex,
+    TYPE_CHECKING,
     TypeVar
 )
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
 from functools import cached_property
-from itertools import chain
+from itertools import chain, islice
 from pathlib import Path
+import time
 
 from lxml.etree import XMLSyntaxError  
 
@@ -21,9 +26,24 @@ from pyepidoc.shared.iterables import maxone, top, remove_none
 from pyepidoc.shared.numbers import percentage
 from pyepidoc.shared.string import format_year
 from pyepidoc.shared.generic_collection import GenericCollection
+from pyepidoc.xml.tree_release import release_tree
+from pyepidoc.xml.tree_cache import TreeCache
+from pyepidoc.xml.validation_cache import ValidationCache
 
 from .abbreviations import Abbreviations
-from .epidoc import EpiDoc
+from .epidoc import EpiDoc, TextLanguages
+from .lazy_epidoc import LazyEpiDoc
+from .metadata.change import Change
+from .metadata.resp_stmt import RespStmt
+from .header_epidoc import HeaderEpiDoc
+from .chronology_index import ChronologyIndex, HistogramBin
+from .corpus_index import DocMetadata, MetadataIndex
+from .entity_index import EntityIndex
+from .form_index import FormIndex
+from .value_index import ValueIndex
+from .derived_cache import DerivedState, DerivedStateCache
+from .errors import TEINSError
+from .facets import Facet, FacetCount, FacetError, FACETS, count_facets
 from .epidoc_element import EpiDocElement
 from .token import Token
 from .edition_elements.expan import Expan
@@ -34,7 +54,201 @@ from .enums import TextClass
 from .edition_elements.role_name import RoleName
 from .edition_elements.pers_name import PersName
 
+if TYPE_CHECKING:
+    # Imported at runtime in `lemmatize`, since the processing
+    # package imports from pyepidoc
+    from pyepidoc.processing.operations import LemmaMemo
+
 T = TypeVar('T')
+_I = TypeVar('_I', bound=ValueIndex)
+
+
+class LoadError(NamedTuple):
+    """
+    Record of a file that could not be loaded into a corpus
+    """
+    path: Path
+    error: str
+    message: str
+
+
+def _load_error(fp: Path, e: Exception) -> LoadError:
+    """
+    Make a LoadError from the exception raised when loading
+    a file, using the original syntax error where there is one.
+    """
+    cause = e.__cause__ if e.__cause__ is not None else e
+    print(f'Could not include {fp}. This may be because of an XML syntax error.')
+    return LoadError(fp, type(cause).__name__, str(cause))
+
+
+def _load_doc(fp: Path) -> EpiDoc | LoadError:
+    """
+    Load a single EpiDoc file, returning a LoadError 
+    instead of raising if the file cannot be parsed. 
+    A TEINSError is raised as before.
+    """
+    try:
+        return EpiDoc(fp)
+    except TypeError as e:
+        return _load_error(fp, e)
+
+
+def _load_header_doc(fp: Path) -> EpiDoc | LoadError:
+    """
+    Load the header of a single EpiDoc file, returning a 
+    LoadError instead of raising if the file cannot be parsed.
+    A TEINSError is raised as before.
+    """
+    try:
+        return HeaderEpiDoc(fp)
+    except TypeError as e:
+        return _load_error(fp, e)
+
+
+def _file_signature(fp: Path) -> tuple[int, int]:
+    """
+    Return the modification time and size of a file
+    """
+    stat = fp.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class RefreshResult(NamedTuple):
+    """
+    The files added to, modified in and removed from a corpus
+    by `EpiDocCorpus.refresh`
+    """
+    added: list[Path]
+    modified: list[Path]
+    removed: list[Path]
+
+
+class TokenizeResult(NamedTuple):
+    """
+    Outcome of tokenizing a single document in 
+    `EpiDocCorpus.tokenize_to_folder`
+    """
+    id: str
+    error: str | None
+    seconds: float
+
+
+class TokenizeSummary(NamedTuple):
+    """
+    Outcome of `EpiDocCorpus.tokenize_to_folder`
+    """
+    succeeded: list[TokenizeResult]
+    failed: list[TokenizeResult]
+    seconds: float
+
+
+class _TokenizeOptions(NamedTuple):
+    prettify_edition: bool
+    add_space_between_words: bool
+    set_universal_ids: bool
+    set_n_ids: bool
+    convert_ws_to_names: bool
+    verbose: bool
+    insert_ws_inside_named_entities: bool
+    retokenize: bool
+    overwrite_existing: bool
+
+
+def _tokenize_doc(
+        doc: EpiDoc, 
+        dstfolder: Path, 
+        options: _TokenizeOptions) -> TokenizeResult:
+    
+    """
+    Tokenize a document and write it to `dstfolder`
+    """
+
+    start = time.perf_counter()
+    error: str | None = None
+
+    if options.verbose: 
+        print('Tokenizing', doc.id)
+
+    try:
+        if not doc.has_no_main_edition:
+            doc.tokenize(
+                prettify_edition=options.prettify_edition, 
+                add_space_between_words=options.add_space_between_words, 
+                set_universal_ids=options.set_universal_ids, 
+                set_n_ids=options.set_n_ids,
+                convert_ws_to_names=options.convert_ws_to_names, 
+                verbose=options.verbose,
+                insert_ws_inside_named_entities=options.insert_ws_inside_named_entities,
+                retokenize=options.retokenize
+            )
+        else: 
+            error = f'Could not tokenize {doc.id}: no main edition found.'
+            print(error)
+    except ValueError as e:
+        print(e)
+        return TokenizeResult(doc.id, str(e), time.perf_counter() - start)
+    
+    try:
+        doc.to_xml_file(
+            (dstfolder / Path(doc.id + '.xml')).absolute(), 
+            verbose=options.verbose, 
+            overwrite_existing=options.overwrite_existing
+        )
+    except FileExistsError as e:
+        print(e)
+        error = str(e)
+
+    return TokenizeResult(doc.id, error, time.perf_counter() - start)
+
+
+def _tokenize_xml(
+        xml: bytes, 
+        dstfolder: Path, 
+        options: _TokenizeOptions) -> TokenizeResult:
+    
+    """
+    Parse, tokenize and write a single document serialized 
+    in memory. Used as the worker function for tokenizing on 
+    a process pool.
+    """
+
+    return _tokenize_doc(EpiDoc(BytesIO(xml)), dstfolder, options)
+
+
+class ValidationResult(NamedTuple):
+    """
+    Outcome of validating a single document in 
+    `EpiDocCorpus.validate`
+    """
+    id: str
+    valid: bool
+    message: str
+
+
+def _validate_doc(
+        doc: EpiDoc, 
+        cache: ValidationCache | Path | None = None,
+        force: bool = False) -> ValidationResult:
+    
+    valid, message = doc.validate(cache, force)
+    return ValidationResult(doc.id, valid, str(message))
+
+
+def _validate_file(
+        fp: Path, 
+        cache_path: Path | None = None,
+        force: bool = False) -> ValidationResult:
+    
+    """
+    Parse and validate a single file. Used as the worker 
+    function for validating on a process pool.
+    """
+    try:
+        return _validate_doc(EpiDoc(fp), cache_path, force)
+    except (TypeError, TEINSError) as e:
+        return ValidationResult(fp.stem, False, str(e))
+
 
 class EpiDocCorpus:
 
@@ -44,13 +258,26 @@ class EpiDocCorpus:
     """
 
     _docs: Generator[EpiDoc, None, None] | list[EpiDoc]
+    _errors: list[LoadError]
+    _tree_cache: TreeCache | None
+    _index: MetadataIndex | None
+    _form_index: FormIndex | None = None
+    _entity_index: EntityIndex | None = None
+    _chronology: ChronologyIndex | None = None
+    _chronology_versions: tuple[int, ...] = ()
+    _folder_path: Path | None = None
+    _max_iter: int | None = None
+    _ids_to_exclude: list[str] | None = None
+    _header_only: bool = False
+    _signatures: dict[Path, tuple[int, int]]
 
     @overload
     def __init__(
         self,
         inpt: EpiDocCorpus,
         max_iter: int | None = None,
-        ids_to_exclude: list[str] | None = None
+        ids_to_exclude: list[str] | None = None,
+        workers: int | None = None
         ):
 
         """
@@ -58,6 +285,9 @@ class EpiDocCorpus:
 
         :param max_iter: maximum number of items in the corpus. 
         Only applied where inpt is a path.
+
+        :param workers: number of threads to use when parsing 
+        the files in the folder. Only applied where inpt is a path.
         """
         ...
 
@@ -66,7 +296,8 @@ class EpiDocCorpus:
         self,
         inpt: list[EpiDoc],
         max_iter: int | None = None,
-        ids_to_exclude: list[str] | None = None
+        ids_to_exclude: list[str] | None = None,
+        workers: int | None = None
         ):
 
         """
@@ -74,6 +305,9 @@ class EpiDocCorpus:
 
         :param max_iter: maximum number of items in the corpus. 
         Only applied where inpt is a path.
+
+        :param workers: number of threads to use when parsing 
+        the files in the folder. Only applied where inpt is a path.
         """
         ...
 
@@ -82,13 +316,22 @@ class EpiDocCorpus:
         self,
         inpt: str,
         max_iter: int | None = None,
-        ids_to_exclude: list[str] | None = None
+        ids_to_exclude: list[str] | None = None,
+        workers: int | None = None,
+        lazy: bool = False,
+        max_loaded_docs: int | None = None,
+        max_loaded_bytes: int | None = None,
+        index: bool | str | Path = False,
+        header_only: bool = False
     ):
         """
         :param inpt: path to the corpus as a str
 
         :param max_iter: maximum number of items in the corpus. 
         Only applied where inpt is a path.
+
+        :param workers: number of threads to use when parsing 
+        the files in the folder. Only applied where inpt is a path.
         """
         ...
 
@@ -97,13 +340,49 @@ class EpiDocCorpus:
         self,
         inpt: Path,
         max_iter: int | None = None,
-        ids_to_exclude: list[str] | None = None
+        ids_to_exclude: list[str] | None = None,
+        workers: int | None = None,
+        lazy: bool = False,
+        max_loaded_docs: int | None = None,
+        max_loaded_bytes: int | None = None,
+        index: bool | str | Path = False,
+        header_only: bool = False
     ):
         """
         :param inpt: path to the corpus as a Path object
 
         :param max_iter: maximum number of items in the corpus. 
         Only applied where inpt is a path.
+
+        :param workers: number of threads to use when parsing 
+        the files in the folder. Only applied where inpt is a path.
+
+        :param lazy: if True, only the file paths are read on 
+        load; each document is parsed when it is first used and
+        held in a cache bounded by max_loaded_docs and 
+        max_loaded_bytes. Evicted documents are parsed again from
+        disk on demand. The documents are sorted by id if an index 
+        gives their ids, and otherwise by file name, rather than 
+        by id as in an eager corpus.
+
+        :param max_loaded_docs: maximum number of parsed documents
+        to hold in memory in lazy mode
+
+        :param max_loaded_bytes: maximum combined file size of the 
+        parsed documents to hold in memory in lazy mode
+
+        :param index: if True, or a path to an index file, keeps 
+        a persistent index of document metadata, by default in a 
+        file next to the corpus folder. Only files that are new 
+        or changed since the index was last updated are read, and
+        the metadata filters are run on the index instead of on 
+        the XML.
+
+        :param header_only: if True, only the <teiHeader> of each 
+        file is parsed, which is much faster for metadata queries. 
+        Properties that need the edition, e.g. tokens, are not 
+        available until `HeaderEpiDoc.load_full` is called on the 
+        document. Cannot be combined with lazy mode.
         """
         ...
 
@@ -111,12 +390,25 @@ class EpiDocCorpus:
         self, 
         inpt: EpiDocCorpus | list[EpiDoc] | str | Path,
         max_iter: int | None = None,
-        ids_to_exclude: list[str] | None = None
+        ids_to_exclude: list[str] | None = None,
+        workers: int | None = None,
+        lazy: bool = False,
+        max_loaded_docs: int | None = None,
+        max_loaded_bytes: int | None = None,
+        index: bool | str | Path = False,
+        header_only: bool = False
     ):
 
+        self._errors = []
+        self._tree_cache = None
+        self._index = None
+        self._signatures = {}
+
         # inpt is an EpiDocCorpus
         if isinstance(inpt, EpiDocCorpus):
             self._docs = inpt.exclude_by_id(ids_to_exclude if ids_to_exclude else []).docs
+            self._errors = list(inpt.errors)
+            self._index = inpt._index
             return
         
         # inpt is a list of EpiDoc
@@ -128,7 +420,10 @@ class EpiDocCorpus:
             if isinstance(inpt[0], EpiDoc):
                 inpt = cast(list[EpiDoc], inpt)
 
-                self._docs = [doc for doc in inpt if doc.id not in (ids_to_exclude if ids_to_exclude else [])]
+                # Only read the ids if needed, so that lazy documents
+                # are not parsed
+                self._docs = [doc for doc in inpt if doc.id not in ids_to_exclude] \
+                    if ids_to_exclude else list(inpt)
 
                 return
 
@@ -137,7 +432,26 @@ class EpiDocCorpus:
         
         # inpt is a path
         elif isinstance(inpt, (str, Path)):
-            self._handle_fp(Path(inpt), max_iter=max_iter, ids_to_exclude=ids_to_exclude)
+            if lazy and header_only:
+                raise ValueError('A corpus cannot be both lazy and header_only.')
+
+            if lazy:
+                self._tree_cache = TreeCache(max_loaded_docs, max_loaded_bytes)
+
+            self._handle_fp(
+                Path(inpt), 
+                max_iter=max_iter, 
+                ids_to_exclude=ids_to_exclude,
+                workers=workers,
+                header_only=header_only
+            )
+
+            if index:
+                index_path = MetadataIndex.default_path(inpt) \
+                    if index is True else Path(index)
+                self._index = MetadataIndex(index_path)
+                self._update_index()
+
             return
         
         raise TypeError("Invalid input type.")
@@ -164,6 +478,55 @@ class EpiDocCorpus:
         Return an abbreviations object for doing queries on abbreviations
         """
         return Abbreviations(self.expans)
+
+    def build_entity_index(self, path: str | Path | None = None) -> EntityIndex:
+        """
+        Build an inverted index of the names, name types, persName
+        and roleName types and subtypes, and <g> references in the
+        corpus, which the name, persName, roleName and g-ref filters
+        then use instead of reading each document. 
+
+        :param path: a JSON file to keep the index in; see 
+        `build_form_index`
+        """
+
+        index = self._build_value_index(EntityIndex, path)
+        self._entity_index = index
+        return index
+
+    def build_form_index(self, path: str | Path | None = None) -> FormIndex:
+        """
+        Build an inverted index of the forms, lemmata and original
+        forms of the tokens in the corpus, which `filter_by_form`
+        and `filter_by_lemmata` then use instead of reading the
+        tokens of each document. Build the index again, without
+        a path, after tokenizing or lemmatizing the documents 
+        in memory.
+
+        :param path: a JSON file to keep the index in. If the file
+        exists, only documents that are new, or whose files have
+        changed, are indexed, and the file is then updated.
+        """
+
+        index = self._build_value_index(FormIndex, path)
+        self._form_index = index
+        return index
+
+    def _build_value_index(
+            self, 
+            index_cls: type[_I], 
+            path: str | Path | None) -> _I:
+
+        index = index_cls.load(path) \
+            if path is not None and Path(path).exists() \
+            else index_cls()
+        
+        index.update(self.docs)
+
+        if path is not None:
+            index.save(path)
+
+        return index
     
     @property
     def count(self) -> int:
@@ -173,18 +536,36 @@ class EpiDocCorpus:
         return self.filter_by_languages([lang]).count
 
     @property
-    def datemax(self) -> int:
-        not_afters = remove_none([doc.not_after for doc in self.docs])
-        dates = [doc.date for doc in self.docs 
-            if doc.date is not None]
+    def chronology(self) -> ChronologyIndex:
+        """
+        Index of the dates of the documents, in the order of
+        `docs`, read once and kept until the corpus is refreshed 
+        or the header of one of its documents is changed through 
+        the pyepidoc API. If the corpus has a metadata index, the 
+        dates are read from it.
+
+        Changes to the dates made in other ways, e.g. editing 
+        @notBefore directly with lxml, are not detected: call 
+        `invalidate_chronology` after making them.
+        """
+
+        versions = tuple(doc._header_version() for doc in self.docs)
+
+        if self._chronology is None or \
+                self._chronology_versions != versions:
+            self._chronology = ChronologyIndex.from_docs(
+                [self._metadata(doc) for doc in self.docs])
+            self._chronology_versions = versions
 
-        return max(not_afters + dates)
+        return self._chronology
+
+    @property
+    def datemax(self) -> int:
+        return self.chronology.datemax
 
     @property
     def datemin(self) -> int:
-        not_befores = remove_none([doc.not_before for doc in self.docs])
-        dates = [doc.date for doc in self.docs if doc.date is not None]
-        return min(not_befores + dates)
+        return self.chronology.datemin
 
     @property
     def daterange(self) -> tuple[int, int]:
@@ -197,21 +578,67 @@ class EpiDocCorpus:
 
     @property
     def dateranges(self) -> list[tuple[Optional[int], Optional[int]]]:
-        return [doc.daterange for doc in self.docs]
+        return self.chronology.dateranges
 
     @property
     def datemean(self) -> Optional[int]:
-        datemeans = [datemean for datemean in self.datemeans 
-            if datemean is not None]
+        return self.chronology.datemean
 
-        if datemeans == []:
-            return None
+    @property
+    def datemeans(self) -> list[Optional[int]]:
+        """
+        The mean date of each document, as returned by 
+        `EpiDoc.date_mean`, which is an int
+        """
+        return self.chronology.datemeans
 
-        return int(sum(datemeans) / len(datemeans))
+    def date_histogram(
+            self, 
+            bin_size: int, 
+            start: Optional[int] = None, 
+            end: Optional[int] = None,
+            by: Literal['mean', 'interval'] = 'mean') -> list[HistogramBin]:
+        
+        """
+        Count the documents in bins of `bin_size` years;
+        see `ChronologyIndex.histogram`
+        """
+        return self.chronology.histogram(bin_size, start, end, by)
 
-    @property
-    def datemeans(self) -> list[Optional[float]]:
-        return [doc.date_mean for doc in self.docs]
+    def derived_states(
+            self, 
+            cache: DerivedStateCache | str | Path | None = None
+        ) -> list[DerivedState]:
+
+        """
+        Return the tokens, expansions, names, numbers and 
+        languages of each document as plain data, in the 
+        order of `docs`, whether or not a cache is used.
+
+        :param cache: a DerivedStateCache, or the folder for one. 
+        If given, unchanged files are read from the cache, and, 
+        in lazy mode, are not parsed.
+        """
+
+        if cache is None:
+            return [DerivedState.from_doc(doc) for doc in self.docs]
+
+        cache_ = cache if isinstance(cache, DerivedStateCache) \
+            else DerivedStateCache(cache)
+        
+        states: list[DerivedState] = []
+
+        for doc in self.docs:
+            if not hasattr(doc, '_p'):
+                states.append(DerivedState.from_doc(doc))
+                continue
+
+            try:
+                states.append(cache_.get(doc._p))
+            except TypeError as e:
+                self._errors.append(_load_error(doc._p, e))
+
+        return states
 
     @property
     def doc_count(self) -> int:
@@ -245,6 +672,13 @@ class EpiDocCorpus:
 
     @cached_property
     def docs(self) -> list[EpiDoc]:
+        """
+        The documents, sorted by id; in a lazy corpus without a
+        metadata index, sorted by file name, see `_lazy_docs`
+        """
+        if self._tree_cache is not None:
+            return self._lazy_docs()
+
         _docs: list[EpiDoc] = []
         try:
             for doc in self._docs:
@@ -262,6 +696,36 @@ class EpiDocCorpus:
             print(e)
             return []
         
+    def _lazy_docs(self) -> list[EpiDoc]:
+        """
+        Return the documents of a lazy corpus without parsing them:
+        sorted by id if every id has been read from the metadata
+        index, otherwise by file name. A file that cannot be parsed 
+        is found when the document is first used.
+        """
+        _docs = list(self._docs)
+
+        if self._index is not None and \
+                all(doc._id is not None for doc in _docs):
+            return list(sorted(_docs, key=lambda doc: doc.id))
+        
+        return list(sorted(_docs, key=lambda doc: doc._p.name))
+
+    def _lazy_ids(self) -> list[str]:
+        """
+        Return the ids of the documents of a lazy corpus, 
+        recording any document that cannot be parsed in `errors`
+        """
+        ids: list[str] = []
+        for doc in self.docs:
+            try:
+                ids.append(doc.id)
+            except TypeError as e:
+                if doc._p not in [error.path for error in self._errors]:
+                    self._errors.append(_load_error(doc._p, e))
+        
+        return ids
+
     @property
     def docs_with_no_or_empty_main_edition(self) -> list[EpiDoc]:
         """
@@ -296,7 +760,7 @@ class EpiDocCorpus:
         Return a new corpus excluding docs with given ids
         """
 
-        return EpiDocCorpus([doc for doc in self.docs
+        return self._subcorpus([doc for doc in self.docs
                              if doc.id not in doc_ids])
 
     @property
@@ -305,24 +769,94 @@ class EpiDocCorpus:
         Return a list of Expan objects, that 
         contain information about abbreviations
         """
-        return list(chain(*[doc.expans for doc in self.docs]))
+        return list(self.iter_expans())
 
-    def filter_by_dateafter(self, start: int) -> EpiDocCorpus:
-        docs = [doc for doc in self.docs if doc.is_after(start)]
+    def facets(
+            self,
+            facets: Optional[Sequence[Facet]] = None,
+            min_freq: int = 0,
+            sort_on: Optional[Literal['value', 'count']] = 'count',
+            reverse: bool = True,
+            errors: Optional[list[FacetError]] = None) -> dict[Facet, list[FacetCount]]:
+        
+        """
+        Count the documents with each value of each of `facets`,
+        e.g. 'orig_place', 'textclass' or 'decade', in a single
+        pass over the corpus. If the corpus has a metadata index,
+        the values are read from the index, so that the documents
+        are not queried (or, in lazy mode, parsed). A document
+        whose value of a facet cannot be read is left out of the
+        counts of that facet, and recorded in `errors`.
+
+        :param facets: the facets to count; by default all of 
+        them, except 'lang' in a header-only corpus, which does 
+        not have the editions
+        :param min_freq: leave out values found in fewer documents
+        :param sort_on: sort by 'value' or by 'count', or leave 
+        the values in the order first found if None
+        :param reverse: sort in descending order
+        :param errors: a list to add a FacetError to for each
+        document and facet that could not be read
+        """
+
+        if facets is None:
+            facets = [facet for facet in FACETS 
+                      if not (self._header_only and facet == 'lang')]
+
+        return count_facets(
+            (self._metadata(doc) for doc in self.docs),
+            facets=facets,
+            min_freq=min_freq,
+            sort_on=sort_on,
+            reverse=reverse,
+            errors=errors
+        )
+
+    def _facet_values(self, facet: Facet) -> set[str]:
+        """
+        The distinct values of a facet in the corpus
+
+        :raises ValueError: if the value cannot be read from 
+        a document
+        """
+        errors: list[FacetError] = []
+        counts = self.facets([facet], sort_on=None, errors=errors)[facet]
+
+        if errors != []:
+            raise ValueError(f'Could not read {facet} from {errors[0].doc_id}: '
+                             f'{errors[0].message}')
+        
+        return {str(count.value) for count in counts}
+
+    def filter_by_authority(self, authorities: list[str]) -> EpiDocCorpus:
+        """
+        Return a subcorpus of the documents whose <authority>
+        is one of `authorities`
+        """
+        return self._select(lambda doc: doc.authority in authorities)
 
-        return EpiDocCorpus(docs)
+    def filter_by_dateafter(self, start: int) -> EpiDocCorpus:
+        return self._select_rows(self.chronology.rows_after(start))
     
     def filter_by_datebefore(self, end: int) -> EpiDocCorpus:
-        docs = [doc for doc in self.docs if doc.is_before(end)]
+        return self._select_rows(self.chronology.rows_before(end))
 
-        return EpiDocCorpus(docs)
+    def filter_by_date_overlap(self, start: int, end: int) -> EpiDocCorpus:
+        """
+        Return a subcorpus of the documents whose date range
+        overlaps the years `start` to `end`, inclusive
+        """
+        return self._select_rows(self.chronology.overlapping(start, end))
+
+    def filter_by_date_within(self, start: int, end: int) -> EpiDocCorpus:
+        """
+        Return a subcorpus of the documents whose date range
+        lies within the years `start` to `end`, inclusive
+        """
+        return self._select_rows(self.chronology.contained(start, end))
 
     def filter_by_daterange(self, start: int, end: int) -> EpiDocCorpus:
-        
-        docs = [doc for doc in self.docs
-            if doc.is_after(start) and doc.is_before(end)]
-        
-        return EpiDocCorpus(docs)
+        return self._select_rows(self.chronology.rows_in_range(start, end))
 
     def filter_by_form(
         self, 
@@ -331,6 +865,10 @@ class EpiDocCorpus:
         ignore_case: bool=True
     ) -> EpiDocCorpus:
         
+        if self._form_index is not None:
+            return self._filter_by_value_index(
+                self._form_index, 'form', forms, set_relation, ignore_case)
+
         if ignore_case:
             forms_lower = [form.lower() for form in forms]
             docs = [doc for doc in self.docs
@@ -339,7 +877,36 @@ class EpiDocCorpus:
             docs = [doc for doc in self.docs
                 if set_relation(set(forms), doc.forms)]  
 
-        return EpiDocCorpus(inpt=docs)
+        return self._subcorpus(docs)
+
+    def _filter_by_value_index(
+            self, 
+            index: ValueIndex,
+            field: str,
+            keys: list[str],
+            set_relation: Callable[[set, set], bool],
+            ignore_case: bool = False) -> EpiDocCorpus:
+        
+        """
+        Filter on a value index, looking up the documents 
+        directly for an intersection, otherwise applying the 
+        set relation to the indexed values of each document
+        """
+
+        for doc in self.docs:
+            if doc.id not in index:
+                index.add(doc)
+
+        if set_relation is SetRelation.intersection:
+            doc_ids = index.doc_ids(keys, field, ignore_case)
+            return self._subcorpus([doc for doc in self.docs 
+                                    if doc.id in doc_ids])
+
+        query = {index.normalize(key, ignore_case) for key in keys}
+        return self._subcorpus([
+            doc for doc in self.docs 
+            if set_relation(query, set(index.doc_keys(doc.id, field, ignore_case)))
+        ])
 
     def filter_by_g_ref(
         self,
@@ -347,6 +914,10 @@ class EpiDocCorpus:
         set_relation: Callable[[set, set], bool]=SetRelation.intersection
     ) -> EpiDocCorpus:
         
+        if self._entity_index is not None:
+            return self._filter_by_value_index(
+                self._entity_index, 'g_ref', g_refs, set_relation)
+
         def _filter_by_rolename(doc: EpiDoc) -> bool:
             doc_g_refs = map(
                 lambda g: g.ref, 
@@ -358,7 +929,7 @@ class EpiDocCorpus:
             return False
 
         docs = filter(_filter_by_rolename, self.docs)
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_has_gap(
         self,
@@ -369,7 +940,7 @@ class EpiDocCorpus:
         docs = [doc for doc in self.docs
             if doc.has_gap(reasons=reasons) == has_gap]
         
-        return EpiDocCorpus(docs)
+        return self._subcorpus(docs)
 
     def filter_by_has_supplied(
         self,
@@ -390,7 +961,7 @@ class EpiDocCorpus:
         docs = [doc for doc in self.docs
             if doc.has_supplied == has_supplied]
         
-        return EpiDocCorpus(docs)
+        return self._subcorpus(docs)
     
     def filter_by_idrange(self, start: int, end: int) -> EpiDocCorpus:
         _int_range = range(start, end + 1)
@@ -405,7 +976,7 @@ class EpiDocCorpus:
         the ids in the ids list of strings
         """
         ids_ = [id for id in ids if id in self.docs_dict.keys()]
-        return EpiDocCorpus([self.docs_dict[id] for id in ids_])
+        return self._subcorpus([self.docs_dict[id] for id in ids_])
 
     def filter_by_languages(self, 
         langs: list[str], 
@@ -423,10 +994,8 @@ class EpiDocCorpus:
         on the <div> elements in the edition.
         """
 
-        docs = [doc for doc in self.docs
-            if set_relation(set(langs), doc.get_lang_attr(language_attr))]
-        
-        return EpiDocCorpus(docs)
+        return self._select(
+            lambda doc: set_relation(set(langs), doc.get_lang_attr(language_attr)))
 
     def filter_by_lemmata(
         self, 
@@ -434,10 +1003,14 @@ class EpiDocCorpus:
         set_relation = SetRelation.intersection
     ) -> EpiDocCorpus:
     
+        if self._form_index is not None:
+            return self._filter_by_value_index(
+                self._form_index, 'lemma', lemmata, set_relation)
+
         docs = [doc for doc in self.docs
             if set_relation(set(lemmata), doc.lemmata)]  
 
-        return EpiDocCorpus(docs)
+        return self._subcorpus(docs)
 
     def filter_by_materialclass(
         self, 
@@ -451,7 +1024,7 @@ class EpiDocCorpus:
         one of the strings in *materialclasses*,
         according to the value of the parameter *string_relation*
         """
-#
+
         def filterstr(s1: str, s2: str) -> bool:
             if string_relation == 'equal':
                 return s1 == s2
@@ -459,15 +1032,10 @@ class EpiDocCorpus:
             if string_relation == 'substring':
                 return s1 in s2
         
-        docs = list[EpiDoc]()
-
-        for doc in self.docs:
-            for doc_material in doc.materialclasses:
-                for q_material in materialclasses:
-                    if filterstr(q_material, doc_material):
-                        docs.append(doc)
-
-        return EpiDocCorpus(docs)
+        return self._select(
+            lambda doc: any(filterstr(q_material, doc_material)
+                            for doc_material in doc.materialclasses
+                            for q_material in materialclasses))
 
     def filter_by_name(
         self,
@@ -482,13 +1050,17 @@ class EpiDocCorpus:
         :param set_relation: a value of SetRelation
         """
 
+        if self._entity_index is not None:
+            return self._filter_by_value_index(
+                self._entity_index, 'name', names, set_relation)
+
         def filter_by_name(doc: EpiDoc) -> bool:
             doc_names = map(lambda name: name.form, doc.names())
             return set_relation(set(names), set(doc_names))
 
         docs = filter(filter_by_name, self.docs)  
 
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_name_type(
         self,
@@ -503,13 +1075,17 @@ class EpiDocCorpus:
         :param set_relation: a value of SetRelation
         """
 
+        if self._entity_index is not None:
+            return self._filter_by_value_index(
+                self._entity_index, 'name_type', name_types, set_relation)
+
         def filter_by_name(doc: EpiDoc) -> bool:
             doc_name_types = map(lambda name: name.name_type, doc.names())
             return set_relation(set(name_types), set(doc_name_types))
 
         docs = filter(filter_by_name, self.docs)  
 
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_num_value(
         self,
@@ -533,7 +1109,7 @@ class EpiDocCorpus:
 
         docs = filter(_filter_by_num_value, self.docs)  
 
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_orig_place(
         self,
@@ -548,10 +1124,8 @@ class EpiDocCorpus:
         :param set_relation: a value of SetRelation
         """
 
-        docs = [doc for doc in self.docs
-            if set_relation(set(orig_places), set([doc.orig_place]))]
-
-        return EpiDocCorpus(docs)
+        return self._select(
+            lambda doc: set_relation(set(orig_places), set([doc.orig_place])))
 
     def filter_by_pers_name_type(
         self,
@@ -559,6 +1133,10 @@ class EpiDocCorpus:
         set_relation: Callable[[set, set], bool]=SetRelation.intersection
     ) -> EpiDocCorpus:
         
+        if self._entity_index is not None:
+            return self._filter_by_value_index(
+                self._entity_index, 'pers_name_type', pers_name_types, set_relation)
+
         def _filter_by_pers_name(doc: EpiDoc) -> bool:
             doc_pers_name_types = map(
                 lambda pers_name: pers_name.pers_name_type, 
@@ -570,7 +1148,7 @@ class EpiDocCorpus:
             return False
 
         docs = filter(_filter_by_pers_name, self.docs)
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_role_name_subtype(
         self,
@@ -578,6 +1156,10 @@ class EpiDocCorpus:
         set_relation: Callable[[set, set], bool]=SetRelation.intersection
     ) -> EpiDocCorpus:
         
+        if self._entity_index is not None:
+            return self._filter_by_value_index(
+                self._entity_index, 'role_name_subtype', role_name_subtypes, set_relation)
+
         def _filter_by_rolename(doc: EpiDoc) -> bool:
             doc_role_subtypes = map(
                 lambda rolename: rolename.role_name_subtype, 
@@ -589,7 +1171,7 @@ class EpiDocCorpus:
             return False
 
         docs = filter(_filter_by_rolename, self.docs)
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_role_name_type(
         self,
@@ -597,6 +1179,10 @@ class EpiDocCorpus:
         set_relation: Callable[[set, set], bool]=SetRelation.intersection
     ) -> EpiDocCorpus:
         
+        if self._entity_index is not None:
+            return self._filter_by_value_index(
+                self._entity_index, 'role_name_type', role_types, set_relation)
+
         def _filter_by_rolename(doc: EpiDoc) -> bool:
             doc_role_name_types = map(
                 lambda rolename: rolename.role_name_type, 
@@ -608,7 +1194,7 @@ class EpiDocCorpus:
             return False
 
         docs = filter(_filter_by_rolename, self.docs)
-        return EpiDocCorpus(list(docs))
+        return self._subcorpus(list(docs))
 
     def filter_by_textclass(
         self, 
@@ -619,27 +1205,31 @@ class EpiDocCorpus:
         # Convert input textclasses to their string representation
         _textclasses = list(map(str, textclasses))
     
-        docs = [
-            doc for doc in self.docs
-            if set_relation(
-                set(_textclasses), 
-                set(doc.textclasses))
-        ]
-
-        return EpiDocCorpus(docs)
+        return self._select(
+            lambda doc: set_relation(set(_textclasses), set(doc.textclasses)))
     
+    @property
+    def errors(self) -> list[LoadError]:
+        """
+        Return the files that could not be loaded when the 
+        corpus was read from a folder
+        """
+        return self._errors
+
     @staticmethod
     def from_path(
         path: Path | str, 
-        max_iter: int | None) -> EpiDocCorpus:
+        max_iter: int | None,
+        workers: int | None = None) -> EpiDocCorpus:
 
         """
         Return an EpiDoc corpus from a folder path
 
         :max_iter: Max number of items in the corpus
+        :workers: Number of threads to use when parsing the files
         """
 
-        return EpiDocCorpus(path, max_iter)
+        return EpiDocCorpus(path, max_iter, workers=workers)
 
     @property
     def formatted_text(self) -> str:
@@ -659,7 +1249,28 @@ class EpiDocCorpus:
         
         return docs[0]
 
-    def _handle_fp(self, _p: Path | str, max_iter: int | None = None, ids_to_exclude: list[str] | None = None) -> None:
+    def _handle_fp(
+            self, 
+            _p: Path | str, 
+            max_iter: int | None = None, 
+            ids_to_exclude: list[str] | None = None,
+            workers: int | None = None,
+            header_only: bool = False) -> None:
+        
+        """
+        Load the .xml files in a folder. Files are visited in 
+        filename order; files that cannot be parsed are recorded 
+        in `errors` rather than included in the corpus.
+
+        :param workers: if greater than 1, parse the files on a 
+        thread pool of this size. lxml releases the GIL while 
+        parsing, and parsed trees cannot be passed between processes.
+        Ignored in lazy mode, where no files are parsed on load.
+
+        :param header_only: if True, parse only the header of 
+        each file
+        """
+
         folder_path = Path(_p)
         
         if not folder_path.exists():
@@ -668,33 +1279,70 @@ class EpiDocCorpus:
         if not folder_path.is_dir():
             raise FileExistsError(f'Path {folder_path} is not a directory.')
 
-        iterations = 0
-        docs: list[EpiDoc] = []
-
-        if max_iter is None:
-            for fp in folder_path.iterdir():
-                if ids_to_exclude and fp.stem in ids_to_exclude:
-                    continue
-                if fp.suffix != '.xml':
-                    continue
-                try:
-                    docs.append(EpiDoc(fp))
-                except TypeError as e:
-                    print(f'Could not include {fp}. This may be because of an XML syntax error.')
-                    continue
-            
+        self._folder_path = folder_path
+        self._max_iter = max_iter
+        self._ids_to_exclude = ids_to_exclude
+        self._header_only = header_only
+
+        fps = self._list_files()
+
+        if fps == []:
+            print(f'WARNING: No .xml files found in {_p}')
+
+        self._signatures = {fp: _file_signature(fp) for fp in fps}
+        self._docs, self._errors = self._load_files(fps, workers)
+
+    def _list_files(self) -> list[Path]:
+        """
+        List the .xml files in the corpus folder, in filename 
+        order, applying `ids_to_exclude` and `max_iter`
+        """
+        if self._folder_path is None:
+            return []
+        
+        ids_to_exclude = self._ids_to_exclude
+        fps = (fp for fp in sorted(self._folder_path.iterdir())
+               if fp.suffix == '.xml' 
+               and not (ids_to_exclude and fp.stem in ids_to_exclude))
+        
+        return list(islice(fps, self._max_iter))
+
+    def _load_files(
+            self, 
+            fps: list[Path], 
+            workers: int | None = None
+        ) -> tuple[list[EpiDoc], list[LoadError]]:
+
+        """
+        Load the files at `fps` according to the load mode 
+        of the corpus
+        """
+
+        if self._tree_cache is not None:
+            cache = self._tree_cache
+            return [LazyEpiDoc(fp, cache) for fp in fps], []
+
+        load = _load_header_doc if self._header_only else _load_doc
+
+        if workers is not None and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(load, fps))
         else:
-            for fp in Path(_p).iterdir():
-                if fp.suffix == '.xml':
-                    docs += [EpiDoc(fp)]
-                    iterations += 1
-                
-                if iterations >= max_iter:
-                    break
-            
-            if iterations == 0:
-                print(f'WARNING: No .xml files found in {_p}')
-        self._docs = docs
+            results = list(map(load, fps))
+
+        docs = [result for result in results 
+                if isinstance(result, EpiDoc)]
+        errors = [result for result in results 
+                  if isinstance(result, LoadError)]
+        
+        return docs, errors
+
+    @property
+    def index(self) -> MetadataIndex | None:
+        """
+        The metadata index of the corpus, if there is one
+        """
+        return self._index
 
     @property
     def id_carriers(self) -> list[EpiDocElement]:
@@ -702,6 +1350,9 @@ class EpiDocCorpus:
 
     @cached_property
     def ids(self) -> list[str]:
+        if self._tree_cache is not None:
+            return self._lazy_ids()
+        
         return [doc.id for doc in self.docs
                 if doc.id is not None]
     
@@ -749,10 +1400,144 @@ class EpiDocCorpus:
             f'    -- in:{indent}{name_abbr_unique_docs.count} docs ({percentage(name_abbr_unique_docs.count, self.doc_count)}% total docs)'
         )
 
+    def invalidate_chronology(self) -> None:
+        """
+        Clear the chronology index, so that the dates are read 
+        again on next access
+        """
+        self._chronology = None
+
+    def _iter_docs(self, release: bool) -> Generator[EpiDoc, None, None]:
+        """
+        Yield the documents in order, releasing the parsed tree
+        of each lazy document once the caller has moved on 
+        to the next one, if `release` is True
+        """
+
+        for doc in self.docs:
+            yield doc
+
+            if release:
+                self._release(doc)
+
+    def iter_expans(self, release: bool = False) -> Generator[Expan, None, None]:
+        """
+        Yield the Expan objects of the corpus document by document.
+
+        :param release: if True, and the corpus is lazy, drop each
+        document's tree from memory once its expans have been yielded
+        """
+
+        for doc in self._iter_docs(release):
+            yield from doc.expans
+
+    def iter_names(
+            self, 
+            predicate: Callable[[Name], bool] = lambda _: True,
+            release: bool = False
+        ) -> Generator[Name, None, None]:
+
+        """
+        Yield the Name objects of the main edition of each
+        document, document by document.
+
+        :param predicate: a condition for whether or not to
+        include a name
+        :param release: if True, and the corpus is lazy, drop each
+        document's tree from memory once its names have been yielded
+        """
+
+        for doc in self._iter_docs(release):
+            yield from doc.names(predicate)
+
+    def iter_nums(self, release: bool = False) -> Generator[Num, None, None]:
+        """
+        Yield the Num objects of the corpus document by document.
+
+        :param release: if True, and the corpus is lazy, drop each
+        document's tree from memory once its nums have been yielded
+        """
+
+        for doc in self._iter_docs(release):
+            yield from doc.nums
+
+    def iter_tokens(self, release: bool = False) -> Generator[Token, None, None]:
+        """
+        Yield the tokens of the corpus, excluding tokens within 
+        tokens, document by document, so that only the tokens
+        of one document are held in memory at a time.
+
+        :param release: if True, and the corpus is lazy, drop each
+        document's tree from memory once its tokens have been 
+        yielded, so that the corpus can be traversed in
+        constant memory. The tree is parsed again from disk 
+        if the document is used later.
+        """
+
+        for doc in self._iter_docs(release):
+            yield from doc.tokens_no_nested
+
     @property
     def languages(self) -> set[str]:
-        return set([lang for doc in self.docs 
-                    for lang in doc.div_langs])
+        return self._facet_values('lang')
+
+    def lemmatize(
+            self,
+            lemmatize: Callable[[list[str]], list[str]],
+            where: Literal['main', 'separate'],
+            resp_stmt: RespStmt | None = None,
+            change: Change | None = None,
+            memo: LemmaMemo | str | Path | None = None,
+            batch_size: int | None = None,
+            verbose: bool = False,
+            fail_if_existing_lemmatized_edition: bool = True
+        ) -> EpiDocCorpus:
+
+        """
+        Lemmatize the <w> elements of all the documents in memory,
+        collecting the distinct forms across the corpus and 
+        lemmatizing each one once. Save the corpus with 
+        `save_to_folder` to keep the changes.
+
+        :param lemmatize: a function taking a list of forms and
+        returning a list of their lemmata, in the same order
+        :param where: where to put the lemmata, either on the main
+        edition or on a separate lemmatized edition
+        :param memo: a LemmaMemo, or the path to a JSON file for 
+        one, holding forms already lemmatized. A memo with a path
+        is saved after lemmatization.
+        :param batch_size: the maximum number of forms to pass
+        to `lemmatize` at a time
+        :param fail_if_existing_lemmatized_edition: raise an 
+        exception, before changing any document, if a document 
+        already has a lemmatized edition and `where` is 'separate'
+        """
+
+        from pyepidoc.processing.operations import (
+            LemmaMemo, 
+            apply_batch_lemmatization
+        )
+
+        if self._tree_cache is not None:
+            raise ValueError('A lazy corpus cannot be lemmatized, since '
+                             'changes are lost when a tree is evicted.')
+
+        memo_ = memo if isinstance(memo, LemmaMemo) or memo is None \
+            else LemmaMemo(memo)
+
+        apply_batch_lemmatization(
+            self.docs, 
+            lemmatize, 
+            where, 
+            resp_stmt=resp_stmt, 
+            change=change, 
+            verbose=verbose,
+            memo=memo_, 
+            batch_size=batch_size,
+            fail_if_existing_lemmatized_edition=fail_if_existing_lemmatized_edition
+        )
+
+        return self
 
     def lemmatizable_docs(self) -> GenericCollection[EpiDoc]:
         """
@@ -782,36 +1567,22 @@ class EpiDocCorpus:
         if sort_on not in ['place', 'freq', None]:
             raise ValueError(f'Cannot sort on {sort_on}.')
 
-        places = [doc.orig_place for doc in self.docs]
-        unique_places = set(places)
-
-        if sort_on == 'place':
-            places = sorted(unique_places, reverse=reverse)
+        if not frequencies:
+            places = [doc.orig_place for doc in self.docs]
 
-        if frequencies:
-            places_with_freq = [
-                (
-                    unique_place, 
-                    len(list(filter(lambda doc: doc.orig_place==unique_place, self.docs)))
-                ) 
-                for unique_place in unique_places
-            ]
-
-            # Filter out those below minimum frequency
-            places_with_freq = [x for x in places_with_freq if x[1] >= min_freq]
+            if sort_on == 'place':
+                return sorted(set(places), reverse=reverse)
             
-            if sort_on == 'freq':
-                places_with_freq = sorted(
-                    places_with_freq, 
-                    key=lambda place_with_freq: place_with_freq[1], 
-                    reverse=reverse
-            )
-
-                return places_with_freq
+            return places
 
-            return places_with_freq
+        counts = self.facets(
+            ['orig_place'], 
+            min_freq=min_freq, 
+            sort_on={'place': 'value', 'freq': 'count', None: None}[sort_on],
+            reverse=reverse
+        )['orig_place']
 
-        return places
+        return [(str(place), count) for place, count in counts]
     
     def map(self, func: Callable[[EpiDoc], T]) -> GenericCollection[T]:
         """
@@ -819,13 +1590,24 @@ class EpiDocCorpus:
         """
         return GenericCollection(list(map(func, self.docs)))
     
+    def _metadata(self, doc: EpiDoc) -> EpiDoc | DocMetadata:
+        """
+        Return the indexed metadata for a document, or the 
+        document itself if it is not indexed
+        """
+        if self._index is None or not hasattr(doc, '_p'):
+            return doc
+
+        metadata = self._index.get(doc._p)
+        return doc if metadata is None else metadata
+
     @property
     def materialclasses(self) -> set[str]:
         """
         Set of material classes in the corpus
         """
 
-        return set(chain(*[doc.materialclasses for doc in self.docs]))
+        return self._facet_values('materialclass')
     
     @property
     def mean_token_count(self) -> float:
@@ -863,8 +1645,7 @@ class EpiDocCorpus:
         a condition for whether or not to include a name.
         Defaults to returning True.
         """
-        names = list(chain(*[doc.names(predicate) for doc in self.docs]))
-        return GenericCollection(names)
+        return GenericCollection(self.iter_names(predicate))
 
     def non_lemmatizable_files(self) -> GenericCollection[EpiDoc]:
         """
@@ -879,12 +1660,21 @@ class EpiDocCorpus:
 
     @property
     def nums(self) -> list[Num]:
-        return list(chain(*[doc.nums for doc in self.docs]))
+        return list(self.iter_nums())
 
     @property
     def pers_names(self) -> list[PersName]:
         return list(chain(*[doc.pers_names for doc in self.docs]))
 
+    def _release(self, doc: EpiDoc) -> None:
+        """
+        Drop the parsed tree of a lazy document from the tree 
+        cache, and from the caches that refer to its elements
+        """
+
+        if self._tree_cache is not None:
+            self._tree_cache.invalidate(doc._p)
+
     @cached_property
     def prefix(self) -> str:
         doc = maxone(self.docs, None, throw_if_more_than_one=True)
@@ -952,7 +1742,13 @@ class EpiDocCorpus:
 
     @cached_property
     def textclasses(self) -> set[str]:
-        return self._get_textclasses(True)
+        """
+        Set of text classes in the corpus
+
+        :raises ValueError: if a document has more than one
+        <textClass>; see `_get_textclasses`
+        """
+        return self._facet_values('textclass')
     
     @cached_property
     def texttypes(self) -> GenericCollection[str]:
@@ -964,6 +1760,106 @@ class EpiDocCorpus:
                     for textclass in doc.get_textclasses(
                         throw_if_more_than_one=throw_if_more_than_one)])
 
+    def _select(
+            self, 
+            predicate: Callable[[EpiDoc | DocMetadata], bool]) -> EpiDocCorpus:
+        
+        """
+        Return a subcorpus of the documents matching a predicate
+        on document metadata. If the corpus has a metadata index,
+        the predicate is applied to the indexed metadata, so that
+        the documents are not queried (or, in lazy mode, parsed).
+        """
+
+        return self._subcorpus([doc for doc in self.docs 
+                                if predicate(self._metadata(doc))])
+
+    def _select_rows(self, rows: list[int]) -> EpiDocCorpus:
+        """
+        Return a subcorpus of the documents at positions 
+        `rows` in `docs`, in the same way as `_select`
+        """
+
+        return self._subcorpus([self.docs[row] for row in rows])
+
+    def _subcorpus(self, docs: list[EpiDoc]) -> EpiDocCorpus:
+        """
+        Return a corpus of `docs` sharing this corpus's 
+        tree cache and metadata index
+        """
+        corpus = EpiDocCorpus(docs)
+        corpus._header_only = self._header_only
+        corpus._tree_cache = self._tree_cache
+        corpus._index = self._index
+        corpus._form_index = self._form_index
+        corpus._entity_index = self._entity_index
+        return corpus
+
+    def refresh(self, workers: int | None = None) -> RefreshResult:
+        """
+        Bring a corpus loaded from a folder up to date with the 
+        folder. Files are compared by modification time and size 
+        with those loaded: only added and modified files are 
+        (re-)loaded, and documents whose files have been deleted
+        are dropped. Cached properties such as `docs`, `docs_dict` 
+        and `ids` are recomputed on next access.
+
+        :param workers: number of threads to use when parsing 
+        the added and modified files
+        :return: the files added, modified and removed
+        """
+
+        if self._folder_path is None:
+            raise ValueError('Only a corpus loaded from a folder can be refreshed.')
+
+        fps = self._list_files()
+        signatures = {fp: _file_signature(fp) for fp in fps}
+
+        added = [fp for fp in fps if fp not in self._signatures]
+        modified = [fp for fp in fps if fp in self._signatures 
+                    and signatures[fp] != self._signatures[fp]]
+        removed = [fp for fp in self._signatures if fp not in signatures]
+
+        stale = set(modified + removed)
+        changed = set(added + modified + removed)
+
+        if self._tree_cache is not None:
+            for fp in stale:
+                self._tree_cache.invalidate(fp)
+        else:
+            for doc in self._docs:
+                if doc._p in stale and doc.e is not None:
+                    release_tree(doc.e)
+
+        docs, errors = self._load_files(added + modified, workers)
+        
+        self._docs = [doc for doc in self._docs if doc._p not in stale] + docs
+        self._errors = [error for error in self._errors 
+                        if error.path not in changed] + errors
+        self._signatures = signatures
+
+        if self._index is not None:
+            self._index.remove(removed)
+            self._update_index()
+
+        self._clear_cached_properties()
+        self._chronology = None
+
+        for value_index in (self._form_index, self._entity_index):
+            if value_index is not None:
+                value_index.update(self.docs)
+
+        return RefreshResult(added=added, modified=modified, removed=removed)
+
+    def _clear_cached_properties(self) -> None:
+        """
+        Remove the cached values of the corpus's cached 
+        properties, so that they are recomputed on next access
+        """
+        for name, attr in type(self).__dict__.items():
+            if isinstance(attr, cached_property):
+                self.__dict__.pop(name, None)
+
     def save_to_folder(
             self, 
             folder_path: str, 
@@ -994,6 +1890,23 @@ class EpiDocCorpus:
     def token_count(self) -> int:
         return sum([doc.token_count for doc in self.docs])
 
+    def token_languages(self) -> TextLanguages:
+        """
+        Return the language of each token in `tokens` and of each
+        expan in `expans`, annotating each document in a single 
+        pass with `EpiDoc.annotate_languages`
+        """
+
+        tokens: list[Optional[str]] = []
+        expans: list[Optional[str]] = []
+
+        for doc in self.docs:
+            doc_langs = doc.annotate_languages()
+            tokens += doc_langs.tokens
+            expans += doc_langs.expans
+
+        return TextLanguages(tokens=tokens, expans=expans)
+
     def tokenize_to_folder(
         self, 
         dstfolder: str | Path, 
@@ -1005,8 +1918,9 @@ class EpiDocCorpus:
         insert_ws_inside_name_and_num: bool = True,
         verbose: bool = False,
         overwrite_existing: bool = False,
-        retokenize: bool = True
-    ) -> None:
+        retokenize: bool = True,
+        workers: int | None = None
+    ) -> TokenizeSummary:
 
         """
         Tokenizes the corpus and writes out the files 
@@ -1014,44 +1928,154 @@ class EpiDocCorpus:
         If a file cannot be tokenized, a message is printed
         to stdout and the file is not included in the 
         tokenized corpus.
+
+        :param workers: if greater than 1, tokenize the documents
+        on a pool of this many processes. Each document is 
+        serialized as it is in memory and parsed again by a 
+        process, so changes made to the documents in memory are
+        included, and the output is the same as when tokenizing 
+        serially. The documents in this corpus are not changed.
+        :return: a summary of the documents that were and were 
+        not tokenized, with timings
         """
 
-        for doc in sorted(self.docs, key=lambda doc: doc.id):
-            if verbose: 
-                print('Tokenizing', doc.id)
+        dstfolder_path = Path(dstfolder)
+        if not dstfolder_path.exists():
+            raise FileExistsError(f'Folder {dstfolder} does not exist')
 
-            try:
-                if not doc.has_no_main_edition:
-                    doc.tokenize(
-                        prettify_edition=prettify_edition, 
-                        add_space_between_words=add_space_between_w_elements, 
-                        set_universal_ids=set_universal_ids, 
-                        set_n_ids=set_n_ids,
-                        convert_ws_to_names=convert_ws_to_names, 
-                        verbose=verbose,
-                        insert_ws_inside_named_entities=insert_ws_inside_name_and_num,
-                        retokenize=retokenize
-                    )
-                else: 
-                    print(f'Could not tokenize {doc.id}: no main edition found.')
-            except ValueError as e:
-                print(e)
-                continue
-            
-            self._doc_to_xml_file(
-                dstfolder, 
-                doc,
-                verbose,
-                overwrite_existing=overwrite_existing
-            )
+        options = _TokenizeOptions(
+            prettify_edition=prettify_edition, 
+            add_space_between_words=add_space_between_w_elements, 
+            set_universal_ids=set_universal_ids, 
+            set_n_ids=set_n_ids,
+            convert_ws_to_names=convert_ws_to_names, 
+            verbose=verbose,
+            insert_ws_inside_named_entities=insert_ws_inside_name_and_num,
+            retokenize=retokenize,
+            overwrite_existing=overwrite_existing
+        )
+
+        start = time.perf_counter()
+        docs = sorted(self.docs, key=lambda doc: doc.id)
+
+        if workers is not None and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    _tokenize_xml,
+                    (doc.to_byte_str() for doc in docs),
+                    [dstfolder_path] * len(docs),
+                    [options] * len(docs)
+                ))
+        else:
+            results = [_tokenize_doc(doc, dstfolder_path, options) 
+                       for doc in docs]
+
+        results.sort(key=lambda result: result.id)
+
+        return TokenizeSummary(
+            succeeded=[result for result in results if result.error is None],
+            failed=[result for result in results if result.error is not None],
+            seconds=time.perf_counter() - start
+        )
 
     @property
     def tokens(self) -> GenericCollection[Token]:
-        _tokens = list(chain(*[doc.tokens_no_nested for doc in self.docs]))
-        return GenericCollection(_tokens)
+        return GenericCollection(self.iter_tokens())
     
     def top(self, length=10) -> EpiDocCorpus:
-        return EpiDocCorpus(list(top(self.docs, length)))
+        return self._subcorpus(list(top(self.docs, length)))
+
+    @property
+    def tree_cache(self) -> TreeCache | None:
+        """
+        The cache of parsed trees if the corpus was loaded 
+        lazily, otherwise None
+        """
+        return self._tree_cache
+
+    def _update_index(self) -> None:
+        """
+        Bring the metadata index up to date with the files in
+        the corpus. In lazy mode the document ids are taken from 
+        the index, so that sorting the documents does not parse them.
+        """
+        if self._index is None:
+            return
+        
+        docs = cast(list[EpiDoc], self._docs)
+
+        if self._tree_cache is None:
+            # Header-only documents lack the edition-level metadata
+            self._index.update(
+                [doc._p for doc in docs], 
+                {doc._p: doc for doc in docs 
+                 if not (isinstance(doc, HeaderEpiDoc) and doc.is_header_only)}
+            )
+            return
+
+        self._index.update([doc._p for doc in docs])
+        for doc in docs:
+            metadata = self._index.get(doc._p)
+            if isinstance(doc, LazyEpiDoc) and metadata is not None:
+                doc._set_cached_id(metadata.id)
+
+    def validate(
+            self, 
+            workers: int | None = None,
+            cache: ValidationCache | Path | str | None = None,
+            force: bool = False) -> list[ValidationResult]:
+        
+        """
+        Validate each document against the TEI EpiDoc RelaxNG 
+        schema. The compiled schema is cached, so it is only 
+        compiled once per process.
+
+        :param workers: if greater than 1, validate the documents 
+        on a pool of this many processes. Each process parses the 
+        document again from its file, so changes made to the 
+        documents in memory are not included; documents without 
+        a file are validated in this process.
+        :param cache: a ValidationCache, or the path to one: 
+        documents whose content is unchanged since they were 
+        last validated against the schema are not validated again
+        :param force: if True, validate every document even if 
+        there is a cached result
+        :return: a validation result for each document, in id order
+        """
+
+        docs = sorted(self.docs, key=lambda doc: doc.id)
+
+        if cache is None:
+            cache_ = None
+        else:
+            cache_ = cache if isinstance(cache, ValidationCache) \
+                else ValidationCache(cache)
+
+        try:
+            if workers is None or workers <= 1:
+                return [_validate_doc(doc, cache_, force) for doc in docs]
+            
+            results = [_validate_doc(doc, cache_, force) 
+                       for doc in docs if not hasattr(doc, '_p')]
+            
+            # SQLite connections cannot be passed to other processes, 
+            # so each worker opens the cache from its path
+            file_docs = [doc for doc in docs if hasattr(doc, '_p')]
+            cache_path = cache_.path if cache_ is not None else None
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results += executor.map(
+                    _validate_file, 
+                    [doc._p for doc in file_docs],
+                    [cache_path] * len(file_docs),
+                    [force] * len(file_docs)
+                )
+
+            return sorted(results, key=lambda result: result.id)
+        
+        finally:
+            if cache_ is not None and cache_ is not cache:
+                cache_.close()
 
     def where(self, predicate: Callable[[EpiDoc], bool]) -> EpiDocCorpus:
         """
@@ -1059,4 +2083,4 @@ class EpiDocCorpus:
         """
         docs = [doc for doc in self.docs 
                              if predicate(doc)]
-        return EpiDocCorpus(docs)
\ No newline at end of file
+        return self._subcorpus(docs)
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""
+Persistent index of document metadata for an EpiDoc corpus,
+so that corpora can be filtered on metadata without parsing
+the XML files.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Literal, Optional, Sequence
+from pathlib import Path
+import json
+import sqlite3
+
+from .epidoc import EpiDoc
+from .errors import TEINSError
+
+
+SCHEMA_VERSION = 2
+
+_COLUMNS = [
+    'path',
+    'mtime_ns',
+    'size',
+    'id',
+    'authority',
+    'not_before',
+    'not_after',
+    'date',
+    'langs',
+    'div_langs',
+    'textclasses',
+    'materialclasses',
+    'orig_place',
+    'texttype',
+    'token_count'
+]
+
+
+class DocMetadata:
+
+    """
+    Metadata for a single document as held in a MetadataIndex.
+    Provides the same metadata properties and date methods as
+    EpiDoc, so that filter predicates can be applied to either.
+    """
+
+    path: Path
+    id: str
+    authority: Optional[str]
+    not_before: Optional[int]
+    not_after: Optional[int]
+    date: Optional[int]
+    langs: list[str]
+    div_langs: set[str]
+    _textclasses: Optional[list[str]]
+    materialclasses: list[str]
+    orig_place: str
+    texttype: Optional[str]
+    token_count: Optional[int]
+
+    def __init__(
+            self,
+            path: Path,
+            id: str,
+            authority: Optional[str],
+            not_before: Optional[int],
+            not_after: Optional[int],
+            date: Optional[int],
+            langs: list[str],
+            div_langs: set[str],
+            textclasses: Optional[list[str]],
+            materialclasses: list[str],
+            orig_place: str,
+            texttype: Optional[str],
+            token_count: Optional[int]):
+
+        self.path = path
+        self.id = id
+        self.authority = authority
+        self.not_before = not_before
+        self.not_after = not_after
+        self.date = date
+        self.langs = langs
+        self.div_langs = div_langs
+        self._textclasses = textclasses
+        self.materialclasses = materialclasses
+        self.orig_place = orig_place
+        self.texttype = texttype
+        self.token_count = token_count
+
+    def __repr__(self) -> str:
+        return f'DocMetadata(id="{self.id}")'
+
+    @classmethod
+    def from_doc(cls, path: Path, doc: EpiDoc) -> DocMetadata:
+        """
+        Read the metadata from a parsed document
+        """
+
+        try:
+            textclasses: Optional[list[str]] = doc.textclasses
+        except ValueError:
+            # Kept as None so that filtering by textclass raises
+            # in the same way as on the EpiDoc itself
+            textclasses = None
+
+        try:
+            token_count: Optional[int] = doc.token_count
+        except ValueError:
+            token_count = None
+
+        return cls(
+            path=path,
+            id=doc.id,
+            authority=doc.authority,
+            not_before=doc.not_before,
+            not_after=doc.not_after,
+            date=doc.date,
+            langs=doc.langs,
+            div_langs=doc.div_langs,
+            textclasses=textclasses,
+            materialclasses=doc.materialclasses,
+            orig_place=doc.orig_place,
+            texttype=doc.texttype,
+            token_count=token_count
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> DocMetadata:
+        values = dict(zip(_COLUMNS, row))
+        textclasses = json.loads(values['textclasses'])
+
+        return cls(
+            path=Path(values['path']),
+            id=values['id'],
+            authority=values['authority'],
+            not_before=values['not_before'],
+            not_after=values['not_after'],
+            date=values['date'],
+            langs=json.loads(values['langs']),
+            div_langs=set(json.loads(values['div_langs'])),
+            textclasses=textclasses,
+            materialclasses=json.loads(values['materialclasses']),
+            orig_place=values['orig_place'],
+            texttype=values['texttype'],
+            token_count=values['token_count']
+        )
+
+    def get_lang_attr(
+            self,
+            lang_attr: Literal['div_langs'] | Literal['langs']
+        ) -> set[str]:
+
+        if lang_attr == 'div_langs':
+            return self.div_langs
+
+        elif lang_attr == 'langs':
+            return set(self.langs)
+
+        raise ValueError(f'Invalid lang_attr {lang_attr}')
+
+    def is_after(self, start: int) -> bool:
+        """
+        Return True if either @notBefore is greater than
+        `end` or @date is greater than `end`
+        """
+
+        if self.not_before is not None and self.not_before >= start:
+            return True
+
+        if self.date is not None and self.date >= start:
+            return True
+
+        return False
+
+    def is_before(self, end: int) -> bool:
+        """
+        Return True if either @notAfter is less than `end`
+        or @date is less than `end`.
+        """
+
+        if self.not_after is not None and self.not_after <= end:
+            return True
+
+        if self.date is not None and self.date <= end:
+            return True
+
+        return False
+
+    @property
+    def textclasses(self) -> list[str]:
+        if self._textclasses is None:
+            raise ValueError(f'Could not return a textClass from {self.id}. '
+                             'This is likely because the element was either '
+                             'not present, or because there were more than one.')
+
+        return self._textclasses
+
+    def to_row(self, mtime_ns: int, size: int) -> tuple:
+        return (
+            str(self.path),
+            mtime_ns,
+            size,
+            self.id,
+            self.authority,
+            self.not_before,
+            self.not_after,
+            self.date,
+            json.dumps(self.langs),
+            json.dumps(sorted(self.div_langs)),
+            json.dumps(self._textclasses),
+            json.dumps(self.materialclasses),
+            self.orig_place,
+            self.texttype,
+            self.token_count
+        )
+
+
+class MetadataIndex:
+
+    """
+    SQLite index of document metadata, keyed by file path
+    and kept up to date by comparing each file's modification
+    time and size with those recorded in the index.
+    """
+
+    _path: Path
+    _conn: sqlite3.Connection
+    _metadata: dict[Path, DocMetadata]
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: path to the SQLite index file. The file is
+        created if it does not exist, and rebuilt if it was
+        written with a different schema version.
+        """
+
+        self._path = Path(path)
+        self._conn = sqlite3.connect(self._path)
+        self._ensure_schema()
+        self._metadata = {
+            Path(row[0]): DocMetadata.from_row(row)
+            for row in self._conn.execute(
+                f'SELECT {", ".join(_COLUMNS)} FROM documents')
+        }
+
+    def __contains__(self, path: Path) -> bool:
+        return self._key(path) in self._metadata
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def __repr__(self) -> str:
+        return f'MetadataIndex( path = {self._path}, doc_count = {len(self)} )'
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def default_path(folder_path: str | Path) -> Path:
+        """
+        Return the default location of the index for a corpus
+        folder, i.e. a sidecar file next to the folder
+        """
+        folder_path_ = Path(folder_path).absolute()
+        return folder_path_.parent / f'{folder_path_.name}.index.sqlite'
+
+    def _ensure_schema(self) -> None:
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+
+        if version != SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS documents')
+
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'path TEXT PRIMARY KEY, '
+            'mtime_ns INTEGER, '
+            'size INTEGER, '
+            'id TEXT, '
+            'authority TEXT, '
+            'not_before INTEGER, '
+            'not_after INTEGER, '
+            'date INTEGER, '
+            'langs TEXT, '
+            'div_langs TEXT, '
+            'textclasses TEXT, '
+            'materialclasses TEXT, '
+            'orig_place TEXT, '
+            'texttype TEXT, '
+            'token_count INTEGER)'
+        )
+        self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._conn.commit()
+
+    def get(self, path: Path) -> Optional[DocMetadata]:
+        """
+        Return the metadata for the file at `path`, or None
+        if the file is not indexed
+        """
+        return self._metadata.get(self._key(path))
+
+    @staticmethod
+    def _key(path: Path) -> Path:
+        return path.absolute()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _stale(self, path: Path) -> bool:
+        stat = path.stat()
+        row = self._conn.execute(
+            'SELECT mtime_ns, size FROM documents WHERE path = ?',
+            (str(self._key(path)),)
+        ).fetchone()
+
+        return row is None or tuple(row) != (stat.st_mtime_ns, stat.st_size)
+
+    def update(
+            self,
+            paths: Iterable[Path],
+            docs: dict[Path, EpiDoc] | None = None) -> list[Path]:
+
+        """
+        Bring the index up to date for the files in `paths`,
+        re-reading only files that are new or whose modification
+        time or size has changed. Files that cannot be read are
+        left out of the index.
+
+        :param docs: already parsed documents, by path, to use
+        instead of parsing the file again
+        :return: the paths that were (re-)indexed
+        """
+
+        docs_ = {self._key(path): doc for path, doc in (docs or {}).items()}
+        updated: list[Path] = []
+
+        for path in paths:
+            key = self._key(path)
+            if not self._stale(key):
+                continue
+
+            try:
+                doc = docs_.get(key) or EpiDoc(key)
+                metadata = DocMetadata.from_doc(key, doc)
+            except (TypeError, ValueError, TEINSError) as e:
+                print(f'Could not index {path}: {e}')
+                self._remove(key)
+                continue
+
+            stat = key.stat()
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO documents ({", ".join(_COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(_COLUMNS))})',
+                metadata.to_row(stat.st_mtime_ns, stat.st_size)
+            )
+            self._metadata[key] = metadata
+            updated.append(path)
+
+        self._conn.commit()
+        return updated
+
+    def _remove(self, key: Path) -> None:
+        self._conn.execute('DELETE FROM documents WHERE path = ?', (str(key),))
+        self._metadata.pop(key, None)
+
+    def remove(self, paths: Iterable[Path]) -> None:
+        """
+        Remove files from the index
+        """
+        for path in paths:
+            self._remove(self._key(path))
+
+        self._conn.commit()
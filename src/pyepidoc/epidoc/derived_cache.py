@@ -0,0 +1,199 @@
+"""
+On-disk cache of values derived from EpiDoc documents, e.g.
+tokens, expansions, names and numbers, keyed by a hash of
+the file content, so that unchanged files do not need to be
+parsed or analysed again.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple, Optional
+from pathlib import Path
+import hashlib
+import pickle
+
+from .epidoc import EpiDoc
+from .enums import AbbrType
+from .dom import lang
+
+
+CACHE_VERSION = 1
+
+
+class TokenRecord(NamedTuple):
+    form: str
+    leiden_form: str
+    normalized_form: str
+    lemma: Optional[str]
+    lang: Optional[str]
+
+
+class ExpanRecord(NamedTuple):
+    form: str
+    leiden_str: str
+    normalized_form: str
+    abbr_types: tuple[AbbrType, ...]
+
+
+class NameRecord(NamedTuple):
+    form: str
+    normalized_form: str
+    name_type: str
+    nymref: str
+
+
+class NumRecord(NamedTuple):
+    form: str
+    normalized_form: str
+    value: str
+
+
+class DerivedState(NamedTuple):
+
+    """
+    Plain-data summary of a document's tokens, expansions,
+    names, numbers and languages, which can be stored without
+    the XML tree
+    """
+
+    id: str
+    langs: list[str]
+    tokens: list[TokenRecord]
+    expans: list[ExpanRecord]
+    names: list[NameRecord]
+    nums: list[NumRecord]
+
+    @classmethod
+    def from_doc(cls, doc: EpiDoc) -> DerivedState:
+        return cls(
+            id=doc.id,
+            langs=doc.langs,
+            tokens=[
+                TokenRecord(
+                    form=token.form,
+                    leiden_form=token.leiden_form,
+                    normalized_form=token.normalized_form,
+                    lemma=token.lemma,
+                    lang=lang(token)
+                )
+                for token in doc.tokens_no_nested
+            ],
+            expans=[
+                ExpanRecord(
+                    form=expan.form,
+                    leiden_str=expan.leiden_str,
+                    normalized_form=expan.normalized_form,
+                    abbr_types=tuple(expan.abbr_types)
+                )
+                for expan in doc.expans
+            ],
+            names=[
+                NameRecord(
+                    form=name.form,
+                    normalized_form=name.normalized_form,
+                    name_type=name.name_type,
+                    nymref=name.nymref
+                )
+                for name in doc.names()
+            ],
+            nums=[
+                NumRecord(
+                    form=num.form,
+                    normalized_form=num.normalized_form,
+                    value=num.value
+                )
+                for num in doc.nums
+            ]
+        )
+
+
+class DerivedStateCache:
+
+    """
+    Folder of pickled `DerivedState` objects, one per document,
+    named by a hash of the document's content. A changed file
+    therefore gets a new entry; entries are never invalidated
+    in place. Only use a cache folder that you trust, since
+    the entries are unpickled on load.
+    """
+
+    _folder: Path
+    _hits: int
+    _misses: int
+
+    def __init__(self, folder: str | Path):
+        """
+        :param folder: the folder holding the cache entries.
+        It is created if it does not exist.
+        """
+
+        self._folder = Path(folder)
+        self._folder.mkdir(parents=True, exist_ok=True)
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self) -> str:
+        return (f'DerivedStateCache( folder = {self._folder}, '
+                f'hits = {self._hits}, misses = {self._misses} )')
+
+    @staticmethod
+    def content_hash(path: Path) -> str:
+        """
+        Return a hash of the content of the file at `path`
+        """
+        return hashlib.blake2b(path.read_bytes(), digest_size=20).hexdigest()
+
+    @property
+    def folder(self) -> Path:
+        return self._folder
+
+    def get(self, path: Path) -> DerivedState:
+        """
+        Return the derived state of the document at `path`,
+        from the cache if the file is unchanged, or otherwise
+        by analysing the document and storing the result.
+        On a miss the file is parsed again, rather than using
+        a document already in memory, since the entry is keyed 
+        by the content of the file and the document in memory
+        may have been changed.
+        """
+
+        entry_path = self._folder / f'{self.content_hash(path)}.pickle'
+
+        if entry_path.exists():
+            try:
+                with open(entry_path, 'rb') as f:
+                    version, state = pickle.load(f)
+
+                if version == CACHE_VERSION:
+                    self._hits += 1
+                    return state
+
+            except (pickle.UnpicklingError, EOFError, ValueError):
+                pass
+
+        self._misses += 1
+        state = DerivedState.from_doc(EpiDoc(path))
+
+        # Write to a temporary file first, so that an interrupted
+        # write does not leave a truncated entry
+        tmp_path = entry_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((CACHE_VERSION, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(entry_path)
+
+        return state
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of documents read from the cache
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of documents that were analysed and added
+        to the cache
+        """
+        return self._misses
@@ -0,0 +1,158 @@
+"""
+Per-document context shared by the functions in `dom`, so that
+looking up the document, id or main language of an element
+does not construct a new `EpiDoc` and query the header each time.
+
+lxml elements cannot be weakly referenced, so the contexts are
+keyed by the `id` of the root element. A context holds the root,
+which keeps the id from being reused by another tree, but it is
+discarded as soon as a new context is needed and nothing outside
+the cache refers to its root any more, so that the cache does not
+keep trees in memory that are no longer used.
+"""
+
+from __future__ import annotations
+import sys
+from typing import Optional
+
+from lxml.etree import _Element
+
+from pyepidoc.shared.constants import TEINS, XMLNS
+from pyepidoc.xml.namespace import Namespace as ns
+from pyepidoc.xml.tree_release import on_tree_release
+
+from .epidoc import EpiDoc
+from .metadata.header_version import header_version
+
+
+_AB = ns.give_ns('ab', TEINS)
+_DIV = ns.give_ns('div', TEINS)
+_XML_LANG = ns.give_ns('lang', XMLNS)
+
+_contexts: dict[int, DocumentContext] = {}
+
+
+def _is_edition(e: _Element) -> bool:
+    return e.tag == _DIV and e.get('type') == 'edition'
+
+
+def _discard_unused_contexts() -> None:
+    for key, context in list(_contexts.items()):
+        if not context.in_use:
+            del _contexts[key]
+
+
+class DocumentContext:
+
+    """
+    The `EpiDoc` owning a tree, created once, with its id and
+    main language. The main language is cached until the header
+    is changed through the pyepidoc API, in the same way as
+    `EpiDoc.id`.
+    """
+
+    _root: _Element
+    _doc: Optional[EpiDoc]
+    _mainlang: Optional[str]
+    _mainlang_version: int
+
+    def __init__(self, root: _Element):
+        """
+        :param root: the root element of the document
+        """
+        self._root = root
+        self._doc = None
+        self._mainlang = None
+        self._mainlang_version = -1
+
+    @property
+    def doc(self) -> EpiDoc:
+        if self._doc is None:
+            self._doc = EpiDoc(self._root.getroottree())
+        return self._doc
+
+    @property
+    def id(self) -> str:
+        return self.doc.id
+
+    @property
+    def in_use(self) -> bool:
+        """
+        True if anything besides the context refers to the root:
+        the reference held by the context, the one held by its
+        `EpiDoc`, if created, and the argument to `getrefcount`
+        are not counted
+        """
+        own_references = 2 if self._doc is None else 3
+        return sys.getrefcount(self._root) > own_references
+
+    def lang(self, e: _Element) -> Optional[str]:
+        """
+        Return the language of `e`: the @xml:lang of the nearest
+        <ab> or <div> containing `e` (or `e` itself) that has one,
+        up to and including the edition <div>, as in `Ab.lang`;
+        otherwise the main language of the document.
+        """
+
+        node: Optional[_Element] = e
+
+        while node is not None:
+            if node.tag == _AB or node.tag == _DIV:
+                lang = node.get(_XML_LANG)
+
+                if lang is not None:
+                    return lang
+
+                if _is_edition(node):
+                    break
+
+            node = node.getparent()
+
+        return self.mainlang
+
+    @property
+    def mainlang(self) -> Optional[str]:
+        version = header_version(self._root)
+
+        if self._mainlang_version != version:
+            self._mainlang = self.doc.mainlang
+            self._mainlang_version = version
+
+        return self._mainlang
+
+    @property
+    def root(self) -> _Element:
+        return self._root
+
+
+def clear_document_contexts() -> None:
+    """
+    Remove all the document contexts
+    """
+    _contexts.clear()
+
+
+def discard_document_context(e: _Element) -> None:
+    """
+    Remove the context of the document containing `e`, so that
+    the context no longer keeps the tree in memory
+    """
+    _contexts.pop(id(e.getroottree().getroot()), None)
+
+
+on_tree_release(discard_document_context)
+
+
+def document_context(e: _Element) -> DocumentContext:
+    """
+    Return the context of the document containing `e`
+    """
+
+    root = e.getroottree().getroot()
+    context = _contexts.get(id(root))
+
+    if context is None:
+        _discard_unused_contexts()
+        context = _contexts[id(root)] = DocumentContext(root)
+
+    return context
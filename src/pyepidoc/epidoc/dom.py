@@ -11,6 +11,7 @@ from pyepidoc.shared import maxone, head
 from pyepidoc.xml.utils import localname
 
 from .epidoc import EpiDoc
+from .document_context import document_context
 from .epidoc_element import EpiDocElement
 from .edition_elements.ab import Ab
 from .edition_elements.edition import Edition
@@ -29,13 +30,13 @@ def ancestor_abs(elem: EpiDocElement) -> Sequence[Ab]:
 def owner_doc(elem: EpiDocElement) -> Optional[EpiDoc]:
     """
     Returns the |EpiDoc| document owning an element.
+    The same |EpiDoc| is returned for every element in 
+    the document.
     """
-    roottree = elem.roottree
-
-    if roottree is None: 
+    if elem.e is None: 
         return None
 
-    return EpiDoc(roottree)
+    return document_context(elem.e).doc
 
 
 def ancestor_edition(elem: EpiDocElement) -> Optional[Edition]:
@@ -79,13 +80,10 @@ def doc_id(elem: EpiDocElement) -> Optional[str]:
     """
     Finds the document id containing a given element.
     """
-    roottree = elem.roottree
-
-    if roottree is None: 
+    if elem.e is None: 
         return None
 
-    doc = EpiDoc(roottree)
-    return doc.id
+    return document_context(elem.e).id
 
 
 def lang(elem: EpiDocElement) -> Optional[str]:
@@ -97,27 +95,10 @@ def lang(elem: EpiDocElement) -> Optional[str]:
     then reports the mainLang attribute
     """
 
-    ab_ancestors = ancestor_abs(elem)
-    ab_langs = [ab.lang for ab in ab_ancestors 
-        if ab.lang is not None]
-
-    ab_lang = head(ab_langs, throw_if_more_than_one=True)
-
-    if ab_lang is not None:
-        return ab_lang
-
-    edition = ancestor_edition(elem)
-    if edition is not None and edition.lang is not None:
-        return edition.lang
-
-    doc = owner_doc(elem)
-    if doc is None:
+    if elem.e is None:
         return None
 
-    if doc.langs is None:
-        return None
-    
-    return doc.mainlang
+    return document_context(elem.e).lang(elem.e)
     
 
 def last_in_ab(elem: EpiDocElement) -> bool:
@@ -21,6 +21,7 @@ from ..enums import (
 
 from pyepidoc.shared.classes import SetRelation
 from pyepidoc.xml import XmlElement
+from pyepidoc.xml.document_order import sort_in_document_order
 from pyepidoc.shared import update_set_inplace, head
 from pyepidoc.shared.constants import XMLNS
 from pyepidoc.shared.types import Base
@@ -171,7 +172,11 @@ class Ab(Representable):
         """
 
         token_carriers = chain(*self._find_token_carrier_sequences())
-        token_carriers_sorted = sorted(token_carriers)
+        token_carriers_sorted = sort_in_document_order(
+            token_carriers, 
+            self.e, 
+            lambda carrier: carrier.e
+        )
 
         def _redfunc(acc:list[str], element:EpiDocElement) -> list[str]:
             if element.text is None and \
@@ -72,7 +72,7 @@ class Body(EpiDocElement):
                 
                 child_copy = child.deepcopy()
 
-                if child.tag.name in ContainerStandoffEditionType.values() and child.tag.name != 'ab':
+                if child.tag.name in ContainerStandoffEditionType.value_set() and child.tag.name != 'ab':
                     child_copy.remove_children()
                     child_copy.remove_attr('id', XMLNS)
                     target_elem._e.append(child_copy._e)
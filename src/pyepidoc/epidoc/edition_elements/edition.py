@@ -16,7 +16,7 @@ from pyepidoc.epidoc.enums import NamedEntities
 from pyepidoc.analysis.utils.division import Division
 from pyepidoc.shared.constants import XMLNS
 from pyepidoc.shared import default_str
-from pyepidoc.shared.types import Base
+from pyepidoc.shared.types import Base, TokenizerEngine
 from pyepidoc.shared.classes import SetRelation
 from pyepidoc.shared.iterables import maxone, seek, default_str
 from pyepidoc.epidoc.metadata.change import Change
@@ -82,7 +82,7 @@ def prettify(
             SubatomicTagType.values()
         ): 
             return element.depth
-        elif element.tag.name in ContainerType.values():
+        elif element.tag.name in ContainerType.value_set():
             return element.depth + 1
         raise ValueError("Cannot find multiplier for this element.")
 
@@ -833,17 +833,21 @@ class Edition(EpiDocElement):
     def tokens_normalized_no_nested_str(self) -> str:
         return ' '.join(self.tokens_normalized_no_nested_list_str)
 
-    def tokenize(self, inplace: bool = True) -> Edition:
+    def tokenize(
+            self, 
+            inplace: bool = True, 
+            engine: TokenizerEngine = 'recursive') -> Edition:
+        
         if not inplace:
             edition = Edition(self.deepcopy())
         else:
             edition = self 
             
         for ab in edition.abs:
-            ab.tokenize()   
+            ab.tokenize(engine=engine)   
 
         for l in edition.ls:
-            l.tokenize()
+            l.tokenize(engine=engine)
 
         return edition
 
@@ -0,0 +1,46 @@
+"""
+Inverted index from the forms and types of the named entities, 
+and the references of the <g> elements, in an EpiDoc corpus 
+to the documents and element positions where they occur.
+"""
+
+from __future__ import annotations
+
+from .epidoc import EpiDoc
+from .value_index import DocValues, ValueIndex
+
+
+class EntityIndex(ValueIndex):
+
+    """
+    Index of the <name>, <persName>, <roleName> and <g> elements
+    of a set of documents by the values used by the name, 
+    persName, roleName and g-ref filters of `EpiDocCorpus`. 
+    Positions are those of the elements in `EpiDoc.names()`, 
+    `EpiDoc.pers_names`, `EpiDoc.role_names` and `EpiDoc.gs`.
+    """
+
+    FIELDS = (
+        'name', 
+        'name_type', 
+        'pers_name_type', 
+        'role_name_type', 
+        'role_name_subtype', 
+        'g_ref'
+    )
+
+    def doc_values(self, doc: EpiDoc) -> DocValues:
+        names = doc.names()
+        role_names = doc.role_names
+
+        return {
+            'name': [name.form for name in names],
+            'name_type': [name.name_type for name in names],
+            'pers_name_type': [pers_name.pers_name_type 
+                               for pers_name in doc.pers_names],
+            'role_name_type': [role_name.role_name_type 
+                               for role_name in role_names],
+            'role_name_subtype': [role_name.role_name_subtype 
+                                  for role_name in role_names],
+            'g_ref': [g.ref for g in doc.gs]
+        }
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import (
     Optional, 
     Literal, 
+    NamedTuple,
     overload,
     Callable
 )
@@ -22,13 +23,16 @@ from io import BytesIO
 
 import pyepidoc
 from pyepidoc.xml.docroot import DocRoot
+from pyepidoc.xml.validation_cache import ValidationCache
 from pyepidoc.shared import (
     maxone, 
     listfilter, 
     head,
     remove_none
 )
-from pyepidoc.shared.types import Base
+from pyepidoc.shared.types import Base, TokenizerEngine
+from pyepidoc.shared.constants import TEINS, XMLNS
+from pyepidoc.xml.namespace import Namespace as ns
 
 from .token import Token
 from .errors import TEINSError, EpiDocValidationError
@@ -39,6 +43,7 @@ from .metadata.resp_stmt import RespStmt
 from .metadata.file_desc import FileDesc
 from .metadata.tei_header import TeiHeader
 from .metadata.change import Change
+from .metadata.header_version import header_changed, header_version
 
 from .edition_elements.ab import Ab
 from .edition_elements.body import Body
@@ -57,6 +62,15 @@ from .enums import (
 )
 
 
+class TextLanguages(NamedTuple):
+    """
+    Language codes aligned with `EpiDoc.tokens_no_nested`
+    and `EpiDoc.expans` (or the corresponding lists of a corpus)
+    """
+    tokens: list[Optional[str]]
+    expans: list[Optional[str]]
+
+
 class EpiDoc(DocRoot):
 
     """
@@ -67,6 +81,9 @@ class EpiDoc(DocRoot):
     as well as that for accessing the editions present
     in the file.
     """
+
+    _id: Optional[str] = None
+    _id_version: int = -1
     
     def __init__(
             self, 
@@ -131,6 +148,7 @@ class EpiDoc(DocRoot):
         """
         tei_header_elem = TeiHeader.create()
         self.e.insert(0, tei_header_elem.e)
+        header_changed(self.e)
         return self
 
     def append_resp_stmt(self, resp_stmt: RespStmt) -> EpiDoc:
@@ -150,13 +168,27 @@ class EpiDoc(DocRoot):
 
         return self
     
+    def annotate_languages(self) -> TextLanguages:
+        """
+        Return the language of each token in `tokens_no_nested` 
+        and of each expan in `expans`, as `dom.lang` would 
+        give it, from a single walk over each edition.
+        """
+
+        langs = self._element_langs()
+
+        return TextLanguages(
+            tokens=[langs[token.e] for token in self.tokens_no_nested],
+            expans=[langs[expan.e] for expan in self.expans]
+        )
+
     def assert_has_tei_ns(self) -> bool:
         """
         Return True if uses TEI namespaces;
         raises an AssertionError if not
         """
         if self.e is None:
-            raise TypeError("No root element present")
+            raise TypeError("No root element present") from self._load_error
         
         nsmap: dict[str, str] = self.e.nsmap
 
@@ -404,6 +436,40 @@ class EpiDoc(DocRoot):
         assert self.tei_header is not None
         return self.tei_header
 
+    def _element_langs(self) -> dict[_Element, Optional[str]]:
+        """
+        Return the language of every node in the editions, 
+        propagating @xml:lang down from each edition <div>
+        following the same rules as `dom.lang`: the language 
+        of the nearest enclosing <ab> or <div> that has one, 
+        up to the edition; then the main language.
+        """
+
+        ab_tag = ns.give_ns('ab', TEINS)
+        div_tag = ns.give_ns('div', TEINS)
+        lang_attr = ns.give_ns('lang', XMLNS)
+        mainlang = self.mainlang
+        langs: dict[_Element, Optional[str]] = {}
+
+        for edition in self.editions():
+            
+            # (node, language of the nearest enclosing <ab> 
+            # or <div> that has one)
+            stack: list[tuple[_Element, Optional[str]]] = [(edition.e, None)]
+
+            while stack:
+                node, node_lang = stack.pop()
+                
+                if node.tag == ab_tag or node.tag == div_tag:
+                    own_lang = node.get(lang_attr)
+                    if own_lang is not None:
+                        node_lang = own_lang
+
+                langs[node] = mainlang if node_lang is None else node_lang
+                stack.extend((child, node_lang) for child in node)
+
+        return langs
+
     @property
     def expans(self) -> list[Expan]:
         """
@@ -566,9 +632,24 @@ class EpiDoc(DocRoot):
     def id(self) -> str:
 
         """
-        The document ID, e.g. ISic000001
+        The document ID, e.g. ISic000001. 
+        
+        The ID is cached, since it is used to compare and hash 
+        documents. The cached value is recomputed after the header 
+        of this document is changed through the pyepidoc API, e.g. 
+        with `PublicationStmt.set_idno_by_type`; after changing the 
+        header directly with lxml, call `invalidate_id`.
         """
 
+        id_ = self._id
+        if id_ is None or self._id_version != self._header_version():
+            id_ = self._get_id()
+            self._set_cached_id(id_)
+        
+        return id_
+
+    def _get_id(self) -> str:
+
         def get_idno_elems(s: str) -> list[XmlElement]:
             if self.publication_stmt is None:
                 return []
@@ -599,6 +680,24 @@ class EpiDoc(DocRoot):
 
         return idno_elem.text or ''
 
+    def invalidate_id(self) -> None:
+        """
+        Clear the cached document ID, so that it is read
+        from the header on next access
+        """
+        self._id = None
+
+    def _set_cached_id(self, id: str) -> None:
+        self._id = id
+        self._id_version = self._header_version()
+
+    def _header_version(self) -> int:
+        """
+        The version of the header, changed each time the header 
+        is changed through the pyepidoc API
+        """
+        return header_version(self.e)
+
     @property
     def id_carriers(self) -> list[EpiDocElement]:
         return list(chain(*[edition.local_idable_elements 
@@ -1380,7 +1479,8 @@ class EpiDoc(DocRoot):
             verbose: bool = True,
             insert_ws_inside_named_entities: bool = False,
             throw_if_no_main_edition: bool = True,
-            retokenize: bool = True
+            retokenize: bool = True,
+            engine: TokenizerEngine = 'recursive'
         ) -> EpiDoc:
         
         """
@@ -1396,6 +1496,9 @@ class EpiDoc(DocRoot):
         :param insert_ws_inside_names_and_nums: If True, inserts <w> tag inside <name> and <num> tags
         :param throw_if_no_main_edition: Throw an error if there is no main edition
         :param retokenize: Redo the tokenization if there are already <w> tokens presentt
+        :param engine: 'recursive' (the default) or 'linear'. The 'linear' engine
+        walks each container once without recursion, giving the same output, 
+        and can tokenize <ab> elements too long for the 'recursive' engine.
         """
 
         if verbose: 
@@ -1408,7 +1511,7 @@ class EpiDoc(DocRoot):
                 return self
         
         if len(self.w_tokens) == 0 or retokenize:
-            self.main_edition.tokenize()
+            self.main_edition.tokenize(engine=engine)
         else:
             print(f'Did not tokenize {self.id} because already contains <w> elements.')
 
@@ -1494,15 +1597,21 @@ class EpiDoc(DocRoot):
         return '\n'.join([EpiDocElement(div).text_desc_compressed_whitespace 
                        for div in translation_divs])
     
-    def validate(self) -> tuple[bool, str]:
+    def validate(
+            self, 
+            cache: ValidationCache | Path | str | None = None,
+            force: bool = False) -> tuple[bool, str]:
         """
         Validate according to the TEI EpiDoc RelaxNG schema
 
+        :param cache: a ValidationCache, or the path to one, in 
+        which to look up and store the result
+        :param force: if True, validate even if there is a cached result
         :return: a validation result as a bool, and a string giving a validation
         message, either an error if it has failed, or a string 
         confirming that the file is valid.
         """
-        return self.validate_by_relaxng(self._rng_path)
+        return self.validate_by_relaxng(self._rng_path, cache, force)
     
     @property
     def w_tokens(self) -> list[Token]:
@@ -28,7 +28,8 @@ from lxml.etree import (
     _ElementUnicodeResult
 )
 
-from pyepidoc.xml.namespace import Namespace as ns
+from pyepidoc.xml.namespace import Namespace as ns, split_clark
+from pyepidoc.xml.document_order import sort_in_document_order
 
 from pyepidoc.shared.constants import (
     A_TO_Z_SET, 
@@ -38,7 +39,7 @@ from pyepidoc.shared.constants import (
     ROMAN_NUMERAL_CHARS,
     VALID_BASES
 )
-from pyepidoc.shared.types import Base
+from pyepidoc.shared.types import Base, TokenizerEngine
 
 from .enums import (
     whitespace, 
@@ -53,6 +54,7 @@ from .enums import (
 )
 from . import ids
 from pyepidoc.shared import maxoneT, head, last
+from pyepidoc.xml.xpath_registry import evaluate
 
 # sys.setrecursionlimit(10000)
 
@@ -208,7 +210,7 @@ class EpiDocElement(XmlElement, Showable):
             return [self, other]
 
         # Handle like tags        
-        if self.tag.name in AtomicTokenType.values() and other.tag.name in AtomicTokenType.values(): # Are there any tags that can merge apart from <w>?
+        if self.tag.name in AtomicTokenType.value_set() and other.tag.name in AtomicTokenType.value_set(): # Are there any tags that can merge apart from <w>?
             # No check for right bound, as assume 
             # spaces have already been taken into 
             # account in generating like adjacent tags
@@ -470,7 +472,8 @@ class EpiDocElement(XmlElement, Showable):
         ancestor is an ab.
         """
 
-        return self._e.xpath(
+        return evaluate(
+            self._e,
             'following::node()[ancestor::x:ab]', 
             namespaces={"x": TEINS}
         )
@@ -483,7 +486,8 @@ class EpiDocElement(XmlElement, Showable):
         ancestor is an edition.
         """
 
-        return self._e.xpath(
+        return evaluate(
+            self._e,
             'following::node()[ancestor::x:div[@type="edition"]]', 
             namespaces={"x": TEINS}
         )
@@ -587,7 +591,8 @@ class EpiDocElement(XmlElement, Showable):
         if self._e is None:
             return ""
 
-        xpathres = self._e.xpath(
+        xpathres = evaluate(
+            self._e,
             f'preceding::x:idno[@type="filename"]', 
             namespaces={"x": TEINS}
         ) 
@@ -604,13 +609,13 @@ class EpiDocElement(XmlElement, Showable):
     def _internal_prototokens(self) -> list[str]:
 
         if self.tail_completer is None:
-            if self.tag.name in AtomicNonTokenType.values():
+            if self.tag.name in AtomicNonTokenType.value_set():
                 return []
             
             return self._internal_tokens
 
         if self.tail_completer is not None:
-            if self.tag.name in AtomicNonTokenType.values():
+            if self.tag.name in AtomicNonTokenType.value_set():
                 return [self.tail_completer]
 
             return self._internal_tokens[:-1] + \
@@ -675,7 +680,7 @@ class EpiDocElement(XmlElement, Showable):
             if _element.e is None:
                 return []
 
-            if _element.tag.name in AtomicNonTokenType.values():
+            if _element.tag.name in AtomicNonTokenType.value_set():
                 internalprotowords = _element._internal_prototokens
                 if internalprotowords == []:
                     return [EpiDocElement(_e, final_space=True)]
@@ -691,10 +696,10 @@ class EpiDocElement(XmlElement, Showable):
                 
                 raise ValueError("More than 1 protoword.")
 
-            elif _element.tag.name in AtomicTokenType.values():            
+            elif _element.tag.name in AtomicTokenType.value_set():            
                 return [_element] # i.e. do nothing because already a token
 
-            elif _element.tag.name in CompoundTokenType.values():
+            elif _element.tag.name in CompoundTokenType.value_set():
                 epidoc_elem = EpiDocElement(_element)
                 internal_tokenized = epidoc_elem.make_child_tokens_for_container()
                 epidoc_elem.remove_children()
@@ -703,7 +708,7 @@ class EpiDocElement(XmlElement, Showable):
 
                 return [epidoc_elem]
             
-            elif _element.tag.name in SubatomicTagType.values():
+            elif _element.tag.name in SubatomicTagType.value_set():
                 return [tokenize_subatomic_tags(subelement=_e)]
 
             elif _element.tag.name == "Comment":
@@ -808,7 +813,8 @@ class EpiDocElement(XmlElement, Showable):
     def _find_next_no_spaces(self) -> list[EpiDocElement]:
 
         """Returns a list of the next |Element|s not 
-        separated by whitespace."""
+        separated by whitespace, walking the following 
+        siblings in a single loop."""
 
         def no_break_next(element: EpiDocElement) -> bool:
             """Keep going if element is a linebreak with no word break"""
@@ -824,21 +830,19 @@ class EpiDocElement(XmlElement, Showable):
                     return True
 
             return False
-                
-        def next_no_spaces(acc: list[EpiDocElement], element: Optional[EpiDocElement]):
-            
-            if not isinstance(element, EpiDocElement): 
-                return acc
 
-            if no_break_next(element):
-                return next_no_spaces(acc + [element], element.find_next_sibling())
+        acc: list[EpiDocElement] = []
+        element: Optional[EpiDocElement] = self
 
-            if element.has_whitepace_tail:
-                return acc + [element]
-            
-            return next_no_spaces(acc + [element], element.find_next_sibling())
+        while element is not None:
+            acc.append(element)
+
+            if not no_break_next(element) and element.has_whitepace_tail:
+                break
+
+            element = element.find_next_sibling()
 
-        return next_no_spaces([], self)
+        return acc
 
     def find_next_sibling(self) -> Optional[EpiDocElement]:
 
@@ -905,7 +909,7 @@ class EpiDocElement(XmlElement, Showable):
         if self._e is None:
             return None
 
-        if self.tag.name in AtomicNonTokenType.values():
+        if self.tag.name in AtomicNonTokenType.value_set():
             _e = deepcopy(self._e)
             _e.tail = None  # type: ignore
             return EpiDocElement(_e)
@@ -953,7 +957,8 @@ class EpiDocElement(XmlElement, Showable):
         |_ElementUnicodeResult| whose ancestor is an edition.
         """
 
-        return self._e.xpath(
+        return evaluate(
+            self._e,
             'preceding::node()[ancestor::x:ab]', 
             namespaces={"x": TEINS}
         )
@@ -967,7 +972,8 @@ class EpiDocElement(XmlElement, Showable):
         |_ElementUnicodeResult| whose ancestor is an edition.
         """
 
-        return self._e.xpath(
+        return evaluate(
+            self._e,
             'preceding::node()[ancestor::x:div[@type="edition"]]', 
             namespaces={"x": TEINS}
         )
@@ -983,10 +989,12 @@ class EpiDocElement(XmlElement, Showable):
         if self._e is None:
             return []
 
-        return self._e.xpath(
+        return evaluate(
+            self._e,
             'preceding::*[ancestor::x:div[@type="edition"]]', 
             namespaces={"x": TEINS}
-        ) + self._e.xpath(
+        ) + evaluate(
+            self._e,
             'ancestor::*[ancestor::x:div[@type="edition"]]', 
             namespaces={"x": TEINS}
         ) 
@@ -1277,7 +1285,7 @@ class EpiDocElement(XmlElement, Showable):
         """
 
         return [child for child in self.child_elems
-            if child.localname in AtomicTokenType.values() or \
+            if child.localname in AtomicTokenType.value_set() or \
                 child.tag.name == "Comment"]
 
     def find_token_carriers(self) -> list[EpiDocElement]:
@@ -1354,6 +1362,44 @@ class EpiDocElement(XmlElement, Showable):
         
         return reduce(remove_subsets, tokencarrier_sequences, [])
 
+    def _find_token_carrier_sequences_linear(self) -> list[list[EpiDocElement]]:
+
+        """
+        Returns the same sequences as `_find_token_carrier_sequences`,
+        in document order, from a single pre-order walk of the
+        descendants. The walk does not enter the elements of a
+        sequence already found, and skips over the siblings that
+        the sequence contains, so no sequence can be a subset
+        of another.
+        """
+
+        sequences: list[list[EpiDocElement]] = []
+        in_sequence: set[_Element] = set()
+        stack = list(reversed(self.e)) if self.e is not None else []
+
+        while stack:
+            node = stack.pop()
+
+            if node in in_sequence:
+                continue
+
+            if isinstance(node, _Comment):
+                name = 'Comment'
+            elif isinstance(node.tag, str):
+                name = split_clark(node.tag).name
+            else:
+                name = None
+
+            if name in TokenCarrier:
+                sequence = EpiDocElement(node)._find_next_no_spaces()
+                sequences.append(sequence)
+                in_sequence.update(element.e for element in sequence)
+                continue
+            
+            stack.extend(reversed(node))
+
+        return sequences
+
     def tokenize_initial_text_in_container(self):
         """
         Tokenize any initial text in a container in place, since 
@@ -1379,15 +1425,28 @@ class EpiDocElement(XmlElement, Showable):
         # Remove the initial text element that has now been tokenized
         self.text = ''
 
-    def make_child_tokens_for_container(self) -> list[EpiDocElement]:
+    def make_child_tokens_for_container(
+            self, 
+            engine: TokenizerEngine = 'recursive') -> list[EpiDocElement]:
         """
         Return the child tokens for the container. To do this
         it first tokenizes the initial text of the container in place.
+
+        :param engine: 'recursive' or 'linear'. The 'linear' engine
+        gives the same tokens without recursion, so it can be used 
+        on containers with many tokens.
         """
         self.tokenize_initial_text_in_container()
 
+        if engine == 'linear':
+            return self._make_child_tokens_for_container_linear()
+
         token_carriers = chain(*self._find_token_carrier_sequences())
-        token_carriers_sorted = sorted(token_carriers)
+        token_carriers_sorted = sort_in_document_order(
+            token_carriers, 
+            self.e, 
+            lambda carrier: carrier.e
+        )
         
         def _redfunc(acc: list[EpiDocElement], element: EpiDocElement) -> list[EpiDocElement]:
             
@@ -1421,14 +1480,63 @@ class EpiDocElement(XmlElement, Showable):
 
         return reduce(_redfunc, reversed(token_carriers_sorted), [])
 
-    def get_child_tokens(self) -> list[EpiDocElement]:
+    def _make_child_tokens_for_container_linear(self) -> list[EpiDocElement]:
+        """
+        Linear version of the token reduction in 
+        `make_child_tokens_for_container`. The tokens are 
+        accumulated in reverse, so that the token that the 
+        next carrier may be joined to is at the end of the list, 
+        rather than prepending to the list at each step.
+        """
+
+        reversed_tokens: list[EpiDocElement] = []
+
+        def sumfunc(
+            acc: list[EpiDocElement], 
+            elem: EpiDocElement) -> list[EpiDocElement]:
+
+            if acc == []:
+                return [elem]
+        
+            new_first = elem + acc[0]
+
+            return new_first + acc[1:]
+
+        sequences = self._find_token_carrier_sequences_linear()
+
+        for element in reversed(list(chain(*sequences))):
+            join_to_next = element._join_to_next
+            child_tokens = element.get_child_tokens()
+
+            if join_to_next and reversed_tokens != []:
+                if child_tokens == []:
+                    continue
+
+                first = reversed_tokens.pop()
+                joined = reduce(
+                    sumfunc, 
+                    reversed(child_tokens + [first]), 
+                    cast(list[EpiDocElement], [])
+                )
+                reversed_tokens.extend(reversed(joined))
+                continue
+
+            reversed_tokens.extend(reversed(child_tokens))
+
+        return list(reversed(reversed_tokens))
+
+    def get_child_tokens(
+            self, 
+            engine: TokenizerEngine = 'recursive') -> list[EpiDocElement]:
         """
         Returns all potential child tokens.
         For use in tokenization.
+
+        :param engine: the tokenizer engine used for containers
         """
 
         if self.localname in ['ab']:
-            return self.make_child_tokens_for_container()
+            return self.make_child_tokens_for_container(engine)
 
         token_elems = self.get_internal_token_elements() + self.create_tail_token_elements()
         
@@ -1443,9 +1551,15 @@ class EpiDocElement(XmlElement, Showable):
 
         return token_elems
 
-    def tokenize(self, inplace=True) -> EpiDocElement:
+    def tokenize(
+            self, 
+            inplace=True, 
+            engine: TokenizerEngine = 'recursive') -> EpiDocElement:
         """
         Tokenizes the current node. 
+
+        :param engine: 'recursive' or 'linear'; see 
+        `make_child_tokens_for_container`
         """
 
         tokenized_elements = []
@@ -1455,14 +1569,14 @@ class EpiDocElement(XmlElement, Showable):
         if not inplace:
             _e = deepcopy(self._e)
 
-            for element in self.get_child_tokens():
+            for element in self.get_child_tokens(engine):
                 tokenized_elements += [deepcopy(element)]
 
         else:
             _e = self._e
             
             # Find the tokens
-            tokenized_elements = self.get_child_tokens()
+            tokenized_elements = self.get_child_tokens(engine)
 
         # Remove existing children of <ab>
         for child in _e.getchildren():
@@ -1559,12 +1673,12 @@ class EpiDocElement(XmlElement, Showable):
 
                             new_parent = append_tail_or_text(' '.join(lb_tail_strs[1:]), new_parent)
 
-                elif localname in AtomicTokenType.values() + AtomicNonTokenType.values():
+                elif localname in AtomicTokenType.value_set() | AtomicNonTokenType.value_set():
                     new_parent.append(e_without_tail)
                     new_parent = append_tail_or_text(e.tail, new_parent)                    
 
-                elif localname in SubatomicTagType.values(): # e.g. <expan>, <choice>, <hi>
-                    if localname in CompoundTokenType.values(): # this is intended for <hi>, which is also a compound token
+                elif localname in SubatomicTagType.value_set(): # e.g. <expan>, <choice>, <hi>
+                    if localname in CompoundTokenType.value_set(): # this is intended for <hi>, which is also a compound token
                         tokenized = tokenize_subatomic_tags(e_without_tail)
                         if EpiDocElement(new_parent).children == []:
                             new_parent.append(tokenized.e)
@@ -1582,7 +1696,7 @@ class EpiDocElement(XmlElement, Showable):
                         new_parent.append(new_w)
                         new_parent = append_tail_or_text(e.tail, new_parent)              
                     
-                elif localname in CompoundTokenType.values(): # e.g. <persName>, <orgName>, <roleName>
+                elif localname in CompoundTokenType.value_set(): # e.g. <persName>, <orgName>, <roleName>
                     new_w_elem = EpiDocElement.w_factory(parent=e_without_tail)
                     if new_w_elem.e is not None:
                         new_parent.append(new_w_elem.e)
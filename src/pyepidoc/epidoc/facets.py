@@ -0,0 +1,153 @@
+"""
+Counting of document metadata values ("facets"), e.g. places 
+of origin or text classes, for several facets in a single pass 
+over the documents of a corpus or over their indexed metadata.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Literal, NamedTuple, Optional, Sequence
+from collections import Counter
+
+from .chronology_index import DocDates
+from .corpus_index import DocMetadata
+from .epidoc import EpiDoc
+
+
+Facet = Literal[
+    'orig_place', 
+    'textclass', 
+    'materialclass', 
+    'lang', 
+    'texttype', 
+    'authority', 
+    'decade'
+]
+
+FACETS: tuple[Facet, ...] = (
+    'orig_place', 
+    'textclass', 
+    'materialclass', 
+    'lang', 
+    'texttype', 
+    'authority', 
+    'decade'
+)
+
+
+class FacetCount(NamedTuple):
+    """
+    Number of documents with a value of a facet
+    """
+    value: str | int
+    count: int
+
+
+class FacetError(NamedTuple):
+    """
+    Record of a document whose value of a facet could not be read
+    """
+    doc_id: str
+    facet: Facet
+    message: str
+
+
+def _decade(doc: EpiDoc | DocMetadata) -> Optional[int]:
+    mean = DocDates(doc.id, doc.not_before, doc.not_after, doc.date).date_mean
+    return None if mean is None else (mean // 10) * 10
+
+
+def facet_values(doc: EpiDoc | DocMetadata, facet: Facet) -> set[str | int]:
+    """
+    Return the distinct values of a facet for a document.
+
+    - orig_place: the ancient place of origin, as `EpiDoc.orig_place`
+    - textclass: the text classes, as `EpiDoc.textclasses`, which 
+      raises ValueError if the document has more than one <textClass>
+    - materialclass: the material classes
+    - lang: the languages of the edition and its textparts, 
+      as `EpiDoc.div_langs`
+    - texttype: the lower-cased text type, as in 
+      `EpiDocCorpus.texttypes`
+    - authority: the publication authority
+    - decade: the first year of the decade of the mean date,
+      e.g. -20 for 15 BC
+    """
+
+    if facet == 'orig_place':
+        return {doc.orig_place}
+    
+    if facet == 'textclass':
+        return set(doc.textclasses)
+    
+    if facet == 'materialclass':
+        return set(doc.materialclasses)
+    
+    if facet == 'lang':
+        return set(doc.div_langs)
+    
+    if facet == 'texttype':
+        return set() if doc.texttype is None else {doc.texttype.lower()}
+    
+    if facet == 'authority':
+        return set() if doc.authority is None else {doc.authority}
+    
+    if facet == 'decade':
+        decade = _decade(doc)
+        return set() if decade is None else {decade}
+
+    raise ValueError(f'Invalid facet {facet}')
+
+
+def count_facets(
+        docs: Iterable[EpiDoc | DocMetadata],
+        facets: Sequence[Facet] = FACETS,
+        min_freq: int = 0,
+        sort_on: Optional[Literal['value', 'count']] = 'count',
+        reverse: bool = True,
+        errors: Optional[list[FacetError]] = None) -> dict[Facet, list[FacetCount]]:
+    
+    """
+    Count the number of documents with each value of each
+    facet, reading each document once. A document whose value
+    of a facet cannot be read, e.g. because it has more than one
+    <textClass>, is left out of the counts of that facet.
+
+    :param docs: documents, or their indexed metadata
+    :param facets: the facets to count; see `facet_values`
+    :param min_freq: leave out values found in fewer documents
+    :param sort_on: sort the values of each facet by value or
+    by count, or leave them in the order first found if None
+    :param reverse: sort in descending order
+    :param errors: a list to add a FacetError to for each
+    document and facet that could not be read
+    """
+
+    if sort_on not in ['value', 'count', None]:
+        raise ValueError(f'Cannot sort on {sort_on}.')
+
+    counters: dict[Facet, Counter[str | int]] = {
+        facet: Counter() for facet in facets
+    }
+
+    for doc in docs:
+        for facet, counter in counters.items():
+            try:
+                counter.update(facet_values(doc, facet))
+            except ValueError as e:
+                if errors is not None:
+                    errors.append(FacetError(doc.id, facet, str(e)))
+
+    results: dict[Facet, list[FacetCount]] = {}
+
+    for facet, counter in counters.items():
+        counts = [FacetCount(value, count) for value, count in counter.items()
+                  if count >= min_freq]
+
+        if sort_on == 'value':
+            counts.sort(key=lambda count: count.value, reverse=reverse)
+        elif sort_on == 'count':
+            counts.sort(key=lambda count: count.count, reverse=reverse)
+
+        results[facet] = counts
+
+    return results
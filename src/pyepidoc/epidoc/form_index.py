@@ -0,0 +1,33 @@
+"""
+Inverted index from the forms, lemmata and original forms of 
+the tokens in an EpiDoc corpus to the documents and token 
+positions where they occur, so that form and lemma queries do
+not need to re-read the tokens of every document.
+"""
+
+from __future__ import annotations
+
+from .epidoc import EpiDoc
+from .value_index import DocValues, ValueIndex
+
+
+class FormIndex(ValueIndex):
+
+    """
+    Index of the tokens of a set of documents by form (i.e. 
+    the normalized form, as in `EpiDoc.forms`), lemma and 
+    original form. Positions are those of the tokens in
+    `EpiDoc.tokens_no_nested`. Re-index a document with `add` 
+    after tokenizing or lemmatizing it.
+    """
+
+    FIELDS = ('form', 'lemma', 'orig_form')
+
+    def doc_values(self, doc: EpiDoc) -> DocValues:
+        tokens = doc.tokens_no_nested
+
+        return {
+            'form': [str(token) for token in tokens],
+            'lemma': [token.lemma for token in tokens],
+            'orig_form': [token.orig_form for token in tokens]
+        }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+from pathlib import Path
+
+from lxml import etree
+from lxml.etree import _Element, _ElementTree, XMLSyntaxError
+
+from pyepidoc.shared.constants import TEINS
+from pyepidoc.xml.errors import handle_xmlsyntaxerror
+
+from .epidoc import EpiDoc
+from .edition_elements.body import Body
+
+
+_CHUNK_SIZE = 4096
+
+
+class HeaderEpiDoc(EpiDoc):
+
+    """
+    An EpiDoc of which only the <teiHeader> (and anything else
+    before <text>) has been parsed. The file is fed in chunks to
+    an incremental `lxml.etree.XMLPullParser`, which stops at the 
+    first chunk containing <text>, so metadata such as the id, 
+    authority, dates, textclasses, materialclasses and place of 
+    origin can be read without parsing the edition. Call 
+    `load_full` to parse the whole file.
+    """
+
+    _header_only: bool
+
+    def __init__(self, inpt: Path | str):
+        """
+        :param inpt: path to the EpiDoc XML file
+        """
+
+        self._p = p = Path(inpt)
+
+        if not p.exists():
+            raise FileExistsError(f'File {p.absolute()} does not exist')
+
+        self._header_only = True
+        self._e = self._load_header_e_from_file(p)
+        self.assert_has_tei_ns()
+
+    def __repr__(self) -> str:
+        return f'HeaderEpiDoc(id="{self.id}")'
+
+    @property
+    def body(self) -> Body:
+        if self._header_only:
+            raise ValueError('No body element found: only the header of '
+                             f'{self._p} has been loaded. Call load_full() '
+                             'to load the whole document.')
+
+        return super().body
+
+    @property
+    def is_header_only(self) -> bool:
+        """
+        True if only the header of the document has been parsed
+        """
+        return self._header_only
+
+    def _load_header_e_from_file(self, p: Path) -> _Element:
+        """
+        Parse the file up to the start of <text> and return
+        the root element. The <text> element itself is kept,
+        with its attributes, but without any content.
+        """
+
+        parser = etree.XMLPullParser(
+            events=('start',),
+            tag=f'{{{TEINS}}}text',
+            load_dtd=False,
+            resolve_entities=False
+        )
+
+        try:
+            with open(p, 'rb') as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    parser.feed(chunk)
+
+                    for _, elem in parser.read_events():
+                        # The rest of the chunk may already have been 
+                        # parsed into <text>
+                        for child in list(elem):
+                            elem.remove(child)
+                        elem.text = None
+
+                        self._roottree = elem.getroottree()
+                        return self._roottree.getroot()
+
+        except XMLSyntaxError as e:
+            print('XMLSyntaxError in _load_header_e_from_file')
+            handle_xmlsyntaxerror(e)
+            self._load_error = e
+            return _ElementTree().getroot()
+
+        # No <text> element: read the whole file
+        self._header_only = False
+        return self._load_e_from_file(p)
+
+    def load_full(self) -> HeaderEpiDoc:
+        """
+        Parse the whole file, replacing the header-only tree
+        """
+
+        if self._header_only:
+            self._e = self._load_e_from_file(self._p)
+            self._header_only = False
+            self.assert_has_tei_ns()
+
+        return self
@@ -0,0 +1,73 @@
+from __future__ import annotations
+from pathlib import Path
+
+from lxml.etree import _Element
+
+from pyepidoc.xml.tree_cache import TreeCache
+
+from .epidoc import EpiDoc
+from .errors import TEINSError
+
+
+class LazyEpiDoc(EpiDoc):
+
+    """
+    An EpiDoc whose XML tree is only parsed when it is first
+    used, and which is held in a shared TreeCache. If the tree
+    has been evicted from the cache it is parsed again from disk,
+    so changes made to the tree are not kept once it is evicted:
+    lazy documents are intended for reading and analysis.
+    The document ID is cached by EpiDoc, so sorting and hashing
+    lazy documents does not re-parse them.
+    """
+
+    _cache: TreeCache
+    _tei_ns_checked: bool
+
+    def __init__(self, inpt: Path, cache: TreeCache):
+        """
+        :param inpt: Path to the EpiDoc XML file. The file is
+        not read until the document is used.
+
+        :param cache: the cache holding the parsed tree
+        """
+
+        if not inpt.exists():
+            raise FileExistsError(f'File {inpt.absolute()} does not exist')
+
+        self._p = inpt
+        self._cache = cache
+        self._tei_ns_checked = False
+
+    @property
+    def _e(self) -> _Element:   # type: ignore
+        e = self._cache.get(self._p)
+
+        if not self._tei_ns_checked:
+            self._tei_ns_checked = True
+            try:
+                self.assert_has_tei_ns()
+            except TEINSError:
+                self._tei_ns_checked = False
+                raise
+
+        return e
+
+    def _header_version(self) -> int:
+        """
+        A tree that is not loaded will be parsed from disk,
+        so its header is unchanged: return 0 rather than
+        parsing it to look up its version
+        """
+        if not self.is_loaded:
+            return 0
+        
+        return super()._header_version()
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        True if the document's tree is currently held
+        in the cache
+        """
+        return self._p in self._cache
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
+from .header_version import header_changed
 from .title_stmt import TitleStmt
 from .publication_stmt import PublicationStmt
 
@@ -22,6 +23,7 @@ class FileDesc(EpiDocElement):
                             f'but a <{title_stmt.localname}> element')
         
         self.append_node(title_stmt)
+        header_changed(self.e)
 
         if self.title_stmt is None:
             raise Exception('Failed to append <titleStmt>')
@@ -38,6 +40,7 @@ class FileDesc(EpiDocElement):
         
         publication_stmt = EpiDocElement.create_new('publicationStmt')
         self.append_node(publication_stmt)
+        header_changed(self.e)
         
         if self.publication_stmt is None:
             raise TypeError('Failed to add <publicationStmt> element')
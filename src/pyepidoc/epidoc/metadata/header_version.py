@@ -0,0 +1,56 @@
+"""
+Version stamps for changes made to document headers through
+the pyepidoc API. Values derived from the header, such as
+`EpiDoc.id`, are cached together with the version of their
+document at which they were computed, and recomputed once it
+has changed. Changing the header of one document does not
+invalidate the cached values of any other.
+
+lxml elements cannot be weakly referenced, so the versions are
+keyed by the `id` of the root element rather than by the root
+itself, which would keep every changed tree in memory. The id
+is stable while the root is referenced, as it is by the
+`EpiDoc` and the document context caching the derived values.
+"""
+
+from __future__ import annotations
+from itertools import count
+
+from lxml.etree import _Element
+
+from pyepidoc.xml.tree_release import on_tree_release
+
+
+# Stamps are unique across trees, so that a value cached for
+# one tree is never taken as current for another, even if
+# the id of its root is reused
+_stamps = count(1)
+
+# Only trees whose header has been changed have an entry
+_versions: dict[int, int] = {}
+
+
+def discard_header_version(e: _Element) -> None:
+    """
+    Remove the version of the document containing `e`
+    """
+    _versions.pop(id(e.getroottree().getroot()), None)
+
+
+on_tree_release(discard_header_version)
+
+
+def header_changed(e: _Element) -> None:
+    """
+    Record that the header of the document containing `e`
+    has been changed
+    """
+    _versions[id(e.getroottree().getroot())] = next(_stamps)
+
+
+def header_version(e: _Element) -> int:
+    """
+    Return the header version of the document containing `e`:
+    0 if its header has not been changed through the API
+    """
+    return _versions.get(id(e.getroottree().getroot()), 0)
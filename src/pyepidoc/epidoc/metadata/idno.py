@@ -10,6 +10,8 @@ from pyepidoc.xml.namespace import Namespace as ns
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
 from pyepidoc.xml.xml_element import XmlElement
 
+from .header_version import header_changed
+
 
 class Idno(EpiDocElement):
     """
@@ -35,4 +37,5 @@ class Idno(EpiDocElement):
         """
         Set the text content of the <idno> element
         """
-        self.text = value
\ No newline at end of file
+        self.text = value
+        header_changed(self.e)
\ No newline at end of file
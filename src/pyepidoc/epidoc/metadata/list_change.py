@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
 from .change import Change
+from .header_version import header_changed
 
 class ListChange(EpiDocElement):
 
@@ -9,6 +10,7 @@ class ListChange(EpiDocElement):
         Append a <change> element to the <listChange>
         """
         self.append_node(change)
+        header_changed(self.e)
         return self
 
     @property
@@ -3,6 +3,7 @@ from pyepidoc.shared.constants import TEINS, XMLNS
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
 from pyepidoc.shared.iterables import maxone
 from .idno import Idno
+from .header_version import header_changed
 
 
 class PublicationStmt(EpiDocElement):
@@ -13,6 +14,7 @@ class PublicationStmt(EpiDocElement):
 
     def append_idno(self, idno: Idno) -> Idno:
         self.append_node(idno)
+        header_changed(self.e)
         return idno
 
     @property
@@ -29,8 +31,7 @@ class PublicationStmt(EpiDocElement):
         idno = self.get_idno_by_type(idno_type)
         if idno is None:
             idno_element = EpiDocElement.create_new('idno', {'type': idno_type})
-            self.append_idno(Idno(idno_element))
-            return
+            idno = self.append_idno(Idno(idno_element))
         idno.value = value
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
 from .file_desc import FileDesc
+from .header_version import header_changed
 from .revision_desc import RevisionDesc
 
 
@@ -26,6 +27,7 @@ class TeiHeader(EpiDocElement):
             raise Exception('<fileDesc> already exists on <teiHeader>')
         file_desc_elem = EpiDocElement.create_new(localname='fileDesc')
         self.e.append(file_desc_elem.e)
+        header_changed(self.e)
 
         return self
     
@@ -38,6 +40,7 @@ class TeiHeader(EpiDocElement):
             raise Exception('<revisionDesc> already exists on <teiHeader>')
         revision_desc = RevisionDesc.create()
         self.append_node(revision_desc)
+        header_changed(self.e)
         return self
     
     @staticmethod
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
+from .header_version import header_changed
 from .resp_stmt import RespStmt
 
 class TitleStmt(EpiDocElement):
@@ -21,6 +22,7 @@ class TitleStmt(EpiDocElement):
             raise TypeError('resp_stmt.initials cannot be None ')
         if not self.has_resp_initials(resp_stmt.initials):
             self.e.append(resp_stmt.e)
+            header_changed(self.e)
         return self
 
     def append_new_resp_stmt(
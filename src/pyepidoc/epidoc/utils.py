@@ -14,6 +14,7 @@ from pyepidoc.epidoc.enums import (
 )
 from pyepidoc.shared.constants import TEINS
 from pyepidoc.epidoc.epidoc_element import EpiDocElement
+from pyepidoc.xml.xpath_registry import evaluate
 
 
 def callable_from_localname(
@@ -62,7 +63,7 @@ def descendant_text(elem: _Element | _ElementUnicodeResult) -> str:
     if type(elem) is _ElementUnicodeResult:
         s = str(elem)
     else: 
-        s = ''.join(map(str, elem.xpath('.//text()'))) 
+        s = ''.join(map(str, evaluate(elem, './/text()'))) 
 
     return re.sub(r'[\n\t]|\s+', '', s)
 
@@ -106,7 +107,7 @@ def leiden_str_from_children(
     xpath_str = f'{child_str}[{ancestors_str}]'
     
     children: list[_Element | _ElementUnicodeResult] = \
-        [child for child in parent.xpath(xpath_str, namespaces={'ns': TEINS})]
+        [child for child in evaluate(parent, xpath_str, namespaces={'ns': TEINS})]
 
 
     if len(children) == 0:
@@ -138,7 +139,7 @@ def normalized_str_from_children(
     xpath_str = f'{child_str}[{ancestors_str}]'
     
     children: list[_Element | _ElementUnicodeResult] = \
-        [child for child in parent.xpath(xpath_str, namespaces={'ns': TEINS})]
+        [child for child in evaluate(parent, xpath_str, namespaces={'ns': TEINS})]
     objs = cast(list[EpiDocElement], [classes.get(localname(child), descendant_text)(child) 
             for child in children])
     
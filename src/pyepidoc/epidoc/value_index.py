@@ -0,0 +1,326 @@
+"""
+Base class for inverted indexes from values found in the 
+documents of an EpiDoc corpus, e.g. token forms or name types,
+to the documents and positions where they occur.
+"""
+
+from __future__ import annotations
+from typing import Iterable, NamedTuple, Optional
+from bisect import bisect_left
+from pathlib import Path
+import abc
+import json
+
+from .epidoc import EpiDoc
+
+
+INDEX_VERSION = 1
+
+# Modification time and size of the source file of a document
+_Signature = tuple[int, int]
+
+# The values of each field in a document, in document order
+DocValues = dict[str, list[Optional[str]]]
+
+
+class Posting(NamedTuple):
+    """
+    Occurrence of a key: the document id, and the position
+    of the value among the values of the same field in
+    that document
+    """
+    doc_id: str
+    position: int
+
+
+def _signature(doc: EpiDoc) -> Optional[_Signature]:
+    path: Optional[Path] = getattr(doc, '_p', None)
+
+    if path is None or not path.exists():
+        return None
+
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ValueIndex(abc.ABC):
+
+    """
+    Index of the values of the fields listed in `FIELDS`, read 
+    from each document by `doc_values`. Lookups can be exact, 
+    case-folded and/or by prefix. The inverted tables are built 
+    on the first query and rebuilt after documents are added 
+    or removed.
+
+    The index is not updated when documents are changed in 
+    memory: call `add` to re-index a changed document.
+    """
+
+    FIELDS: tuple[str, ...] = ()
+
+    _values: dict[str, DocValues]
+    _signatures: dict[str, Optional[_Signature]]
+    _postings: dict[tuple[str, bool], dict[str, list[Posting]]]
+    _doc_keys: dict[tuple[str, bool], dict[str, frozenset[str]]]
+    _sorted_keys: dict[tuple[str, bool], list[str]]
+
+    def __init__(self):
+        self._values = {}
+        self._signatures = {}
+        self._clear_tables()
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}( doc_count = {len(self)} )'
+
+    def add(self, doc: EpiDoc) -> None:
+        """
+        Index `doc`, replacing any entry with the same document id
+        """
+
+        self._values[doc.id] = self.doc_values(doc)
+        self._signatures[doc.id] = _signature(doc)
+        self._clear_tables()
+
+    def _check_field(self, field: str) -> None:
+        if field not in self.FIELDS:
+            raise ValueError(f'Invalid field {field}')
+
+    def _clear_tables(self) -> None:
+        self._postings = {}
+        self._doc_keys = {}
+        self._sorted_keys = {}
+
+    def doc_ids(
+            self,
+            keys: Iterable[str],
+            field: str,
+            ignore_case: bool = False,
+            prefix: bool = False) -> set[str]:
+
+        """
+        Return the ids of the documents containing any of `keys`
+
+        :param keys: the values to find
+        :param field: the field to match
+        :param ignore_case: if True, compare case-folded keys
+        :param prefix: if True, match every key starting with
+        one of `keys`
+        """
+
+        return {posting.doc_id 
+                for key in keys 
+                for posting in self.lookup(key, field, ignore_case, prefix)}
+
+    def doc_keys(
+            self,
+            doc_id: str,
+            field: str,
+            ignore_case: bool = False) -> frozenset[str]:
+
+        """
+        Return the distinct values of a field in a document,
+        leaving out missing values
+
+        :raises KeyError: if the document is not in the index
+        """
+
+        self._check_field(field)
+        table = self._doc_keys.get((field, ignore_case))
+
+        if table is None:
+            table = self._doc_keys[(field, ignore_case)] = {
+                doc_id_: frozenset(
+                    self.normalize(value, ignore_case) 
+                    for value in values[field]
+                    if value is not None
+                )
+                for doc_id_, values in self._values.items()
+            }
+
+        return table[doc_id]
+
+    @abc.abstractmethod
+    def doc_values(self, doc: EpiDoc) -> DocValues:
+        """
+        Return the values of each field in `doc`
+        """
+        ...
+
+    @classmethod
+    def from_docs(cls, docs: Iterable[EpiDoc]):
+        index = cls()
+        index.update(docs)
+        return index
+
+    def is_current(self, doc: EpiDoc) -> bool:
+        """
+        Return True if `doc` is indexed and its file has not 
+        changed since. Documents without a file are always
+        re-indexed.
+        """
+
+        if doc.id not in self._values:
+            return False
+        
+        signature = self._signatures[doc.id]
+        return signature is not None and signature == _signature(doc)
+
+    def keys(self, field: str, ignore_case: bool = False) -> list[str]:
+        """
+        Return the distinct values of a field in sorted order
+        """
+
+        sorted_keys = self._sorted_keys.get((field, ignore_case))
+
+        if sorted_keys is None:
+            sorted_keys = self._sorted_keys[(field, ignore_case)] = \
+                sorted(self._table(field, ignore_case))
+
+        return sorted_keys
+
+    @classmethod
+    def load(cls, path: str | Path):
+        """
+        Read an index written with `save`. An index written by
+        a different version of pyepidoc, or for other fields,
+        is returned empty.
+        """
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = cls()
+        
+        if data.get('version') != INDEX_VERSION or \
+                tuple(data.get('fields', [])) != cls.FIELDS:
+            return index
+
+        for doc_id, entry in data['docs'].items():
+            index._values[doc_id] = entry['values']
+            signature = entry['signature']
+            index._signatures[doc_id] = tuple(signature) if signature else None
+
+        return index
+
+    def lookup(
+            self,
+            key: str,
+            field: str,
+            ignore_case: bool = False,
+            prefix: bool = False) -> list[Posting]:
+
+        """
+        Return the occurrences of `key`, in document id and 
+        position order
+
+        :param field: the field to match
+        :param ignore_case: if True, compare case-folded keys
+        :param prefix: if True, match every key starting with `key`
+        """
+
+        table = self._table(field, ignore_case)
+        key_ = self.normalize(key, ignore_case)
+
+        if not prefix:
+            return list(table.get(key_, []))
+
+        sorted_keys = self.keys(field, ignore_case)
+        postings: list[Posting] = []
+
+        for i in range(bisect_left(sorted_keys, key_), len(sorted_keys)):
+            if not sorted_keys[i].startswith(key_):
+                break
+            postings += table[sorted_keys[i]]
+
+        return sorted(postings)
+
+    @staticmethod
+    def normalize(key: str, ignore_case: bool) -> str:
+        return key.casefold() if ignore_case else key
+
+    def remove(self, doc_ids: Iterable[str]) -> None:
+        for doc_id in doc_ids:
+            self._values.pop(doc_id, None)
+            self._signatures.pop(doc_id, None)
+
+        self._clear_tables()
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the index to a JSON file
+        """
+
+        data = {
+            'version': INDEX_VERSION,
+            'fields': list(self.FIELDS),
+            'docs': {
+                doc_id: {
+                    'signature': self._signatures[doc_id],
+                    'values': values
+                }
+                for doc_id, values in self._values.items()
+            }
+        }
+
+        # Write to a temporary file first, so that an interrupted
+        # write does not leave a truncated index
+        tmp_path = Path(path).with_suffix('.tmp')
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    def _table(
+            self, 
+            field: str, 
+            ignore_case: bool) -> dict[str, list[Posting]]:
+
+        self._check_field(field)
+        table = self._postings.get((field, ignore_case))
+
+        if table is not None:
+            return table
+        
+        table = self._postings[(field, ignore_case)] = {}
+
+        for doc_id in sorted(self._values):
+            for position, value in enumerate(self._values[doc_id][field]):
+                if value is None:
+                    continue
+
+                table.setdefault(self.normalize(value, ignore_case), []) \
+                    .append(Posting(doc_id, position))
+
+        return table
+
+    def update(self, docs: Iterable[EpiDoc]) -> list[str]:
+        """
+        Bring the index up to date with `docs`: documents that 
+        are new, or whose file has changed, are (re-)indexed, and
+        documents that are not in `docs` are removed.
+
+        :return: the ids of the documents that were (re-)indexed
+        :raises ValueError: if two documents have the same id
+        """
+
+        docs_ = list(docs)
+        ids = {doc.id for doc in docs_}
+        updated: list[str] = []
+
+        if len(ids) != len(docs_):
+            raise ValueError('Documents can only be indexed '
+                             'if their ids are unique.')
+
+        self.remove([doc_id for doc_id in self._values if doc_id not in ids])
+
+        for doc in docs_:
+            if not self.is_current(doc):
+                self.add(doc)
+                updated.append(doc.id)
+
+        return updated
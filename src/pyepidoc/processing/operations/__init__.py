@@ -1 +1,6 @@
-from .lemmatize import apply_lemmatization, update_lemmatized_edition
\ No newline at end of file
+from .lemmatize import (
+    apply_batch_lemmatization, 
+    apply_lemmatization, 
+    update_lemmatized_edition
+)
+from .lemma_memo import LemmaMemo, batch_lemmatizer
\ No newline at end of file
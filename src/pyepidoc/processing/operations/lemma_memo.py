@@ -0,0 +1,142 @@
+"""
+Memo of the lemmata returned by a lemmatizer for each form, 
+so that a form is only lemmatized once in a run over many 
+documents, and, if the memo is saved, across runs.
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterable, Optional
+from pathlib import Path
+import json
+
+
+BatchLemmatizer = Callable[[list[str]], list[str]]
+Lemmatizer = Callable[[str], str]
+
+
+def batch_lemmatizer(lemmatize: Lemmatizer) -> BatchLemmatizer:
+    """
+    Return a batch lemmatizer calling `lemmatize` on each form
+    """
+    return lambda forms: [lemmatize(form) for form in forms]
+
+
+class LemmaMemo:
+
+    """
+    Mapping from normalized forms to lemmata. Forms not yet in 
+    the memo are lemmatized in batches with `lemmatize`.
+    """
+
+    _lemmata: dict[str, str]
+    _path: Optional[Path]
+    _hits: int
+    _misses: int
+
+    def __init__(self, path: str | Path | None = None):
+        """
+        :param path: a JSON file to read the memo from, if 
+        it exists, and to write it to with `save`
+        """
+
+        self._lemmata = {}
+        self._path = None if path is None else Path(path)
+        self._hits = 0
+        self._misses = 0
+
+        if self._path is not None and self._path.exists():
+            with open(self._path, encoding='utf-8') as f:
+                self._lemmata = json.load(f)
+
+    def __contains__(self, form: str) -> bool:
+        return form in self._lemmata
+
+    def __getitem__(self, form: str) -> str:
+        return self._lemmata[form]
+
+    def __len__(self) -> int:
+        return len(self._lemmata)
+
+    def __repr__(self) -> str:
+        return (f'LemmaMemo( forms = {len(self)}, '
+                f'hits = {self._hits}, misses = {self._misses} )')
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of forms requested that were already in the memo
+        at the start of the call to `lemmatize`
+        """
+        return self._hits
+
+    def lemmatize(
+            self, 
+            forms: Iterable[str], 
+            lemmatize: BatchLemmatizer,
+            batch_size: Optional[int] = None) -> list[str]:
+        
+        """
+        Return the lemma of each of `forms`, calling `lemmatize`
+        once per batch of the distinct forms not yet in the memo.
+
+        :param lemmatize: a function taking a list of forms and
+        returning a list of their lemmata, in the same order
+        :param batch_size: the maximum number of forms passed to
+        `lemmatize` at a time; by default all the new forms are
+        passed at once
+        :raises ValueError: if `lemmatize` does not return one 
+        lemma for each form
+        """
+
+        forms_ = list(forms)
+        new_forms = [form for form in dict.fromkeys(forms_) 
+                     if form not in self._lemmata]
+        
+        # Hits are counted against the memo as it was before this 
+        # call, so repeats of a new form are not hits
+        new_form_set = set(new_forms)
+        self._misses += len(new_forms)
+        self._hits += sum(1 for form in forms_ if form not in new_form_set)
+
+        size = batch_size or max(len(new_forms), 1)
+
+        for i in range(0, len(new_forms), size):
+            batch = new_forms[i:i + size]
+            lemmata = lemmatize(batch)
+
+            if len(lemmata) != len(batch):
+                raise ValueError(f'The lemmatizer returned {len(lemmata)} '
+                                 f'lemmata for {len(batch)} forms.')
+            
+            self._lemmata.update(zip(batch, lemmata))
+
+        return [self._lemmata[form] for form in forms_]
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of distinct forms passed to the lemmatizer
+        """
+        return self._misses
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def save(self, path: str | Path | None = None) -> None:
+        """
+        Write the memo to a JSON file
+
+        :param path: the file to write to; by default the 
+        file the memo was created with
+        """
+
+        path_ = self._path if path is None else Path(path)
+
+        if path_ is None:
+            raise ValueError('No path to save the memo to.')
+        
+        tmp_path = path_.with_suffix('.tmp')
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump(self._lemmata, f, ensure_ascii=False)
+        tmp_path.replace(path_)
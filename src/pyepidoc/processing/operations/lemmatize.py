@@ -1,4 +1,6 @@
-from typing import Callable, Literal
+from typing import Callable, Iterable, Literal
+from copy import deepcopy
+from itertools import chain
 
 from pyepidoc import EpiDoc
 from pyepidoc.epidoc.edition_elements.edition import Edition
@@ -8,27 +10,16 @@ from pyepidoc.epidoc import enums
 from pyepidoc.shared.generic_collection import GenericCollection as Collection, remove_none
 from pyepidoc.epidoc.representable import Representable
 
-def apply_lemmatization(
+from .lemma_memo import BatchLemmatizer, LemmaMemo
+
+def _lemmatization_edition(
         epidoc: EpiDoc, 
-        lemmatize: Callable[[str], str],
         where: Literal['main', 'separate'],
-        resp_stmt: RespStmt | None = None,
-        change: Change | None = None,
-        verbose = False
-    ) -> EpiDoc:
-
+        resp_stmt: RespStmt | None = None) -> Edition:
+    
     """
-    Lemmatize all the <w> elements in 
-    the EpiDoc document.
-
-    :param lemmatize: a function with one parameter,
-    the form needing lemmatization, returning the 
-    lemma.
-
-    :param where: where to put the lemmatized version,
-    either on a separate <div> or on the main <div>. 
-    If a separate edition is not present, one is created 
-    containing copies of the elements that need lemmatizing.
+    Return the edition to put the lemmata on, creating a 
+    separate lemmatized edition if needed
     """
 
     main_edition = epidoc.edition_by_subtype(None)
@@ -46,17 +37,21 @@ def apply_lemmatization(
                 target=lemmatized_edition
             )
 
-        edition = lemmatized_edition
+        return lemmatized_edition
 
     elif where == 'main':
-        edition = main_edition
-    else:
-        raise TypeError(
-            f'Invalid destination for lemmatized items: {where}')
-
-    for w in edition.w_tokens:
-        w.lemma = lemmatize(w.normalized_form or '')
+        return main_edition
     
+    raise TypeError(
+        f'Invalid destination for lemmatized items: {where}')
+
+
+def _finish_lemmatization(
+        epidoc: EpiDoc,
+        resp_stmt: RespStmt | None,
+        change: Change | None,
+        verbose: bool) -> None:
+
     if resp_stmt:
         epidoc.append_resp_stmt(resp_stmt)
 
@@ -64,10 +59,113 @@ def apply_lemmatization(
         epidoc.append_change(change)
 
     epidoc.prettify(prettifier='pyepidoc', verbose=verbose)
+
+
+def apply_lemmatization(
+        epidoc: EpiDoc, 
+        lemmatize: Callable[[str], str],
+        where: Literal['main', 'separate'],
+        resp_stmt: RespStmt | None = None,
+        change: Change | None = None,
+        verbose = False
+    ) -> EpiDoc:
+
+    """
+    Lemmatize all the <w> elements in 
+    the EpiDoc document.
+
+    :param lemmatize: a function with one parameter,
+    the form needing lemmatization, returning the 
+    lemma.
+
+    :param where: where to put the lemmatized version,
+    either on a separate <div> or on the main <div>. 
+    If a separate edition is not present, one is created 
+    containing copies of the elements that need lemmatizing.
+    """
+
+    edition = _lemmatization_edition(epidoc, where, resp_stmt)
+
+    for w in edition.w_tokens:
+        w.lemma = lemmatize(w.normalized_form or '')
+    
+    _finish_lemmatization(epidoc, resp_stmt, change, verbose)
     
     return epidoc
 
 
+def apply_batch_lemmatization(
+        epidocs: Iterable[EpiDoc], 
+        lemmatize: BatchLemmatizer,
+        where: Literal['main', 'separate'],
+        resp_stmt: RespStmt | None = None,
+        change: Change | None = None,
+        verbose = False,
+        memo: LemmaMemo | None = None,
+        batch_size: int | None = None,
+        fail_if_existing_lemmatized_edition: bool = False
+    ) -> list[EpiDoc]:
+
+    """
+    Lemmatize all the <w> elements in the EpiDoc documents,
+    lemmatizing each distinct form only once across all 
+    the documents.
+
+    :param lemmatize: a function taking a list of forms
+    needing lemmatization, returning a list of their lemmata 
+    in the same order. Use `batch_lemmatizer` to wrap a 
+    function lemmatizing a single form.
+
+    :param where: where to put the lemmatized version,
+    either on a separate <div> or on the main <div>; see
+    `apply_lemmatization`.
+
+    :param memo: forms already lemmatized, e.g. in an earlier
+    run. New forms are added to it, and it is saved if it 
+    was created with a path.
+
+    :param batch_size: the maximum number of forms to pass
+    to `lemmatize` at a time
+
+    :param fail_if_existing_lemmatized_edition: raise an exception,
+    before changing any of the documents, if `where` is 'separate' 
+    and a document already has a lemmatized edition
+    """
+
+    memo_ = LemmaMemo() if memo is None else memo
+    docs = list(epidocs)
+
+    if where == 'separate' and fail_if_existing_lemmatized_edition:
+        for doc in docs:
+            if doc.edition_by_subtype('simple-lemmatized') is not None:
+                raise ValueError(f'A lemmatized edition is already present in {doc.id}; '
+                                 'PyEpiDoc is currently set to stop if this is the case.')
+
+    editions = [_lemmatization_edition(doc, where, resp_stmt) for doc in docs]
+    forms = [[w.normalized_form or '' for w in edition.w_tokens] 
+             for edition in editions]
+
+    lemmata = iter(memo_.lemmatize(chain(*forms), lemmatize, batch_size))
+
+    for doc, edition in zip(docs, editions):
+        for w in edition.w_tokens:
+            w.lemma = next(lemmata)
+
+        # Appending an element moves it, so each document 
+        # needs its own copy
+        _finish_lemmatization(
+            doc, 
+            None if resp_stmt is None else RespStmt(deepcopy(resp_stmt.e)),
+            None if change is None else Change(deepcopy(change.e)),
+            verbose
+        )
+
+    if memo_.path is not None:
+        memo_.save()
+    
+    return docs
+
+
 def update_lemmatized_edition(
         epidoc: EpiDoc, 
         lemmatize: Callable[[str], str], 
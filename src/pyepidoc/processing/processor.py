@@ -5,7 +5,12 @@ from pyepidoc import EpiDoc
 from pyepidoc.epidoc.metadata.resp_stmt import RespStmt
 from pyepidoc.epidoc.metadata.change import Change
 
-from .operations import apply_lemmatization, update_lemmatized_edition
+from .operations import (
+    apply_batch_lemmatization,
+    apply_lemmatization, 
+    update_lemmatized_edition
+)
+from .operations.lemma_memo import BatchLemmatizer, LemmaMemo
 
 
 class Processor:
@@ -48,6 +53,34 @@ class Processor:
 
         return Processor(lemmatized)
     
+    def lemmatize_batch(
+            self, 
+            lemmatize: BatchLemmatizer,
+            where: Literal['main', 'separate'],
+            resp_stmt: RespStmt | None = None,
+            change: Change | None = None,
+            verbose = False,
+            memo: LemmaMemo | None = None
+        ) -> Processor:
+
+        """
+        Lemmatize the EpiDoc file with a callback taking a list 
+        of forms, called once with the distinct forms that 
+        are not in `memo`
+        """
+
+        lemmatized = apply_batch_lemmatization(
+            [self.epidoc],
+            lemmatize,
+            where,
+            resp_stmt,
+            change, 
+            verbose,
+            memo
+        )
+
+        return Processor(lemmatized[0])
+    
     def update_lemmatized_edition(self, change: Change | None = None) -> Processor:
         
         """
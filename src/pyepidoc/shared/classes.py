@@ -12,13 +12,33 @@ _T = TypeVar('_T')
 
 class EnumerableEnum(Enum):
 
+    """
+    Enum whose values are computed once per class, since
+    membership of `values()` and `value_set()` is tested
+    for most elements when tokenizing
+    """
+
+    @classmethod
+    def _value_tuple(cls) -> tuple:
+        # Look up in the class's own __dict__, so that a
+        # subclass does not use its parent's values
+        values = cls.__dict__.get('_cached_values')
+
+        if values is None:
+            values = tuple(item.value for item in cls)
+            setattr(cls, '_cached_values', values)
+            setattr(cls, '_cached_value_set', frozenset(values))
+
+        return values
+
     @classmethod
     def values(cls) -> list:
-        return [item.value for item in cls]
+        return list(cls._value_tuple())
     
     @classmethod
-    def value_set(cls) -> set:
-        return set(cls.values())
+    def value_set(cls) -> frozenset:
+        cls._value_tuple()
+        return cls.__dict__['_cached_value_set']
 
 
 class Showable:
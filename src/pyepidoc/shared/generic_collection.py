@@ -8,10 +8,15 @@ from __future__ import annotations
 from typing import (
     Callable,
     Generic,
+    Iterable,
+    Iterator,
+    Optional,
     SupportsIndex,
     TypeVar
 )
+from collections import Counter
 from functools import reduce
+from itertools import islice
 from pathlib import Path
 import os
 
@@ -23,23 +28,57 @@ class GenericCollection(Generic[T]):
     
     """
     Collection class for abbreviations grouping and containing
-    convenience methods for operating on abbreviations
+    convenience methods for operating on abbreviations.
+
+    `map`, `where`, `unique`, `frequencies` and `top` return
+    deferred collections, which hold a function producing their
+    items from the collection they were derived from, rather
+    than a list. The items are produced when the collection is
+    iterated, and are stored as a list the first time it is 
+    indexed, measured or converted with `to_list`.
+
+    Until then, each iteration calls the functions passed to 
+    `map` and `where` again, so they should be free of side 
+    effects. Call `to_list` on a collection that is iterated 
+    more than once, if the functions are expensive.
     """
 
-    _values: list[T]
+    _list: Optional[list[T]]
+    _items: Optional[Callable[[], Iterator[T]]]
 
-    def __init__(self, values: list[T]):
-        self._values = values
+    def __init__(self, values: Iterable[T]):
+        self._list = values if isinstance(values, list) else list(values)
+        self._items = None
 
     def __getitem__(self, i: SupportsIndex) -> T:
         return self._values[i]
     
+    def __iter__(self) -> Iterator[T]:
+        if self._list is not None:
+            return iter(self._list)
+        
+        assert self._items is not None
+        return self._items()
+
     def __len__(self) -> int:
         return len(self._values)
 
     def __repr__(self) -> str:
         return f'GenericCollection({self._values})'
     
+    @property
+    def _values(self) -> list[T]:
+        """
+        The items of the collection as a list, produced
+        and stored on first access if the collection is deferred
+        """
+        if self._list is None:
+            assert self._items is not None
+            self._list = list(self._items())
+            self._items = None
+
+        return self._list
+
     @property
     def count(self) -> int:
         """
@@ -47,6 +86,26 @@ class GenericCollection(Generic[T]):
         """
         return self.length
     
+    @classmethod
+    def deferred(
+            cls, 
+            items: Callable[[], Iterable[T]]
+        ) -> GenericCollection[T]:
+
+        """
+        Return a collection whose items are produced by 
+        calling `items` each time the collection is iterated,
+        until it is stored as a list
+
+        :param items: a function returning the items, e.g.
+        a generator function
+        """
+
+        collection = GenericCollection[T]([])
+        collection._list = None
+        collection._items = lambda: iter(items())
+        return collection
+
     def filter(self, predicate: Callable[[T], bool]) -> GenericCollection[T]:
         return self.where(predicate)
     
@@ -55,20 +114,18 @@ class GenericCollection(Generic[T]):
         Call an action on each element
         """
 
-        for item in self._values:
+        for item in self:
             action(item)
     
     def frequencies(self) -> GenericCollection[tuple[T, int]]:
         """
-        Return a dictionary with the frequencies of each item
+        Return each unique item with its frequency, in 
+        descending order of frequency
         """
 
-        d = {k: self._values.count(k) 
-                for k in self.unique()._values}
-
-        l = ([(value, frequency) for value, frequency in d.items()])
-        sorted_l = sorted(l, key=lambda item: item[1], reverse=True)
-        return GenericCollection(sorted_l)
+        return GenericCollection.deferred(
+            lambda: Counter(self).most_common()
+        )
 
     @property
     def length(self) -> int:
@@ -80,9 +137,10 @@ class GenericCollection(Generic[T]):
     
     def map(self, func: Callable[[T], U]) -> GenericCollection[U]:
         """
-        Map a function to the abbreviations
+        Map a function to the abbreviations. `func` is called
+        each time the result is iterated, until it is stored
         """
-        return GenericCollection(list(map(func, self._values)))
+        return GenericCollection.deferred(lambda: map(func, self))
     
     def print(self):
         """
@@ -105,7 +163,7 @@ class GenericCollection(Generic[T]):
         """
         Reduce the collection to a single value
         """
-        reduction = reduce(func, self._values, initial)
+        reduction = reduce(func, self, initial)
         return reduction
     
     def save_values(
@@ -120,14 +178,14 @@ class GenericCollection(Generic[T]):
         """
 
         with open(path, mode='w') as f:
-            string_values = map(lambda value: mapfunc(value) + '\n', self._values)
+            string_values = map(lambda value: mapfunc(value) + '\n', self)
             f.writelines(string_values)
 
     def sort(self, key=lambda x: x, reverse: bool=False) -> GenericCollection[T]:
         """
         Sort the values according to a key function
         """
-        sorted_values = sorted(self._values, key=key, reverse=reverse)
+        sorted_values = sorted(self, key=key, reverse=reverse)
         return GenericCollection(sorted_values)
 
     def to_list(self) -> list[T]:
@@ -140,31 +198,32 @@ class GenericCollection(Generic[T]):
         """
         Return the underlying _values as a `set` object
         """
-        return set(self._values)
+        return set(self)
 
     def top(self, n: int) -> GenericCollection[T]:
         """
         Take the top `n` items
         """
-        if self.count > n:
-            return GenericCollection(self._values[0:n])
-        
-        return GenericCollection(self._values)
+        return GenericCollection.deferred(lambda: islice(self, n))
     
     def unique(self) -> GenericCollection[T]:
         """
-        Return the unique elements in the collection
+        Return the unique elements in the collection, in the 
+        order in which they first occur
         """
 
-        return GenericCollection(list(set(self._values)))
+        return GenericCollection.deferred(lambda: dict.fromkeys(self))
 
     def where(self, predicate: Callable[[T], bool]) -> GenericCollection[T]:
         """
-        Filter abbreviations according to a predicate
+        Filter abbreviations according to a predicate. `predicate` 
+        is called each time the result is iterated, until it is stored
         """
 
-        return GenericCollection(list(filter(predicate, self._values)))
+        return GenericCollection.deferred(lambda: filter(predicate, self))
     
 
 def remove_none(collection: GenericCollection[T | None]) -> GenericCollection[T]:
-    return GenericCollection([item for item in collection._values if item is not None])
\ No newline at end of file
+    return GenericCollection.deferred(
+        lambda: (item for item in collection if item is not None)
+    )
\ No newline at end of file
@@ -2,4 +2,6 @@ from typing import Literal
 
 Base = Literal[52, 100]
 
-FileWriteMode = Literal['file_on_disk', 'file_object']
\ No newline at end of file
+FileWriteMode = Literal['file_on_disk', 'file_object']
+
+TokenizerEngine = Literal['recursive', 'linear']
\ No newline at end of file
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import (
+    Callable,
     Optional, 
     Union, 
     cast, 
@@ -22,10 +23,13 @@ from lxml.etree import (
     DocumentInvalid
 )
 
-from pyepidoc.shared.constants import TEINS, XMLNS
+from pyepidoc.shared.constants import TEINS, XINCLUDENS, XMLNS
 from pyepidoc.xml.xml_element import XmlElement
 from .xml_element import XmlElement
 from .errors import handle_xmlsyntaxerror
+from .schema_cache import get_relaxng, get_schematron
+from .validation_cache import ValidationCache, content_hash, schema_hash
+from .xpath_registry import evaluate
 
 
 class DocRoot:  
@@ -33,6 +37,7 @@ class DocRoot:
     _e: _Element
     _p: Path
     _valid: Optional[bool] = None
+    _load_error: Optional[XMLSyntaxError] = None
 
     @overload
     def __init__(self, inpt: XmlElement):
@@ -183,10 +188,7 @@ class DocRoot:
                                for elemname in _elemnames])
 
         try:
-            xpathRes = (self
-                .e
-                .xpath(xpathstr, namespaces={'ns': TEINS})
-            )
+            xpathRes = evaluate(self.e, xpathstr, {'ns': TEINS})
         except XMLSyntaxAssertionError as e:
             print('XMLSyntaxAssertionError in get_desc')
             print(e)
@@ -224,13 +226,15 @@ class DocRoot:
             if lang is None:
                 return cast(
                     list[_Element], 
-                    self.e.xpath(
+                    evaluate(
+                        self.e,
                         f".//ns:div[@type='{divtype}']", 
                         namespaces={'ns': TEINS}) 
                     )
             
             elif lang is not None:
-                return cast(list[_Element], self.e.xpath(
+                return cast(list[_Element], evaluate(
+                    self.e,
                     f".//ns:div[@type='{divtype} @xml:lang='{lang}']",
                     namespaces={'ns': TEINS, 'xml': XMLNS}) 
                 )
@@ -288,6 +292,7 @@ class DocRoot:
         except XMLSyntaxError as e:
             print('XMLSyntaxError in _e_from_file')
             handle_xmlsyntaxerror(e)
+            self._load_error = e
             return _ElementTree()        
 
     @property
@@ -335,7 +340,7 @@ class DocRoot:
         if self.e is None: 
             return ''
         
-        xpath_res = cast(list[str], self.e.xpath('.//text()'))
+        xpath_res = cast(list[str], evaluate(self.e, './/text()'))
 
         return ''.join(xpath_res)
 
@@ -413,47 +418,118 @@ class DocRoot:
         else:
             return 'No validation has been carried out'
 
-    def validate_by_isoschematron(self, fp: Path | str) -> bool:
+    def _validate_with_cache(
+            self,
+            schema_path: Path | str,
+            validate: Callable[[], tuple[bool, str]],
+            cache: ValidationCache | Path | str | None,
+            force: bool) -> tuple[bool, str]:
+        
+        """
+        Return the cached result of validating the document 
+        against the schema at `schema_path` if there is one, 
+        otherwise run `validate` and cache its result.
+        """
+
+        if cache is None:
+            return validate()
+        
+        cache_ = cache if isinstance(cache, ValidationCache) \
+            else ValidationCache(cache)
+        
+        try:
+            doc_hash = content_hash(etree.tostring(self.root_tree))
+            schema_hash_ = schema_hash(schema_path)
+            cached = None if force else cache_.get(doc_hash, schema_hash_)
+
+            if cached is not None:
+                self._valid = cached[0]
+                return cached
+            
+            valid, msg = validate()
+            cache_.set(doc_hash, schema_hash_, valid, str(msg))
+            return (valid, msg)
+        
+        finally:
+            if cache_ is not cache:
+                cache_.close()
+
+    @property
+    def has_xinclude(self) -> bool:
+        """
+        True if the document contains any XInclude elements
+        """
+        if self.e is None:
+            return False
+        
+        return next(self.e.iter(f'{{{XINCLUDENS}}}include'), None) is not None
+
+    def validate_by_isoschematron(
+            self, 
+            fp: Path | str,
+            cache: ValidationCache | Path | str | None = None,
+            force: bool = False) -> bool:
+        
         """
         Validates the EpiDoc file again a an ISOSchematron schema
+
+        :param cache: a ValidationCache, or the path to one, in 
+        which to look up and store the result
+        :param force: if True, validate even if there is a cached result
         """
 
-        fp_ = Path(fp)
+        def validate() -> tuple[bool, str]:
+            schematron = get_schematron(fp)
+            return (schematron.validate(self.root_tree), '')
         
-        schematron_doc = etree.parse(fp_, parser=None)
-        schematron = isoschematron.Schematron(schematron_doc)
-        return schematron.validate(self.root_tree)
+        return self._validate_with_cache(fp, validate, cache, force)[0]
 
     def validate_by_relaxng(
             self, 
-            relax_ng_path: Path | str) -> tuple[bool, str]:
+            relax_ng_path: Path | str,
+            cache: ValidationCache | Path | str | None = None,
+            force: bool = False) -> tuple[bool, str]:
         """
         Validates the EpiDoc file against a RelaxNG schema. 
         Runs the lxml xinclude method to include any modular elements, 
-        see https://lxml.de/api.html#xinclude-and-elementinclude
+        see https://lxml.de/api.html#xinclude-and-elementinclude.
+        The compiled schema is cached, see `schema_cache.get_relaxng`.
 
+        :param cache: a ValidationCache, or the path to one, in 
+        which to look up and store the result
+        :param force: if True, validate even if there is a cached result
         :return: a tuple containing a bool giving the validation result,
         as well as a message string.
         """
 
-        relax_ng_path_ = Path(relax_ng_path)
-        relax_ng_doc = etree.parse(source=relax_ng_path_, parser=None)
-        relaxng = etree.RelaxNG(relax_ng_doc)
+        def validate() -> tuple[bool, str]:
+            relaxng = get_relaxng(relax_ng_path)
         
-        try:
-            roottree_ = deepcopy(self.root_tree)
-            roottree_.xinclude()
-            relaxng.assertValid(roottree_)
-            msg = (f'{self._p} is valid EpiDoc according to the '
-                    'RelaxNG schema')
-            self._valid = True
+            try:
+                # xinclude() modifies the tree, so only copy it 
+                # when there is something to include
+                if self.has_xinclude:
+                    roottree_ = deepcopy(self.root_tree)
+                    roottree_.xinclude()
+                else:
+                    roottree_ = self.root_tree
+
+                relaxng.assertValid(roottree_)
+                self._valid = True
+                return (True, self._valid_relaxng_msg)
+
+            except DocumentInvalid as e:
+                self._valid = False
+                return (False, str(e.error_log.last_error))
+        
+        valid, msg = self._validate_with_cache(relax_ng_path, validate, cache, force)
 
-        except DocumentInvalid:
-            log = relaxng.error_log
-            self._valid = False
-            msg = log.last_error
+        # A cached message may name another file with the same content
+        return (valid, self._valid_relaxng_msg if valid else msg)
 
-        return (self._valid, msg)
+    @property
+    def _valid_relaxng_msg(self) -> str:
+        return f'{self._p} is valid EpiDoc according to the RelaxNG schema'
 
     @property
     def xml_byte_str(self) -> bytes:
@@ -477,7 +553,7 @@ class DocRoot:
         # NB the cast won't necessarily be correct for all test cases
             return cast(
                 list[Union[_Element,_ElementUnicodeResult]], 
-                self.e.xpath(xpathstr, namespaces={'ns': TEINS})
+                evaluate(self.e, xpathstr, namespaces={'ns': TEINS})
             )
         except XMLSyntaxAssertionError as e:
             print('XMLSyntaxAssertionError in xpath')
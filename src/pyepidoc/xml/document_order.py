@@ -0,0 +1,165 @@
+"""
+Index of the positions of the nodes of an XML tree in document
+order, computed in a single traversal, so that elements can be
+compared and sorted without walking to the root and calling
+`_Element.index` at each level.
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterable, Optional, TypeVar
+
+from lxml.etree import _Element
+
+from .tree_release import on_tree_release
+
+
+_T = TypeVar('_T')
+
+_Neighbours = tuple[Optional[_Element], Optional[_Element], Optional[_Element]]
+
+# Number of documents for which an index is kept
+_MAX_DOCUMENTS = 16
+
+_indexes: dict[_Element, DocumentOrder] = {}
+
+
+def _neighbours(e: _Element) -> _Neighbours:
+    return (e.getparent(), e.getprevious(), e.getnext())
+
+
+def _root(e: _Element) -> _Element:
+    parent = e.getparent()
+
+    while parent is not None:
+        e = parent
+        parent = e.getparent()
+
+    return e
+
+
+class DocumentOrder:
+
+    """
+    Position in document order of every node in the tree
+    (or subtree) below `root`, including `root` itself.
+    The index holds a reference to each node, so that lxml
+    keeps returning the same proxy object for it.
+    """
+
+    _root: _Element
+    _positions: dict[_Element, int]
+    _neighbours: dict[_Element, _Neighbours]
+
+    def __init__(self, root: _Element):
+        self._root = root
+        self._positions = {}
+        self._neighbours = {}
+
+        for position, node in enumerate(root.iter()):
+            self._positions[node] = position
+            self._neighbours[node] = _neighbours(node)
+
+    def __contains__(self, e: _Element) -> bool:
+        return e in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def contains_all(self, elements: Iterable[_Element]) -> bool:
+        return all(e in self._positions for e in elements)
+
+    def is_current(self, e: _Element) -> bool:
+        """
+        Return True if `e` is in the index and neither it nor any
+        of its ancestors has been moved, or had a sibling inserted
+        or removed next to it, since the index was built
+        """
+
+        node: Optional[_Element] = e
+
+        while node is not None and node is not self._root:
+            neighbours = self._neighbours.get(node)
+
+            if neighbours is None or neighbours != _neighbours(node):
+                return False
+
+            node = neighbours[0]
+
+        return node is self._root
+
+    def position(self, e: _Element) -> int:
+        """
+        Return the position of `e` in document order
+
+        :raises KeyError: if `e` is not in the index
+        """
+        return self._positions[e]
+
+    @property
+    def root(self) -> _Element:
+        return self._root
+
+
+def document_order(e: _Element) -> DocumentOrder:
+    """
+    Return the document order index for the tree containing `e`,
+    rebuilding it if `e` has been added to the tree, or moved
+    within it, since the index was built.
+    """
+
+    root = _root(e)
+    index = _indexes.get(root)
+
+    if index is not None and index.is_current(e):
+        return index
+
+    if index is None and len(_indexes) >= _MAX_DOCUMENTS:
+        del _indexes[next(iter(_indexes))]
+
+    index = _indexes[root] = DocumentOrder(root)
+    return index
+
+
+def document_position(e: _Element) -> int:
+    """
+    Return the position of `e` in document order within its tree
+    """
+    return document_order(e).position(e)
+
+
+def invalidate_document_order(e: _Element) -> None:
+    """
+    Discard the index for the tree containing `e`
+    """
+    _indexes.pop(_root(e), None)
+
+
+on_tree_release(invalidate_document_order)
+
+
+def sort_in_document_order(
+        items: Iterable[_T],
+        within: _Element,
+        node: Callable[[_T], _Element]) -> list[_T]:
+
+    """
+    Sort items in the document order of their nodes, using
+    a new index of the subtree below `within`, or the index
+    of the whole document if any node lies outside it.
+
+    :param items: the items to sort
+    :param within: element expected to contain the nodes
+    :param node: function returning the node of an item
+    """
+
+    items_ = list(items)
+    nodes = [node(item) for item in items_]
+    index = DocumentOrder(within)
+
+    if not index.contains_all(nodes):
+        index = DocumentOrder(_root(within))
+
+    positions = [index.position(node_) for node_ in nodes]
+
+    return [item for _, item in
+            sorted(zip(positions, items_), key=lambda pair: pair[0])]
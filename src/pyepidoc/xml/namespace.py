@@ -1,5 +1,24 @@
 from typing import Optional
-import re
+from functools import lru_cache
+import sys
+
+from pyepidoc.shared.classes import Tag
+
+
+@lru_cache(maxsize=None)
+def split_clark(tag: str) -> Tag:
+    """
+    Split a tag in Clark notation, e.g. '{http://www.tei-c.org/ns/1.0}w',
+    into a (namespace, localname) |Tag|. The result is cached and its
+    strings interned, so that each distinct tag is split only once,
+    whichever document it comes from.
+    """
+
+    if tag.startswith('{'):
+        namespace, _, name = tag[1:].partition('}')
+        return Tag(sys.intern(namespace), sys.intern(name))
+
+    return Tag('', sys.intern(tag))
 
 class Namespace:
 
@@ -19,5 +38,7 @@ class Namespace:
 
     @staticmethod
     def remove_ns(tag_with_ns:str) -> str:
-        pattern = r'^\{.+?\}'
-        return re.sub(pattern, '', tag_with_ns)
\ No newline at end of file
+        if tag_with_ns.startswith('{'):
+            return split_clark(tag_with_ns).name
+
+        return tag_with_ns
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Process-wide cache of compiled validation schemas, so that a
+schema is parsed and compiled once rather than for every
+document validated against it.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from threading import Lock
+
+from lxml import etree, isoschematron
+
+
+_relaxng_schemas: dict[tuple[Path, int], etree.RelaxNG] = {}
+_schematron_schemas: dict[tuple[Path, int], isoschematron.Schematron] = {}
+_lock = Lock()
+
+
+def _key(path: Path | str) -> tuple[Path, int]:
+    path_ = Path(path).resolve()
+    return (path_, path_.stat().st_mtime_ns)
+
+
+def _drop_path(schemas: dict, path: Path) -> None:
+    """
+    Remove any schemas compiled from an earlier version
+    of the file at `path`
+    """
+    for key in [key for key in schemas if key[0] == path]:
+        del schemas[key]
+
+
+def clear_schema_cache() -> None:
+    """
+    Remove all the compiled schemas from the cache
+    """
+    with _lock:
+        _relaxng_schemas.clear()
+        _schematron_schemas.clear()
+
+
+def get_relaxng(path: Path | str) -> etree.RelaxNG:
+    """
+    Return the compiled RelaxNG schema at `path`, compiling it
+    if it is not in the cache or has been modified since
+    it was compiled
+    """
+
+    key = _key(path)
+
+    with _lock:
+        if key not in _relaxng_schemas:
+            _drop_path(_relaxng_schemas, key[0])
+            relax_ng_doc = etree.parse(source=key[0], parser=None)
+            _relaxng_schemas[key] = etree.RelaxNG(relax_ng_doc)
+
+        return _relaxng_schemas[key]
+
+
+def get_schematron(path: Path | str) -> isoschematron.Schematron:
+    """
+    Return the compiled ISO Schematron schema at `path`, compiling
+    it if it is not in the cache or has been modified since
+    it was compiled
+    """
+
+    key = _key(path)
+
+    with _lock:
+        if key not in _schematron_schemas:
+            _drop_path(_schematron_schemas, key[0])
+            schematron_doc = etree.parse(key[0], parser=None)
+            _schematron_schemas[key] = isoschematron.Schematron(schematron_doc)
+
+        return _schematron_schemas[key]
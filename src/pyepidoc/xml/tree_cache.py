@@ -0,0 +1,125 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from lxml.etree import _Element
+
+from .docroot import DocRoot
+from .tree_release import release_tree
+
+
+class TreeCache:
+
+    """
+    Least-recently-used cache of parsed XML documents, keyed
+    by file path. Documents are parsed from disk on a cache miss,
+    and the least recently used documents are evicted once either
+    budget is exceeded.
+    """
+
+    _trees: OrderedDict[Path, _Element]
+    _sizes: dict[Path, int]
+    _max_docs: Optional[int]
+    _max_bytes: Optional[int]
+    _loads: int
+
+    def __init__(
+            self,
+            max_docs: Optional[int] = None,
+            max_bytes: Optional[int] = None):
+
+        """
+        :param max_docs: maximum number of parsed documents to
+        hold at once. If None, the number of documents is not limited.
+
+        :param max_bytes: maximum combined size on disk of the
+        parsed documents held at once. This is an approximation of
+        the memory budget. If None, the size is not limited.
+        """
+
+        self._trees = OrderedDict()
+        self._sizes = dict()
+        self._max_docs = max_docs
+        self._max_bytes = max_bytes
+        self._loads = 0
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._trees
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def __repr__(self) -> str:
+        return f'TreeCache( loaded = {len(self)}, loads = {self.loads} )'
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used documents until within budget.
+        The most recently used document is always kept.
+        """
+
+        while len(self._trees) > 1 and self._over_budget:
+            path, root = self._trees.popitem(last=False)
+            self._sizes.pop(path, None)
+            release_tree(root)
+
+    def get(self, path: Path) -> _Element:
+        """
+        Return the root element of the document at `path`,
+        parsing it from disk if it is not already cached.
+
+        Raises a TypeError, chained from the original syntax
+        error, if the file cannot be parsed.
+        """
+
+        if path in self._trees:
+            self._trees.move_to_end(path)
+            return self._trees[path]
+
+        doc = DocRoot(path)
+        if doc.e is None:
+            raise TypeError("No root element present") from doc._load_error
+
+        self._loads += 1
+        self._trees[path] = doc.e
+        self._sizes[path] = path.stat().st_size
+        self._evict()
+
+        return doc.e
+
+    def invalidate(self, path: Path) -> None:
+        """
+        Remove the document at `path` from the cache, so that
+        it will be re-read from disk on next access
+        """
+
+        root = self._trees.pop(path, None)
+        self._sizes.pop(path, None)
+
+        if root is not None:
+            release_tree(root)
+
+    @property
+    def loads(self) -> int:
+        """
+        Number of times a document has been parsed from disk
+        """
+        return self._loads
+
+    @property
+    def _over_budget(self) -> bool:
+        if self._max_docs is not None and len(self._trees) > self._max_docs:
+            return True
+
+        if self._max_bytes is not None and self.size > self._max_bytes:
+            return True
+
+        return False
+
+    @property
+    def size(self) -> int:
+        """
+        Combined size on disk of the cached documents
+        """
+        return sum(self._sizes.values())
@@ -0,0 +1,31 @@
+"""
+Callbacks run when a parsed tree is released, e.g. evicted from
+a `TreeCache`, so that module-level caches keyed by root elements
+drop the tree rather than keeping it in memory.
+"""
+
+from __future__ import annotations
+from typing import Callable
+
+from lxml.etree import _Element
+
+
+_callbacks: list[Callable[[_Element], None]] = []
+
+
+def on_tree_release(callback: Callable[[_Element], None]) -> None:
+    """
+    Register a function to call with the root of each 
+    released tree
+    """
+    _callbacks.append(callback)
+
+
+def release_tree(e: _Element) -> None:
+    """
+    Drop the tree containing `e` from all the registered caches
+    """
+    root = e.getroottree().getroot()
+
+    for callback in _callbacks:
+        callback(root)
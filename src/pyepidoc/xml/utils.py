@@ -5,6 +5,8 @@ from lxml import etree
 from copy import deepcopy
 
 from pyepidoc.shared.constants import TEINS
+from .namespace import split_clark
+from .xpath_registry import evaluate
 
 
 def abify(xml_str: str): 
@@ -47,7 +49,11 @@ def localname(node: _Element | _ElementUnicodeResult) -> str:
     if isinstance(node_, _ElementUnicodeResult):
         return '#text'
     
-    return str(node_.xpath('local-name(.)'))
+    # Comments and processing instructions do not have a string tag
+    if not isinstance(node_.tag, str):
+        return str(evaluate(node_, 'local-name(.)'))
+    
+    return split_clark(node_.tag).name
 
 
 def remove_children(elem: _Element) -> _Element:
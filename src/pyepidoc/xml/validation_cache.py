@@ -0,0 +1,114 @@
+"""
+Persistent cache of validation results, keyed by a hash of the
+document content and a hash of the schema, so that unchanged
+documents do not need to be validated again.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional
+import hashlib
+import sqlite3
+
+
+_schema_hashes: dict[tuple[Path, int], str] = {}
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+def schema_hash(path: Path | str) -> str:
+    """
+    Return a hash of the content of the schema at `path`.
+    The hash is kept for as long as the file is unmodified.
+    """
+
+    path_ = Path(path).resolve()
+    key = (path_, path_.stat().st_mtime_ns)
+
+    if key not in _schema_hashes:
+        _schema_hashes[key] = content_hash(path_.read_bytes())
+
+    return _schema_hashes[key]
+
+
+class ValidationCache:
+
+    """
+    SQLite store of validation results, keyed by
+    (document hash, schema hash). Documents that use XInclude
+    are hashed before inclusion, so changes to the included
+    files are not detected.
+    """
+
+    _path: Path
+    _conn: sqlite3.Connection
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: path to the SQLite cache file. The file is
+        created if it does not exist.
+        """
+
+        self._path = Path(path)
+        self._conn = sqlite3.connect(self._path, timeout=30)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'doc_hash TEXT, '
+            'schema_hash TEXT, '
+            'valid INTEGER, '
+            'message TEXT, '
+            'PRIMARY KEY (doc_hash, schema_hash))'
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f'ValidationCache( path = {self._path}, results = {len(self)} )'
+
+    def clear(self) -> None:
+        """
+        Remove all the cached results
+        """
+        self._conn.execute('DELETE FROM results')
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get(self, doc_hash: str, schema_hash: str) -> Optional[tuple[bool, str]]:
+        """
+        Return the cached validation result, or None if
+        there is none
+        """
+
+        row = self._conn.execute(
+            'SELECT valid, message FROM results '
+            'WHERE doc_hash = ? AND schema_hash = ?',
+            (doc_hash, schema_hash)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return (bool(row[0]), row[1])
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def set(
+            self,
+            doc_hash: str,
+            schema_hash: str,
+            valid: bool,
+            message: str) -> None:
+
+        self._conn.execute(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+            (doc_hash, schema_hash, int(valid), message)
+        )
+        self._conn.commit()
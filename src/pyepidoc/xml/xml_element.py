@@ -24,11 +24,13 @@ from lxml.etree import (
 
 from pyepidoc.shared.classes import Tag, Showable, ExtendableSeq, SetRelation
 
-from .namespace import Namespace as ns
+from .namespace import Namespace as ns, split_clark
 
 from pyepidoc.shared.constants import TEINS, XMLNS, SubsumableRels
 from pyepidoc.shared import maxone, head
 from pyepidoc.xml.utils import localname
+from .document_order import document_position
+from .xpath_registry import evaluate
 
 
 class XmlElement(Showable):    
@@ -44,27 +46,16 @@ class XmlElement(Showable):
 
             return False
         
-        return self.id_internal == other.id_internal
+        return self._e is other._e
 
     def __gt__(self, other) -> bool:
         if type(other) is not XmlElement and not issubclass(type(other), XmlElement):
             raise TypeError(f"Other element is of type {type(other)}.")
 
-        if len(self.id_internal) != len(other.id_internal):
-            return self._compare_equal_length_ids(
-                self.id_internal, 
-                other.id_internal, 
-                operator.gt
-            )
-
-        return self.id_internal[-1] > other.id_internal[-1]
+        return self.document_position > other.document_position
 
     def __hash__(self) -> int:
-        return hash(
-            '.'.join(
-                [str(id_part) for id_part in self.id_internal]
-            )
-        )
+        return hash(self._e)
 
     @overload
     def __init__(self, e: XmlElement):
@@ -94,10 +85,7 @@ class XmlElement(Showable):
         if type(other) is not XmlElement and not issubclass(type(other), XmlElement):
             raise TypeError(f"Previous element is of type {type(other)}.")
 
-        if len(self.id_internal) != len(other.id_internal):
-            return self._compare_equal_length_ids(self.id_internal, other.id_internal, operator.lt)
-
-        return self.id_internal[-1] < other.id_internal[-1]
+        return self.document_position < other.document_position
 
     def __repr__(self) -> str:
         
@@ -215,6 +203,19 @@ class XmlElement(Showable):
         return len([parent for parent in self.get_ancestors_incl_self()
             if type(parent.parent) is XmlElement])
 
+    @property
+    def document_position(self) -> int:
+        """
+        Position of the element in document order, from an index
+        of the whole document that is rebuilt if the element
+        has been moved
+        """
+
+        if self._e is None:
+            return -1
+
+        return document_position(self._e)
+
     @property
     def descendant_comments(self) -> Sequence[_Comment]:
         if self.e is None:
@@ -267,7 +268,7 @@ class XmlElement(Showable):
         Return all descendant nodes of any kind including comments
         """
 
-        return self._e.xpath('.//node()')
+        return evaluate(self._e, './/node()')
     
     @property
     def descendant_non_comments(self) -> list[_Element | _ElementUnicodeResult]:
@@ -420,10 +421,7 @@ class XmlElement(Showable):
 
         xpathstr = ' | '.join([f".//{ns_prefix}{elemname}" + self._compile_attribs(attribs) for elemname in _elemnames])
 
-        xpathRes = (self
-            .e
-            .xpath(xpathstr, namespaces={'ns': namespace})
-        )
+        xpathRes = evaluate(self.e, xpathstr, {'ns': namespace})
 
         if type(xpathRes) is list:
             return cast(list[_Element], xpathRes)
@@ -470,10 +468,11 @@ class XmlElement(Showable):
             return []
 
         if not lang:
-            return cast(list[_Element], self.e.xpath(f".//ns:div[@type='{divtype}']", namespaces={'ns': TEINS}) )
+            return cast(list[_Element], evaluate(self.e, f".//ns:div[@type='{divtype}']", namespaces={'ns': TEINS}) )
 
         elif lang:
-            return cast(list[_Element], self.e.xpath(
+            return cast(list[_Element], evaluate(
+                self.e,
                 f".//ns:div[@type='{divtype} @xml:lang='{lang}']",
                 namespaces={'ns': TEINS, 'xml': XMLNS}) 
             )
@@ -697,7 +696,7 @@ class XmlElement(Showable):
             # Add new line and tabs after tag
             if desc.parent is not None and \
                 desc.parent.last_child is not None and \
-                    desc.parent.last_child.id_internal == desc.id_internal:
+                    desc.parent.last_child == desc:
                 
                 # If last child, add one fewer tab so that closing tag
                 # has correct alignment
@@ -789,19 +788,7 @@ class XmlElement(Showable):
         if self._e is None: 
             return Tag(None, None)
 
-        etag = self._e.tag
-        match = re.search(r'(\{(.+)\})?(.+)', etag)
-
-        if match is None:
-            return Tag(None, None)
-
-        if len(match.groups()) != 3:
-            raise ValueError('Invalid element name')
-
-        if match.groups()[0] is None:    # i.e. no namespace: check
-            return Tag('', etag)
-        else:
-            return Tag(match.groups()[1], match.groups()[2])
+        return split_clark(self._e.tag)
 
     @property
     def tail(self) -> Optional[str]:
@@ -838,7 +825,7 @@ class XmlElement(Showable):
     def text_desc(self) -> str:
         if self._e is None: 
             return ''
-        return ''.join(self._e.xpath('.//text()'))
+        return ''.join(evaluate(self._e, './/text()'))
 
     @property
     def text_desc_compressed_whitespace(self) -> str:
@@ -915,7 +902,7 @@ class XmlElement(Showable):
         "http://www.tei-c.org/ns/1.0"
         """
 
-        result = self.e.xpath(xpathstr, namespaces=namespaces)
+        result = evaluate(self.e, xpathstr, namespaces=namespaces)
 
         # NB the cast won't necessarily be correct for all test cases
         return list[Union[_Element,_ElementUnicodeResult]](result)
@@ -930,7 +917,7 @@ class XmlElement(Showable):
         Returns False if a boolean is not returned.
         """
 
-        result = self.e.xpath(xpathstr, namespaces=namespaces)
+        result = evaluate(self.e, xpathstr, namespaces=namespaces)
 
         if type(result) is bool:
             return result
@@ -947,7 +934,7 @@ class XmlElement(Showable):
         Returns False if a boolean is not returned.
         """
 
-        result = self.e.xpath(xpathstr, namespaces=namespaces)
+        result = evaluate(self.e, xpathstr, namespaces=namespaces)
 
         if type(result) is float:
             return result
@@ -0,0 +1,114 @@
+"""
+Registry of compiled XPath expressions, so that an expression
+used repeatedly, e.g. in `XmlElement.get_desc`, is compiled once
+rather than on every call to `_Element.xpath`.
+"""
+
+from __future__ import annotations
+from typing import Any, NamedTuple, Optional
+from threading import local
+
+from lxml import etree
+from lxml.etree import _Comment, _Element, _Entity, _ProcessingInstruction
+
+from pyepidoc.shared.constants import TEINS
+
+
+_XPathKey = tuple[str, tuple[tuple[str, str], ...]]
+
+# Limit on the number of compiled expressions held per thread, 
+# since some expressions include attribute values
+_MAX_EXPRESSIONS = 4096
+
+# Default namespace prefixes for `evaluate`. This is a dict rather 
+# than a read-only mapping, since lxml requires a dict: it must not 
+# be modified.
+_TEI_NAMESPACES = {'ns': TEINS}
+
+# Compiled XPath objects are not shared between threads
+_registry = local()
+_compiled = 0
+_reused = 0
+
+
+class XPathStats(NamedTuple):
+    """
+    Number of XPath expressions compiled, and number of
+    evaluations that reused an expression already compiled
+    """
+    compiled: int
+    reused: int
+
+
+def _expressions() -> dict[_XPathKey, etree.XPath]:
+    try:
+        return _registry.expressions
+    except AttributeError:
+        _registry.expressions = {}
+        return _registry.expressions
+
+
+def compiled_xpath(
+        xpathstr: str,
+        namespaces: Optional[dict[str, str]] = None) -> etree.XPath:
+
+    """
+    Return the compiled XPath for an expression and its
+    namespace prefixes, compiling it on first use
+    """
+
+    global _compiled, _reused
+
+    key = (xpathstr, tuple(sorted((namespaces or {}).items())))
+    expressions = _expressions()
+    xpath = expressions.get(key)
+
+    if xpath is None:
+        if len(expressions) >= _MAX_EXPRESSIONS:
+            expressions.clear()
+
+        xpath = etree.XPath(xpathstr, namespaces=namespaces)
+        expressions[key] = xpath
+        _compiled += 1
+    else:
+        _reused += 1
+
+    return xpath
+
+
+def evaluate(
+        e: _Element,
+        xpathstr: str,
+        namespaces: Optional[dict[str, str]] = None) -> Any:
+
+    """
+    Evaluate an XPath expression on an element, using the
+    compiled expression from the registry. Equivalent to
+    `e.xpath(xpathstr, namespaces=namespaces)`.
+
+    :param namespaces: the namespace prefixes; if None, the 
+    prefix 'ns' is bound to the TEI namespace
+    """
+
+    if namespaces is None:
+        namespaces = _TEI_NAMESPACES
+
+    # Compiled XPath objects can only be applied to elements
+    if isinstance(e, (_Comment, _Entity, _ProcessingInstruction)):
+        return e.xpath(xpathstr, namespaces=namespaces)
+
+    return compiled_xpath(xpathstr, namespaces)(e)
+
+
+def reset_xpath_stats() -> None:
+    global _compiled, _reused
+    _compiled = 0
+    _reused = 0
+
+
+def xpath_stats() -> XPathStats:
+    """
+    Return the number of XPath compilations carried out
+    and avoided since the counters were last reset
+    """
+    return XPathStats(compiled=_compiled, reused=_reused)
@@ -1,4 +1,12 @@
+from pyepidoc import EpiDoc, EpiDocCorpus
+from pyepidoc.analysis.abbreviations.instances import (
+    abbreviation_count, raw_abbreviations
+)
+from pyepidoc.analysis.abbreviations.table import AbbreviationTable
+from pyepidoc.epidoc.enums import AbbrType
 from pyepidoc.shared.csv import pivot_dict
+import pytest
+
 
 def test_pivot_dict():
     dict_dict = {'a': {'x': 1, 'y': 2, 'z': 3}, 'b': {'x': 10, 'y': 20, 'z': 30}}
@@ -8,4 +16,44 @@ def test_pivot_dict():
     assert list_dict == [
         {'': 'a', 'x': 1, 'y': 2, 'z': 3},
         {'': 'b', 'x': 10, 'y': 20, 'z': 30}
-    ]
\ No newline at end of file
+    ]
+
+
+def test_abbreviation_table_matches_instances():
+    """
+    Test that the abbreviation table gives the same results as the functions in `instances`
+    """
+
+    corpus = EpiDocCorpus('tests/api/files/corpus')
+    table = AbbreviationTable.from_corpus(corpus)
+
+    assert len(table) == len(corpus.expans)
+
+    for language in ['la', 'grc', None]:
+        for abbr_type in [*AbbrType, None]:
+            raw = raw_abbreviations(corpus, abbr_type, language)
+
+            assert table.raw(abbr_type, language) == raw
+            assert table.count(abbr_type, language) == len(raw)
+            assert table.group_by_expansion(abbr_type, language) == \
+                abbreviation_count(raw)
+
+
+def test_abbreviation_table_reads_expans_once_per_doc(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that building the abbreviation table finds the <expan>
+    elements of each document only once
+    """
+
+    reads: list[str] = []
+    expans = EpiDoc.expans
+
+    def count_reads(doc: EpiDoc):
+        reads.append(doc.id)
+        return expans.fget(doc)
+
+    monkeypatch.setattr(EpiDoc, 'expans', property(count_reads))
+    corpus = EpiDocCorpus('tests/api/files/corpus')
+    AbbreviationTable.from_corpus(corpus)
+
+    assert sorted(reads) == ['ISic000001', 'ISic000032']
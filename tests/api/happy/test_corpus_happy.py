@@ -1,8 +1,22 @@
-from pyepidoc import EpiDocCorpus
+from pyepidoc import EpiDoc, EpiDocCorpus
+from pyepidoc.epidoc.derived_cache import DerivedState, DerivedStateCache
+from pyepidoc.epidoc.errors import TEINSError
+from pyepidoc.epidoc.facets import FacetError
+from pyepidoc.shared.classes import SetRelation
+from pyepidoc.xml.validation_cache import ValidationCache
+from pyepidoc.epidoc.dom import lang
 from pathlib import Path
+from copy import deepcopy
+import gc
+import os
+import shutil
+import sys
+
+import pytest
 
 CORPUS_FOLDERPATH = 'tests/api/files/corpus'
 CORPUS_ROLENAME_FOLDERPATH = 'tests/api/files/corpus_role_name'
+CORPUS_WITH_ERRORS_FOLDERPATH = 'tests/api/files/corpus_with_errors'
 
 
 def test_daterange():
@@ -32,6 +46,405 @@ def test_load_corpus_root():
     assert corpus.token_count > 0
 
 
+def test_load_corpus_workers():
+    """
+    Test that loading a corpus on a thread pool gives the 
+    same documents in the same order as loading serially
+    """
+
+    serial = EpiDocCorpus(inpt=CORPUS_ROLENAME_FOLDERPATH)
+    parallel = EpiDocCorpus.from_path(
+        CORPUS_ROLENAME_FOLDERPATH, 
+        max_iter=None, 
+        workers=4
+    )
+
+    assert parallel.ids == serial.ids
+    assert parallel.errors == []
+
+
+def test_load_corpus_errors():
+    """
+    Test that files that cannot be parsed are recorded 
+    in the corpus errors rather than included in the corpus
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_WITH_ERRORS_FOLDERPATH, workers=2)
+
+    assert corpus.ids == ['ISic000001']
+    assert len(corpus.errors) == 1
+    assert corpus.errors[0].path.name == 'ISic999999_malformed.xml'
+    assert corpus.errors[0].error == 'XMLSyntaxError'
+
+
+@pytest.mark.parametrize('load_mode', ['eager', 'header_only', 'lazy'])
+def test_load_corpus_raises_without_tei_namespace(tmp_path: Path, load_mode: str):
+    """
+    Test that a file without the TEI namespace raises a TEINSError
+    rather than being recorded in the corpus errors
+    """
+
+    shutil.copy(Path(CORPUS_FOLDERPATH) / 'ISic000001_tokenized.xml', tmp_path)
+    (tmp_path / 'no_tei_ns.xml').write_text('<TEI><teiHeader/></TEI>')
+
+    with pytest.raises(TEINSError):
+        corpus = EpiDocCorpus(
+            inpt=tmp_path, 
+            header_only=load_mode == 'header_only',
+            lazy=load_mode == 'lazy'
+        )
+        corpus.ids
+
+
+def test_load_corpus_lazy():
+    """
+    Test that a lazy corpus parses documents on demand, 
+    holds no more than the maximum number of parsed documents,
+    and re-parses evicted documents when they are used again
+    """
+
+    eager = EpiDocCorpus(inpt=CORPUS_ROLENAME_FOLDERPATH)
+    lazy = EpiDocCorpus(
+        inpt=CORPUS_ROLENAME_FOLDERPATH, 
+        lazy=True, 
+        max_loaded_docs=2
+    )
+    cache = lazy.tree_cache
+    assert cache is not None
+    assert cache.loads == 0
+
+    # Without an index, the documents are sorted by file name
+    # rather than parsed to read their ids
+    assert len(lazy.docs) == len(eager.docs)
+    assert cache.loads == 0
+
+    assert lazy.ids == eager.ids
+    assert len(cache) == 2
+    assert cache.loads == 4
+
+    first = lazy.get_doc_by_id(eager.ids[0])
+    assert first is not None
+    assert first.token_count == eager.docs[0].token_count
+    assert cache.loads == 5
+    assert len(cache) == 2
+
+
+def test_lazy_subcorpus_shares_tree_cache():
+    """
+    Test that a subcorpus of a lazy corpus is made without 
+    parsing its documents, and keeps them in the same bounded 
+    tree cache
+    """
+
+    eager = EpiDocCorpus(inpt=CORPUS_ROLENAME_FOLDERPATH)
+    lazy = EpiDocCorpus(
+        inpt=CORPUS_ROLENAME_FOLDERPATH, 
+        lazy=True, 
+        max_loaded_docs=2
+    )
+    cache = lazy.tree_cache
+    assert cache is not None
+
+    top = lazy.top(3)
+    assert top.tree_cache is cache
+    assert cache.loads == 0
+
+    filtered = lazy.where(lambda doc: doc.token_count > 0)
+    assert filtered.tree_cache is cache
+    assert len(cache) <= 2
+    assert sorted(filtered.ids) == \
+        sorted(eager.where(lambda doc: doc.token_count > 0).ids)
+
+
+def test_evicted_trees_are_freed():
+    """
+    Test that a tree evicted from the cache of a lazy corpus is 
+    dropped from the document context and document order caches, 
+    so that nothing else keeps it in memory
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, lazy=True, max_loaded_docs=1)
+    first, second = corpus.docs[0], corpus.docs[1]
+    root = first.e
+
+    tokens = first.tokens_no_nested
+    assert lang(tokens[0]) is not None
+    assert tokens[0] < tokens[1]
+    del tokens
+    gc.collect()
+
+    _ = second.e
+    gc.collect()
+
+    # The only references are `root` and the argument to getrefcount
+    assert sys.getrefcount(root) == 2
+
+
+def test_load_corpus_lazy_errors():
+    """
+    Test that files in a lazy corpus that cannot be parsed
+    are recorded in the corpus errors when first used
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_WITH_ERRORS_FOLDERPATH, lazy=True)
+    assert len(corpus.docs) == 2
+    assert corpus.errors == []
+    assert corpus.ids == ['ISic000001']
+    assert [error.error for error in corpus.errors] == ['XMLSyntaxError']
+
+
+def test_load_corpus_index(tmp_path: Path):
+    """
+    Test that filtering on a metadata index gives the same 
+    result as filtering the documents, and that an up-to-date
+    index is reused without parsing the files
+    """
+
+    index_path = tmp_path / 'corpus.index.sqlite'
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    indexed = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, index=index_path)
+
+    assert indexed.index is not None
+    assert len(indexed.index) == 2
+    assert indexed.filter_by_daterange(1, 200).ids == \
+        corpus.filter_by_daterange(1, 200).ids
+    assert indexed.filter_by_languages(['la']).ids == \
+        corpus.filter_by_languages(['la']).ids
+    assert indexed.filter_by_materialclass(['#material.stone'], 'substring').ids == \
+        corpus.filter_by_materialclass(['#material.stone'], 'substring').ids
+    assert indexed.filter_by_authority(['I.Sicily']).ids == corpus.ids
+    indexed.index.close()
+
+    lazy = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, lazy=True, index=index_path)
+    filtered = lazy.filter_by_materialclass(['#material.stone.marble'], 'equal')
+
+    assert filtered.ids == ['ISic000001']
+    assert lazy.tree_cache is not None
+    assert lazy.tree_cache.loads == 0
+    assert filtered.docs[0].token_count > 0
+    assert lazy.tree_cache.loads == 1
+
+    # Changing the header of another document does not
+    # invalidate the ids read from the index
+    other = EpiDoc(CORPUS_FOLDERPATH + '/ISic000001_tokenized.xml')
+    other.tei_header.file_desc.publication_stmt.set_idno_by_type('filename', 'ISic000002')
+    assert lazy.ids == ['ISic000001', 'ISic000032']
+    assert lazy.tree_cache.loads == 1
+
+
+def test_derived_states_cache(tmp_path: Path):
+    """
+    Test that derived states read from the cache are the same
+    as those derived from the documents, and that a warm cache
+    does not parse the files
+    """
+
+    states = EpiDocCorpus(inpt=CORPUS_FOLDERPATH).derived_states()
+
+    cold = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, lazy=True)
+    cache = DerivedStateCache(tmp_path)
+    assert cold.derived_states(cache) == states
+    assert cache.misses == 2
+
+    warm = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, lazy=True)
+    assert warm.derived_states(tmp_path) == states
+    assert warm.tree_cache is not None
+    assert warm.tree_cache.loads == 0
+
+    assert [state.id for state in states] == ['ISic000001', 'ISic000032']
+    assert states[0].tokens[1].normalized_form == 'manibus'
+
+
+def test_derived_states_cache_keeps_docs_order(tmp_path: Path):
+    """
+    Test that derived states come in the order of the documents
+    with and without a cache, here the order of the file names
+    of a lazy corpus, which differs from the order of the ids
+    """
+
+    folder = tmp_path / 'corpus'
+    folder.mkdir()
+    shutil.copy(Path(CORPUS_FOLDERPATH) / 'ISic000001_tokenized.xml', folder / 'b.xml')
+    shutil.copy(Path(CORPUS_FOLDERPATH) / 'ISic000032_tokenized.xml', folder / 'a.xml')
+
+    corpus = EpiDocCorpus(inpt=folder, lazy=True)
+    ids = [doc.id for doc in corpus.docs]
+    assert ids == ['ISic000032', 'ISic000001']
+
+    cache_folder = tmp_path / 'cache'
+    assert [state.id for state in corpus.derived_states()] == ids
+    assert [state.id for state in corpus.derived_states(cache_folder)] == ids
+    assert [state.id for state in corpus.derived_states(cache_folder)] == ids
+
+
+def test_derived_states_cache_ignores_modified_doc(tmp_path: Path):
+    """
+    Test that a cache miss stores the state of the file on disk,
+    not that of a document changed in memory
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    doc = corpus.docs[0]
+    expected = DerivedState.from_doc(EpiDoc(doc._p))
+
+    for token in doc.tokens:
+        token.e.getparent().remove(token.e)
+    assert DerivedState.from_doc(doc) != expected
+
+    cache = DerivedStateCache(tmp_path)
+    assert corpus.derived_states(cache)[0] == expected
+    assert cache.get(doc._p) == expected
+    assert cache.hits == 1
+
+
+def test_load_corpus_header_only():
+    """
+    Test that a header-only corpus gives the same metadata 
+    as a full corpus
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    header_corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, header_only=True)
+
+    assert header_corpus.ids == corpus.ids
+    assert header_corpus.daterange == corpus.daterange
+    assert header_corpus.materialclasses == corpus.materialclasses
+    assert header_corpus.filter_by_textclass(['#function.funerary']).ids == \
+        corpus.filter_by_textclass(['#function.funerary']).ids
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_refresh_corpus(tmp_path: Path, lazy: bool):
+    """
+    Test that refreshing a corpus loads added and modified
+    files, drops deleted ones and updates the cached properties
+    """
+
+    folder = tmp_path / 'corpus'
+    shutil.copytree(CORPUS_FOLDERPATH, folder)
+    corpus = EpiDocCorpus(inpt=folder, lazy=lazy)
+
+    assert corpus.ids == ['ISic000001', 'ISic000032']
+    assert corpus.refresh() == ([], [], [])
+
+    (folder / 'ISic000032_tokenized.xml').unlink()
+    shutil.copy(
+        'tests/api/files/single_files_tokenized/ISic000552.xml', 
+        folder / 'ISic000552.xml'
+    )
+    modified = folder / 'ISic000001_tokenized.xml'
+    modified.write_text(modified.read_text().replace('of Zethus', 'of Zethos'))
+    os.utime(modified, ns=(0, 0))
+
+    result = corpus.refresh()
+
+    assert result.added == [folder / 'ISic000552.xml']
+    assert result.modified == [modified]
+    assert result.removed == [folder / 'ISic000032_tokenized.xml']
+    assert corpus.ids == ['ISic000001', 'ISic000552']
+    assert list(corpus.docs_dict) == ['ISic000001', 'ISic000552']
+    assert corpus.docs[0].get_desc('title')[0].text == 'Funerary inscription of Zethos'
+
+
+def test_tokenize_to_folder_workers(tmp_path: Path):
+    """
+    Test that tokenizing on a process pool writes the same 
+    files as tokenizing serially
+    """
+
+    serial_folder = tmp_path / 'serial'
+    parallel_folder = tmp_path / 'parallel'
+    serial_folder.mkdir()
+    parallel_folder.mkdir()
+
+    serial = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)\
+        .tokenize_to_folder(serial_folder)
+    parallel = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)\
+        .tokenize_to_folder(parallel_folder, workers=2)
+
+    assert [result.id for result in serial.succeeded] == \
+        ['ISic000001', 'ISic000032']
+    assert [result.id for result in parallel.succeeded] == \
+        ['ISic000001', 'ISic000032']
+    assert serial.failed == parallel.failed == []
+
+    for fp in serial_folder.iterdir():
+        assert fp.read_bytes() == (parallel_folder / fp.name).read_bytes()
+
+    failed = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)\
+        .tokenize_to_folder(parallel_folder, workers=2)
+    assert len(failed.failed) == 2
+
+
+def test_tokenize_to_folder_workers_keeps_changes(tmp_path: Path):
+    """
+    Test that tokenizing on a process pool includes changes
+    made to the documents in memory
+    """
+
+    serial_folder = tmp_path / 'serial'
+    parallel_folder = tmp_path / 'parallel'
+    serial_folder.mkdir()
+    parallel_folder.mkdir()
+
+    for folder, workers in [(serial_folder, None), (parallel_folder, 2)]:
+        corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+        title = corpus.docs[0].get_desc('title')[0]
+        title.text = 'Changed in memory'
+        corpus.tokenize_to_folder(folder, workers=workers)
+
+    for fp in serial_folder.iterdir():
+        assert fp.read_bytes() == (parallel_folder / fp.name).read_bytes()
+
+    assert b'Changed in memory' in (parallel_folder / 'ISic000001.xml').read_bytes()
+
+
+def test_validate_corpus(tmp_path: Path):
+    """
+    Test that validating on a process pool gives the same 
+    results as validating serially
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    results = corpus.validate()
+
+    assert [result.id for result in results] == ['ISic000001', 'ISic000032']
+    assert all(result.valid for result in results)
+    assert corpus.validate(workers=2) == results
+
+    cache_path = tmp_path / 'validation.sqlite'
+    assert corpus.validate(workers=2, cache=cache_path) == results
+    assert corpus.validate(cache=cache_path) == results
+
+
+def test_validate_corpus_closes_cache_it_opens(
+        tmp_path: Path, 
+        monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the corpus closes a validation cache that it opened 
+    from a path, but not one that it was given
+    """
+
+    closed: list[Path] = []
+    close = ValidationCache.close
+
+    def record_close(cache: ValidationCache) -> None:
+        closed.append(cache.path)
+        close(cache)
+
+    monkeypatch.setattr(ValidationCache, 'close', record_close)
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+
+    corpus.validate(cache=tmp_path / 'opened.sqlite')
+    assert closed.count(tmp_path / 'opened.sqlite') == 1
+
+    cache = ValidationCache(tmp_path / 'given.sqlite')
+    corpus.validate(cache=cache)
+    assert tmp_path / 'given.sqlite' not in closed
+    assert len(cache) == 2
+    cache.close()
+
+
 def test_materialclasses():
     """
     Test identification of material classes
@@ -79,3 +492,189 @@ def test_filter_rolenames():
     assert corpus.doc_count == 4
     # assert filtered_corpus.docs[0].role_names.__len__() == 1
 
+
+
+def test_token_languages():
+    """
+    Test that the token and expan languages of a corpus are 
+    aligned with its tokens and expans
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+
+    langs = corpus.token_languages()
+
+    assert len(langs.tokens) == corpus.token_count
+    assert len(langs.expans) == len(corpus.expans)
+    assert set(langs.tokens) <= set(corpus.languages)
+
+
+def test_iter_tokens_releases_trees():
+    """
+    Test that iterating over the tokens of a lazy corpus gives 
+    the same tokens as the eager corpus, and that with `release`
+    each tree is dropped once its tokens have been yielded
+    """
+
+    eager = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    lazy = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, lazy=True)
+    cache = lazy.tree_cache
+    assert cache is not None
+
+    _ = lazy.docs
+    loaded: list[int] = []
+    forms: list[str] = []
+
+    for token in lazy.iter_tokens(release=True):
+        forms.append(str(token))
+        loaded.append(len(cache))
+
+    assert forms == [str(token) for token in eager.tokens]
+    assert loaded == sorted(loaded, reverse=True)
+    assert loaded[-1] == 1
+    assert len(cache) == 0
+
+    assert len(list(lazy.iter_expans())) == len(eager.expans)
+    assert len(list(lazy.iter_nums())) == len(eager.nums)
+    assert len(list(lazy.iter_names())) == len(eager.names())
+
+
+def test_entity_index(tmp_path: Path):
+    """
+    Test that the name, persName, roleName and g-ref filters 
+    give the same results on the entity index as on the documents
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_ROLENAME_FOLDERPATH)
+    indexed = EpiDocCorpus(inpt=CORPUS_ROLENAME_FOLDERPATH)
+    index = indexed.build_entity_index(tmp_path / 'entities.json')
+
+    filtered = indexed.filter_by_role_name_type(
+        ['supracivic']
+    ).filter_by_role_name_subtype(['imperator'])
+    assert filtered.ids == corpus.filter_by_role_name_type(
+        ['supracivic']
+    ).filter_by_role_name_subtype(['imperator']).ids
+    assert filtered.doc_count == 2
+
+    for field, filter_name in [
+            ('name', 'filter_by_name'),
+            ('name_type', 'filter_by_name_type'),
+            ('pers_name_type', 'filter_by_pers_name_type'),
+            ('role_name_subtype', 'filter_by_role_name_subtype'),
+            ('g_ref', 'filter_by_g_ref')]:
+        
+        for key in index.keys(field):
+            for relation in [SetRelation.intersection, SetRelation.disjoint]:
+                assert getattr(indexed, filter_name)([key], relation).ids == \
+                    getattr(corpus, filter_name)([key], relation).ids
+
+
+def test_chronology():
+    """
+    Test the date filters, overlap and containment queries 
+    and histograms of the chronology index
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+
+    assert corpus.daterange == (1, 300)
+    assert corpus.datemeans == [175, 150]
+    assert corpus.datemean == 162
+
+    for start, end in [(1, 300), (40, 300), (0, 100), (60, 250)]:
+        assert corpus.filter_by_daterange(start, end).ids == [
+            doc.id for doc in corpus.docs 
+            if doc.is_after(start) and doc.is_before(end)
+        ]
+
+    assert corpus.filter_by_date_overlap(0, 20).ids == ['ISic000032']
+    assert corpus.filter_by_date_within(40, 300).ids == ['ISic000001']
+
+    assert [bin.count for bin in corpus.date_histogram(100)] == [0, 2, 0, 0]
+    assert [bin.count for bin in corpus.date_histogram(100, 0, 199, 'interval')] == [2, 2]
+
+    # Dates changed with lxml are read after invalidating the chronology
+    orig_date = corpus.docs[1].get_desc('origDate')[0]
+    orig_date.set('notBefore-custom', '-0050')
+    assert corpus.datemin == 1
+
+    corpus.invalidate_chronology()
+    assert corpus.datemin == -50
+
+
+def test_facets(tmp_path: Path):
+    """
+    Test that facets counted over the metadata index are the 
+    same as over the documents, and do not parse lazy documents
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    facets = corpus.facets()
+
+    assert facets['authority'] == [('I.Sicily', 2)]
+    assert sorted(facets['decade']) == [(150, 1), (170, 1)]
+    assert {value for value, _ in facets['lang']} == corpus.languages
+    assert corpus.facets(['orig_place'], min_freq=3) == {'orig_place': []}
+
+    index_path = tmp_path / 'corpus.index.sqlite'
+    EpiDocCorpus(inpt=CORPUS_FOLDERPATH, index=index_path).index.close()
+    lazy = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, lazy=True, index=index_path)
+
+    assert lazy.facets() == facets
+    assert lazy.materialclasses == \
+        {cls for doc in corpus.docs for cls in doc.materialclasses}
+    assert lazy.textclasses == \
+        {cls for doc in corpus.docs for cls in doc.textclasses}
+    assert lazy.languages == {lang for doc in corpus.docs for lang in doc.div_langs}
+    assert lazy.tree_cache is not None
+    assert lazy.tree_cache.loads == 0
+
+
+def test_facets_header_only():
+    """
+    Test that the facets of a header-only corpus leave out the
+    languages of the editions, and are otherwise the same
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    header_corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH, header_only=True)
+    errors: list[FacetError] = []
+
+    facets = corpus.facets()
+    del facets['lang']
+    assert header_corpus.facets(errors=errors) == facets
+    assert errors == []
+
+    assert header_corpus.facets(['lang'], errors=errors) == {'lang': []}
+    assert [error.facet for error in errors] == ['lang', 'lang']
+
+
+def test_textclasses_raise_on_more_than_one_textclass(tmp_path: Path):
+    """
+    Test that the text classes of a corpus with a document with
+    more than one <textClass> raise, as for a single document,
+    while the facets leave that document out and record an error
+    """
+
+    folder = tmp_path / 'corpus'
+    shutil.copytree(CORPUS_FOLDERPATH, folder)
+
+    doc = EpiDoc(folder / 'ISic000001_tokenized.xml')
+    textclass = doc.get_desc('textClass')[0]
+    textclass.addnext(deepcopy(textclass))
+    doc.to_xml_file(folder / 'ISic000001_tokenized.xml', overwrite_existing=True)
+
+    corpus = EpiDocCorpus(inpt=folder)
+
+    with pytest.raises(ValueError):
+        _ = corpus.textclasses
+
+    errors: list[FacetError] = []
+    facets = corpus.facets(errors=errors)
+
+    assert [(error.doc_id, error.facet) for error in errors] == \
+        [('ISic000001', 'textclass')]
+    assert sum(count for _, count in facets['textclass']) == \
+        len(corpus.docs[1].textclasses)
+    assert facets['authority'] == [('I.Sicily', 2)]
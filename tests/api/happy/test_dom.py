@@ -1,5 +1,9 @@
+from io import BytesIO
+
 from pyepidoc import EpiDoc
-from pyepidoc.epidoc.dom import line_end_after, line_ends 
+from pyepidoc.epidoc import document_context
+from pyepidoc.epidoc.dom import doc_id, lang, line_end_after, line_ends, owner_doc
+from pyepidoc.epidoc.epidoc_element import EpiDocElement
 import pytest
 
 
@@ -45,4 +49,61 @@ def test_count_line_ends(fp):
     linecount = len(edition.lbs)
     lineends = sum(map(line_ends, tokens))
 
-    assert linecount == lineends
\ No newline at end of file
+    assert linecount == lineends
+
+def test_owner_doc_is_shared_by_elements():
+    doc = EpiDoc(relative_filepaths['langs_1'])
+    first_token, second_token = doc.tokens[:2]
+
+    assert owner_doc(first_token) is owner_doc(second_token)
+    assert doc_id(first_token) == doc.id
+    assert lang(first_token) == 'grc'
+
+
+def test_lang_from_ancestor_div():
+    xml = b"""<TEI xmlns="http://www.tei-c.org/ns/1.0">
+        <teiHeader><profileDesc><langUsage/>
+            <textClass/></profileDesc></teiHeader>
+        <text><body>
+            <div type="edition" xml:lang="grc">
+                <div type="textpart" xml:lang="la">
+                    <head><w>titulus</w></head>
+                    <ab><w>Dis</w> <w>Manibus</w></ab>
+                </div>
+                <ab><w>theois</w></ab>
+            </div>
+        </body></text>
+    </TEI>"""
+    doc = EpiDoc(BytesIO(xml))
+    head, textpart_ab, edition_ab = (
+        EpiDocElement(e) for e in doc.e.iter(
+            '{http://www.tei-c.org/ns/1.0}head',
+            '{http://www.tei-c.org/ns/1.0}ab'
+        )
+    )
+
+    assert lang(head) == 'la'
+    assert lang(textpart_ab) == 'la'
+    assert lang(edition_ab) == 'grc'
+
+    tokens = doc.tokens_no_nested
+    assert doc.annotate_languages().tokens == [lang(token) for token in tokens]
+    assert [lang(token) for token in tokens] == ['la', 'la', 'la', 'grc']
+
+
+def test_document_context_does_not_keep_tree():
+    doc = EpiDoc(relative_filepaths['langs_1'])
+    token = doc.tokens[0]
+    assert lang(token) == 'grc'
+    assert doc_id(token) == doc.id
+
+    key = id(doc.e)
+    assert key in document_context._contexts
+    del doc, token
+
+    # Looking up another document discards the context of the first,
+    # so that its tree can be freed
+    other = EpiDoc(relative_filepaths['langs_2'])
+    doc_id(other.tokens[0])
+
+    assert key not in document_context._contexts
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 from lxml import etree
 from pathlib import Path
+import gc
+import sys
 
 from pyepidoc.epidoc.epidoc import EpiDoc
+from pyepidoc.epidoc.header_epidoc import HeaderEpiDoc
+from pyepidoc.epidoc.metadata.change import Change
+from pyepidoc.epidoc.metadata.resp_stmt import RespStmt
 from pyepidoc.epidoc.metadata.title_stmt import TitleStmt
 from pyepidoc.shared import head
 from pyepidoc.epidoc.dom import lang, line
@@ -195,6 +200,34 @@ def test_load_relative_filepath_from_str(filepath: str):
     assert doc.tokens_normalized_no_nested != []
 
 
+def test_load_header_only():
+    """
+    Test that a header-only document has the same metadata
+    as the full document, and can be upgraded to a full parse
+    """
+
+    filepath = relative_filepaths['ISic000001']
+    doc = EpiDoc(filepath)
+    header_doc = HeaderEpiDoc(filepath)
+
+    assert header_doc.is_header_only
+    assert header_doc.get_desc('body') == []
+    assert header_doc.id == doc.id
+    assert header_doc.authority == doc.authority
+    assert header_doc.daterange == doc.daterange
+    assert header_doc.textclasses == doc.textclasses
+    assert header_doc.materialclasses == doc.materialclasses
+    assert header_doc.orig_place == doc.orig_place
+
+    with pytest.raises(ValueError):
+        header_doc.body
+
+    header_doc.load_full()
+
+    assert not header_doc.is_header_only
+    assert header_doc.token_count == doc.token_count
+
+
 def test_materialclasses():
     doc = EpiDoc(relative_filepaths['ISic000001'])
     assert doc.materialclasses == ['#material.stone.marble']
@@ -249,4 +282,65 @@ def test_set_document_id():
     doc.tei_header.file_desc.publication_stmt.set_idno_by_type('filename', 'ISic000001')
 
     # Assert
-    assert doc.id == 'ISic000001'
\ No newline at end of file
+    assert doc.id == 'ISic000001'
+
+def test_document_id_cache_is_invalidated():
+    """
+    Test that the cached document ID is updated when
+    the ID is changed in the header
+    """
+    doc = EpiDoc(relative_filepaths['ISic000001'])
+    assert doc.id == 'ISic000001'
+    assert len({doc, EpiDoc(relative_filepaths['ISic000001'])}) == 1
+
+    doc.tei_header.file_desc.publication_stmt.set_idno_by_type('filename', 'ISic000002')
+    assert doc.id == 'ISic000002'
+
+    idno = doc.get_desc('idno', {'type': 'filename'})[0]
+    idno.text = 'ISic000003'
+    assert doc.id == 'ISic000002'
+
+    doc.invalidate_id()
+    assert doc.id == 'ISic000003'
+
+
+def test_document_id_cache_is_per_document():
+    """
+    Test that changing the header of one document does not
+    invalidate the cached ID of another
+    """
+    doc = EpiDoc(relative_filepaths['ISic000001'])
+    other = EpiDoc(relative_filepaths['ISic000552'])
+    assert other.id == 'ISic000552'
+
+    idno = other.get_desc('idno', {'type': 'filename'})[0]
+    idno.text = 'ISic000553'
+
+    doc.tei_header.file_desc.publication_stmt.set_idno_by_type('filename', 'ISic000002')
+    assert doc.id == 'ISic000002'
+    assert other.id == 'ISic000552'
+
+
+def test_header_mutators_change_header_version():
+    """
+    Test that appending a <change> or a <respStmt> changes the 
+    header version of the document, and that the version does
+    not keep the tree in memory
+    """
+    doc = EpiDoc(relative_filepaths['ISic000001'])
+    versions = [doc._header_version()]
+
+    doc.append_change(Change.from_details('#JB', 'Changed'))
+    versions.append(doc._header_version())
+
+    doc.append_resp_stmt(RespStmt.from_details('Joe Bloggs', 'JB', 'ref', 'edited'))
+    versions.append(doc._header_version())
+
+    assert len(set(versions)) == 3
+
+    root = doc.e
+    del doc
+    gc.collect()
+
+    # The only references are `root` and the argument to getrefcount
+    assert sys.getrefcount(root) == 2
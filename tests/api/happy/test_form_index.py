@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from pyepidoc import EpiDoc, EpiDocCorpus
+from pyepidoc.epidoc.form_index import FormIndex
+from pyepidoc.epidoc.value_index import Posting
+from pyepidoc.shared.classes import SetRelation
+
+CORPUS_FOLDERPATH = Path('tests/api/files/corpus')
+LEMMATIZED_FILEPATH = Path('tests/workflows/lemmatize/lemmatizations_only/files/benchmark/full_for_later.xml')
+
+
+def test_filters_match_unindexed_corpus(tmp_path: Path):
+    """
+    Test that filtering by form on the form index gives the 
+    same results as filtering the documents, and that a saved
+    index is reused for unchanged files
+    """
+
+    corpus = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    indexed = EpiDocCorpus(inpt=CORPUS_FOLDERPATH)
+    index_path = tmp_path / 'forms.json'
+    indexed.build_form_index(index_path)
+
+    forms = sorted({form for doc in corpus.docs for form in doc.forms})
+    queries = [forms[:2], forms[-1:], [forms[0].upper()], ['notaform']]
+    relations = [
+        SetRelation.intersection, 
+        SetRelation.subset, 
+        SetRelation.disjoint
+    ]
+
+    for query in queries:
+        for relation in relations:
+            for ignore_case in [True, False]:
+                assert indexed.filter_by_form(query, relation, ignore_case).ids == \
+                    corpus.filter_by_form(query, relation, ignore_case).ids
+
+    reloaded = FormIndex.load(index_path)
+    assert len(reloaded) == corpus.doc_count
+    assert reloaded.update(corpus.docs) == []
+
+
+def test_lookup():
+    doc = EpiDoc(LEMMATIZED_FILEPATH)
+    index = FormIndex.from_docs([doc])
+    lemmata = [token.lemma for token in doc.tokens_no_nested]
+
+    assert index.doc_keys(doc.id, 'lemma') == doc.lemmata
+    assert index.lookup('annus', 'lemma') == \
+        [Posting(doc.id, lemmata.index('annus'))]
+    assert index.lookup('ZETH', 'lemma', ignore_case=True, prefix=True) == \
+        [Posting(doc.id, lemmata.index('Zethus'))]
+    assert index.lookup('ZETH', 'lemma', prefix=True) == []
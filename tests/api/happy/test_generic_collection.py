@@ -0,0 +1,58 @@
+from pyepidoc import EpiDocCorpus
+from pyepidoc.shared.generic_collection import GenericCollection, remove_none
+
+
+def test_frequencies():
+    collection = GenericCollection(['a', 'b', 'a', 'c', 'a', 'b'])
+
+    assert collection.frequencies().to_list() == [('a', 3), ('b', 2), ('c', 1)]
+    assert collection.frequencies().top(2).to_list() == [('a', 3), ('b', 2)]
+
+
+def test_pipeline_is_deferred():
+    calls: list[int] = []
+
+    def double(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    pipeline = GenericCollection([1, 2, 3, 2, None]) \
+        .where(lambda x: x is not None) \
+        .map(double)
+
+    assert calls == []
+    assert pipeline.unique().to_list() == [2, 4, 6]
+    assert calls == [1, 2, 3, 2]
+
+    # The pipeline can be iterated again, and is stored 
+    # as a list once materialized
+    assert list(pipeline) == [2, 4, 6, 4]
+    assert len(pipeline) == 4
+    assert pipeline[1] == 4
+    assert len(calls) == 12
+
+    assert remove_none(GenericCollection([1, None, 2])).to_list() == [1, 2]
+
+
+def test_corpus_token_frequencies():
+    corpus = EpiDocCorpus('tests/api/files/corpus')
+    forms = [str(token).strip() for token in corpus.tokens]
+
+    frequencies = corpus.tokens \
+        .map(lambda token: str(token).strip()) \
+        .frequencies() \
+        .to_list()
+
+    assert sum(frequency for _, frequency in frequencies) == len(forms)
+    assert {form: forms.count(form) for form in set(forms)} == dict(frequencies)
+
+
+def test_abbreviations_use_base_collection():
+    corpus = EpiDocCorpus('tests/api/files/corpus')
+    abbreviations = corpus.abbreviations
+    expans = list(map(str, corpus.expans))
+
+    assert len(abbreviations) == len(expans) > 0
+    assert str(abbreviations[0]) == expans[0]
+    assert abbreviations.where(lambda _: True).map(str).to_list() == expans
+    assert abbreviations.map(str).unique().count == len(set(expans))
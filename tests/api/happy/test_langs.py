@@ -41,3 +41,18 @@ def test_langs(
     assert doc_1.langs == langs
     assert lang(expan_1) == first_expan_lang
     assert lang(token_1) == first_token_lang
+
+
+@pytest.mark.parametrize('fp', [test[0] for test in tests])
+def test_annotate_languages(fp: str):
+    """
+    Tests that the languages from annotate_languages agree
+    with those given by dom.lang for each token and expan
+    """
+
+    doc = EpiDoc(fp)
+
+    langs = doc.annotate_languages()
+
+    assert langs.tokens == [lang(token) for token in doc.tokens_no_nested]
+    assert langs.expans == [lang(expan) for expan in doc.expans]
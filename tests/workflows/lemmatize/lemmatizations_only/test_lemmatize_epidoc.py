@@ -1,14 +1,18 @@
 from typing import Callable
+from itertools import chain
+from pathlib import Path
 
 import pytest
 
-from pyepidoc import EpiDoc
+from pyepidoc import EpiDoc, EpiDocCorpus
+from pyepidoc.epidoc.metadata.change import Change
 from pyepidoc.epidoc.metadata.resp_stmt import RespStmt
 from pyepidoc.shared.testing import (
     save_and_reload, 
     save_reload_and_compare_with_benchmark
 )
 from pyepidoc.processing.processor import Processor
+from pyepidoc.processing.operations import LemmaMemo, batch_lemmatizer
 
 from pyepidoc.epidoc.enums import StandoffEditionElements
 from tests.config import FILE_WRITE_MODE
@@ -162,4 +166,95 @@ def test_lemmatize_on_separate_edition_where_separate_lemmatized_edition_already
     doc.lemmatize(dummy_lemmatizer, 'separate')
 
     # No error expected
-    doc.lemmatize(dummy_lemmatizer, 'separate', fail_if_existing_lemmatized_edition=False)
\ No newline at end of file
+    doc.lemmatize(dummy_lemmatizer, 'separate', fail_if_existing_lemmatized_edition=False)
+
+def test_batch_lemmatize_corpus(tmp_path: Path):
+
+    """
+    Test that lemmatizing a corpus with a batch lemmatizer gives 
+    the same lemmata as lemmatizing each document form by form,
+    passing each distinct form to the lemmatizer once, and 
+    that a saved memo is reused
+    """
+
+    # Arrange
+    filenames = ['ISic000001.xml', 'gap_and_orig.xml', 'persName.xml']
+    corpus = EpiDocCorpus([EpiDoc(unlemmatized_path + filename) 
+                           for filename in filenames])
+    expected = [EpiDoc(unlemmatized_path + filename)
+                .lemmatize(str.upper, 'separate') 
+                for filename in filenames]
+    batches: list[list[str]] = []
+
+    def lemmatize(forms: list[str]) -> list[str]:
+        batches.append(forms)
+        return [form.upper() for form in forms]
+
+    memo_path = tmp_path / 'lemmata.json'
+
+    # Act
+    corpus.lemmatize(lemmatize, 'separate', memo=memo_path, batch_size=5)
+
+    # Assert
+    def lemmata(doc: EpiDoc) -> list[str | None]:
+        edition = doc.edition_by_subtype('simple-lemmatized')
+        assert edition is not None
+        return [w.lemma for w in edition.w_tokens]
+
+    lemmatized = {doc.filename: lemmata(doc) for doc in corpus.docs}
+    assert lemmatized == {doc.filename: lemmata(doc) for doc in expected}
+
+    forms = list(chain(*batches))
+    assert len(forms) == len(set(forms))
+    assert len(batches) > 1
+    assert all(len(batch) <= 5 for batch in batches)
+
+    memo = LemmaMemo(memo_path)
+    assert len(memo) == len(forms)
+    assert memo.lemmatize(forms, lemmatize) == [form.upper() for form in forms]
+    assert memo.misses == 0
+    assert memo.hits == len(forms)
+
+    # Repeats of a form new to the memo are not hits
+    new_memo = LemmaMemo()
+    new_memo.lemmatize(['a', 'a', 'b'], lemmatize)
+    assert (new_memo.hits, new_memo.misses) == (0, 2)
+
+    # The corpus now has lemmatized editions
+    with pytest.raises(ValueError):
+        corpus.lemmatize(lemmatize, 'separate')
+
+    corpus.lemmatize(lemmatize, 'separate', fail_if_existing_lemmatized_edition=False)
+    assert {doc.filename: lemmata(doc) for doc in corpus.docs} == lemmatized
+
+
+def test_batch_lemmatize_corpus_adds_resp_stmt_and_change_to_each_doc():
+
+    """
+    Test that each document of a lemmatized corpus gets its own
+    copy of the <respStmt> and the <change>
+    """
+
+    # Arrange
+    filenames = ['ISic000001.xml', 'gap_and_orig.xml', 'persName.xml']
+    corpus = EpiDocCorpus([EpiDoc(unlemmatized_path + filename) 
+                           for filename in filenames])
+    change_counts = [len(doc.get_desc('change')) for doc in corpus.docs]
+    resp_stmt = RespStmt.from_details('Joe Bloggs', 'JB', 'https://example.org/jb', 'lemmatized')
+    change = Change.from_details('#JB', 'Lemmatized')
+
+    # Act
+    corpus.lemmatize(
+        batch_lemmatizer(str.upper), 
+        'separate', 
+        resp_stmt=resp_stmt, 
+        change=change
+    )
+
+    # Assert
+    assert [len(doc.get_desc('change')) for doc in corpus.docs] == \
+        [count + 1 for count in change_counts]
+    
+    for doc in corpus.docs:
+        assert doc.title_stmt is not None
+        assert resp_stmt in doc.title_stmt.resp_stmts
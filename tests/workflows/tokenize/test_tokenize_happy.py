@@ -454,4 +454,64 @@ def test_does_tokenize_if_already_w_tokens_present_and_retokenize_set_to_true():
     epidoc.tokenize(retokenize = True)
 
     # Assert
-    assert len(epidoc.w_tokens) == 3
\ No newline at end of file
+    assert len(epidoc.w_tokens) == 3
+
+
+engine_equivalence_paths = sorted(input_path.glob('*.xml')) + \
+    sorted(Path('example_corpus').glob('*.xml'))
+@pytest.mark.parametrize("filepath", engine_equivalence_paths, ids=lambda path: path.stem)
+def test_linear_engine_matches_recursive_engine(filepath: Path):
+    
+    """
+    Tests that the 'linear' tokenizer engine gives the same
+    output as the 'recursive' engine
+    """
+
+    # Arrange
+    recursive_doc = EpiDoc(filepath)
+    linear_doc = EpiDoc(filepath)
+
+    # Act
+    recursive_doc.tokenize(verbose=False, throw_if_no_main_edition=False, engine='recursive')
+    linear_doc.tokenize(verbose=False, throw_if_no_main_edition=False, engine='linear')
+
+    # Assert
+    assert linear_doc.to_str() == recursive_doc.to_str()
+
+
+def test_linear_engine_tokenizes_long_ab():
+
+    """
+    Tests that the 'linear' tokenizer engine can tokenize an <ab>
+    with more tokens than the recursion limit
+    """
+
+    # Arrange
+    words = ' '.join(['<persName><name>Zethos</name></persName> filius'] * 1000)
+    edition = Edition.from_xml_str(f'<lb n="1"/>{words}', wrap_in_ab=True)
+
+    # Act
+    edition.tokenize(engine='linear')
+
+    # Assert
+    assert len(edition.w_tokens) == 1000
+    assert len(edition.get_desc(['persName'])) == 1000
+
+
+def test_linear_engine_tokenizes_long_unspaced_run():
+
+    """
+    Tests that the 'linear' tokenizer engine can tokenize a run of
+    elements not separated by whitespace that is longer than the
+    recursion limit
+    """
+
+    # Arrange
+    run = '<supplied reason="lost">a</supplied>' * 2000
+    edition = Edition.from_xml_str(f'<lb n="1"/>{run} filius', wrap_in_ab=True)
+
+    # Act
+    edition.tokenize(engine='linear')
+
+    # Assert
+    assert len(edition.w_tokens) == 2
@@ -1,5 +1,11 @@
 from __future__ import annotations
+from pathlib import Path
+
+from lxml import etree
+
 from pyepidoc import EpiDoc
+from pyepidoc.xml.schema_cache import get_relaxng
+from pyepidoc.xml.validation_cache import ValidationCache, content_hash, schema_hash
 
 
 def test_validate_relax_ng():
@@ -37,3 +43,40 @@ def test_validate_does_not_change_file():
     
     assert doc1.to_byte_str() == doc2.to_byte_str()
     
+
+
+def test_relaxng_schema_is_cached():
+    """
+    Tests that the RelaxNG schema is only compiled once,
+    and that documents are only copied for XInclude
+    when they contain XInclude elements
+    """
+    doc1 = EpiDoc('tests/xml/files/ISic000001_no_xinclude.xml')
+    doc2 = EpiDoc('tests/xml/files/ISic000001_with_xinclude.xml')
+
+    assert get_relaxng(doc1._rng_path) is get_relaxng(doc2._rng_path)
+    assert not doc1.has_xinclude
+    assert doc2.has_xinclude
+
+
+def test_validation_cache(tmp_path: Path):
+    """
+    Tests that validation results are cached by document 
+    content, and that the cache can be bypassed
+    """
+    cache = ValidationCache(tmp_path / 'validation.sqlite')
+    doc = EpiDoc('tests/xml/files/ISic000002.xml')
+
+    assert doc.validate(cache) == doc.validate()
+    assert len(cache) == 1
+
+    cache.set(
+        content_hash(etree.tostring(doc.root_tree)), 
+        schema_hash(doc._rng_path), 
+        False, 
+        'cached'
+    )
+
+    assert doc.validate(cache) == (False, 'cached')
+    assert doc.validate(cache, force=True)[0] == True
+    assert doc.validate(cache)[0] == True
@@ -1,6 +1,7 @@
 import pytest
 from pyepidoc.xml.xml_element import XmlElement
-from pyepidoc.xml.utils import abify    
+from pyepidoc.xml.utils import abify, localname
+from pyepidoc.shared.constants import TEINS
 
 previous_sibling_cases = [
     ('<w n="5">hello</w> <persName n="10"><w n="15">goodbye</w></persName>',
@@ -23,4 +24,43 @@ def test_previous_sibling(xml_str: str, next_id: str, expected_previous_id: str
     if previous_elem is None:
         assert expected_previous_id is None
     else:
-        assert previous_elem.get_attrib('n') == expected_previous_id
\ No newline at end of file
+        assert previous_elem.get_attrib('n') == expected_previous_id
+
+
+tag_cases = [
+    (f'<ab xmlns="{TEINS}"><w>hello</w></ab>', TEINS, 'w'),
+    ('<ab><w>hello</w></ab>', '', 'w'),
+    (f'<ab xmlns:x="http://example.org/x"><x:w>hello</x:w></ab>', 'http://example.org/x', 'w')
+]
+@pytest.mark.parametrize(('xml_str', 'namespace', 'name'), tag_cases)
+def test_tag(xml_str: str, namespace: str, name: str):
+    # Arrange
+    ab = XmlElement.from_xml_str(xml_str)
+
+    # Act
+    w = ab.child_elements[0]
+
+    # Assert
+    assert w.tag.ns == namespace
+    assert w.tag.name == name
+    assert w.localname == name
+    assert localname(w.e) == name
+
+
+def test_document_order_after_mutation():
+    # Arrange
+    ab = XmlElement.from_xml_str(abify(
+        '<w n="1">a</w><persName n="2"><w n="3">b</w></persName><w n="4">c</w>'
+    ))
+    w1, pers_name, w3, w4 = ab.descendant_elements
+    
+    # Act
+    before = sorted([w4, w3, pers_name, w1])
+    pers_name.e.addprevious(w4.e)
+    after = sorted([w4, w3, pers_name, w1])
+
+    # Assert
+    assert [elem.get_attrib('n') for elem in before] == ['1', '2', '3', '4']
+    assert [elem.get_attrib('n') for elem in after] == ['1', '4', '2', '3']
+    assert w3 == XmlElement(w3.e)
+    assert len({w1, w3, XmlElement(w1.e)}) == 2
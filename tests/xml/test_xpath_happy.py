@@ -4,6 +4,7 @@ from typing import cast, List, Union
 from lxml import etree
 from lxml.etree import _Element, _ElementUnicodeResult
 from pyepidoc.xml import XmlElement
+from pyepidoc.xml.xpath_registry import xpath_stats
 
 xpath_true = [
     ('<expan xmlns="http://www.tei-c.org/ns/1.0"><abbr>Kal</abbr><ex>enda</ex><abbr>s</abbr></expan>',
@@ -73,3 +74,23 @@ def test_xpath_bool_false(pair: tuple[str, str]):
     baseelem = XmlElement(elem)
 
     assert not baseelem.xpath_bool(xpath)
+
+
+def test_xpath_is_compiled_once():
+    """
+    Test that evaluating the same XPath expression on
+    different elements only compiles it once
+    """
+    xpathstr = 'count(descendant::ns:abbr[@n="registry-test"])'
+    elements = [
+        XmlElement(etree.fromstring(xml)) 
+        for xml, _, _ in xpath_count
+    ]
+
+    before = xpath_stats()
+    results = [element.xpath_float(xpathstr) for element in elements]
+    after = xpath_stats()
+
+    assert results == [0.0, 0.0]
+    assert after.compiled - before.compiled == 1
+    assert after.reused - before.reused == 1